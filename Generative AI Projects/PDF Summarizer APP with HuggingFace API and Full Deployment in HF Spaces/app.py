@@ -4,25 +4,16 @@ import os
 from dotenv import load_dotenv
 import streamlit as st  # Our app framework
 
-# ====== PDF HANDLING ======
-# Note: pypdf is lightweight and handles most PDFs well
-from pypdf import PdfReader  # Better than PyPDF2 for our needs
-
-# ====== LANGCHAIN COMPONENTS ======
-# Note: We're using LangChain for text processing pipelines
-from langchain.text_splitter import CharacterTextSplitter  # For chunking text
-from langchain_community.llms import HuggingFaceHub  # For summary generation
-from langchain.vectorstores import FAISS  # Local vector storage
-from langchain_community.embeddings import HuggingFaceEmbeddings  # Text embeddings
-from langchain.chains.question_answering import load_qa_chain  # Backup QA method
-
-# ====== TRANSFORMERS ======
-# Note: Direct HuggingFace imports for more control
-from transformers import (
-    pipeline,  # For ready-to-use NLP pipelines
-    AutoModelForQuestionAnswering,  # Custom QA models
-    AutoTokenizer  # Handles model tokenization
-)
+# ====== HEAVY LIBRARIES (LAZY) ======
+# Note: pypdf, LangChain and transformers are NOT imported here on purpose.
+# Importing transformers/torch/FAISS takes several seconds, and Streamlit runs
+# this whole script before the page renders. Each function below imports
+# what it needs, so the upload UI shows up right away and the cost is only
+# paid (once per process, Python caches modules) when a button is clicked.
+# Run `python startup_profile.py` to check the startup import time.
+
+# Warm-up and health checks only use the standard library at import time
+from warmup import MODEL_CACHE_DIR, ModelRegistry, start_health_server
 
 # ====== ENVIRONMENT SETUP ======
 load_dotenv()  # Loads from .env file (keep your API key here)
@@ -34,8 +25,36 @@ if not hf_token:
     st.stop()  # Graceful exit if missing token
 os.environ["HUGGINGFACEHUB_API_TOKEN"] = hf_token  # Set for LangChain
 
+# ====== MODEL WARM-UP ======
+# Note: cache_resource runs this once per process, not on every rerun.
+# The models load in a background thread, so the page below renders right away.
+@st.cache_resource(show_spinner=False)
+def get_model_registry():
+    registry = ModelRegistry(MODEL_CACHE_DIR).start()
+    start_health_server(registry)  # only with HEALTH_PORT set (local runs; Spaces route the app port only)
+    return registry
+
+registry = get_model_registry()
+
 # ====== STREAMLIT UI ======
 st.set_page_config(page_title="Santiago's PDF Summarizer & Q&A")
+
+# Readiness page: open the app with ?page=ready in a browser. Streamlit draws it
+# over a websocket, so a plain HTTP GET (load balancer, uptime monitor) never
+# sees the status; probes need the HEALTH_PORT server's /ready (see warmup.py)
+if st.query_params.get("page") == "ready":
+    if registry.error:
+        registry.start()  # a failed warm-up is retried instead of staying down
+    st.write(registry.status)
+    st.stop()
+
+# Stats page: open the app with ?page=stats
+if st.query_params.get("page") == "stats":
+    st.title("📊 App Stats")
+    st.write(f"Model status: **{registry.status}**")
+    st.json(registry.stats())
+    st.stop()
+
 st.title("📄 Santiago's PDF Summarizer & Q&A")
 st.write("Summarize your PDF or ask questions about its content using free Hugging Face models.")
 st.divider()
@@ -52,6 +71,8 @@ if pdf is not None:
 # ====== CORE FUNCTIONS ======
 def extract_text_from_pdf(pdf):
     """Extracts raw text from PDF with error handling"""
+    from pypdf import PdfReader  # Better than PyPDF2 for our needs
+
     try:
         pdf_reader = PdfReader(pdf)
         text = ""
@@ -64,6 +85,9 @@ def extract_text_from_pdf(pdf):
 
 def summarize_pdf(text):
     """Generates summary using BART model with chunking"""
+    from langchain.text_splitter import CharacterTextSplitter  # For chunking text
+    from langchain_community.llms import HuggingFaceHub  # For summary generation
+
     try:
         # Chunking prevents model context window overflow
         text_splitter = CharacterTextSplitter(
@@ -97,6 +121,9 @@ def summarize_pdf(text):
 
 def answer_question(text, question):
     """Handles Q&A with context-aware responses"""
+    from langchain.text_splitter import CharacterTextSplitter
+    from langchain.vectorstores import FAISS  # Local vector storage
+
     try:
         # --- Text Preparation ---
         text_splitter = CharacterTextSplitter(
@@ -108,30 +135,18 @@ def answer_question(text, question):
         chunks = text_splitter.split_text(text)
 
         # --- Semantic Search Setup ---
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/multi-qa-mpnet-base-dot-v1"  # QA-optimized
-        )
-        knowledge_base = FAISS.from_texts(chunks, embeddings)
+        # Embedder and QA pipeline were loaded and warmed at startup (see warmup.py);
+        # this only blocks if a question arrives while the warm-up is still running
+        registry.wait()
+        knowledge_base = FAISS.from_texts(chunks, registry.embeddings)  # QA-optimized embedder
         
         # Retrieve most relevant sections
         docs = knowledge_base.similarity_search(question, k=4)  # Get top 4 matches
         if not docs:
             return "I couldn't find relevant information for this question."
 
-        # --- QA Model Configuration ---
-        model_name = "deepset/roberta-base-squad2"  # Reliable PyTorch model
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForQuestionAnswering.from_pretrained(model_name)
-
-        # Pipeline with optimized settings
-        qa_pipeline = pipeline(
-            "question-answering",
-            model=model,
-            tokenizer=tokenizer,
-            max_seq_len=384,  # Standard for RoBERTa
-            top_k=2,  # Get two potential answers
-            handle_impossible_answer=True  # Better than failing
-        )
+        # --- QA Model (already warm, same settings as before) ---
+        qa_pipeline = registry.qa_pipeline
 
         # --- Answer Generation ---
         context = "\n\n".join([doc.page_content for doc in docs])
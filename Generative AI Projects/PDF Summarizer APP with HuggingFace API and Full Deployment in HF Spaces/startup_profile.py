@@ -0,0 +1,151 @@
+'''
+Startup import-time benchmark for the Streamlit apps.
+
+Streamlit executes the whole app file before the first page is drawn, so every
+module imported at the top of app.py is paid for on each cold boot (and on
+every new worker). This script reads an app file, separates the imports done
+at module level ("startup") from the ones done inside functions ("deferred"),
+and measures each group in a fresh interpreter with `python -X importtime`.
+
+Usage:
+    python startup_profile.py                      # profiles app.py
+    python startup_profile.py path/to/other_app.py --budget 0.8
+    python startup_profile.py --top 25
+
+The script exits with code 1 if the startup imports take longer than --budget
+seconds, so it can be used as a simple check before pushing to HF Spaces. If a
+startup import fails (package not installed here) the budget is not checked,
+since the total would leave that module out, and the script exits with code 2.
+'''
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+
+## -------- Collecting the imports of the app -----------
+
+def collect_imports(script_path):
+    """Returns (startup_modules, deferred_modules) imported by the script"""
+    with open(script_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script_path)
+
+    startup, deferred = [], []
+
+    def add(node, target):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                target.append(alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            target.append(node.module)
+
+    # Only statements at the top level of the file run before the page renders
+    for node in tree.body:
+        add(node, startup)
+
+    # Everything imported inside a def runs only when that function is called
+    for func in ast.walk(tree):
+        if isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for node in ast.walk(func):
+                add(node, deferred)
+
+    # keep the order but drop duplicates
+    startup = list(dict.fromkeys(startup))
+    deferred = [m for m in dict.fromkeys(deferred) if m not in startup]
+    return startup, deferred
+
+
+## -------- Measuring with -X importtime -----------
+
+def measure_imports(modules, cwd=None):
+    """Imports the modules in a fresh interpreter and parses -X importtime output.
+
+    cwd should be the app's folder, so its local modules (warmup...) import.
+
+    Returns a dict with the total time, the per-module cumulative times (in
+    seconds) of the top-level imports and the modules that failed to import.
+    """
+    if not modules:
+        return {"total": 0.0, "modules": [], "missing": []}
+
+    # Each import is wrapped so a missing optional package does not hide the rest
+    code = "\n".join(
+        f"try:\n    import {m}\nexcept Exception:\n    print({m!r})" for m in modules
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+
+    # interpreter boot modules (site, encodings...) also show up; keep only
+    # the packages the app asked for
+    roots = {m.split(".")[0] for m in modules}
+    missing = proc.stdout.split()
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # format: "import time: self | cumulative | <indent>package"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # top-level imports are not indented (nested ones start with spaces)
+        if name.startswith("  "):
+            continue
+        name = name.strip()
+        if name.split(".")[0] not in roots or name in missing:
+            continue
+        timings.append((name, int(cumulative_us) / 1e6))
+
+    total = sum(seconds for _, seconds in timings)
+    timings.sort(key=lambda item: item[1], reverse=True)
+    return {"total": total, "modules": timings, "missing": missing}
+
+
+## -------- Report -----------
+
+def print_report(title, modules, result, top):
+    print(f"\n{title}: {len(modules)} imports, {result['total']:.3f} s")
+    print("-" * 60)
+    for name, seconds in result["modules"][:top]:
+        print(f"{seconds:9.3f} s  {name}")
+    if result["missing"]:
+        print(f"(not installed here: {', '.join(result['missing'])})")
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Import-time profile of a Streamlit app")
+    parser.add_argument("script", nargs="?", default=os.path.join(here, "app.py"))
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="max seconds allowed for startup imports (default 1.0)")
+    parser.add_argument("--top", type=int, default=15,
+                        help="how many of the slowest imports to show")
+    args = parser.parse_args()
+
+    startup, deferred = collect_imports(args.script)
+    app_dir = os.path.dirname(os.path.abspath(args.script))
+    startup_result = measure_imports(startup, cwd=app_dir)
+    deferred_result = measure_imports(deferred, cwd=app_dir)
+
+    print(f"Import-time profile for {os.path.basename(args.script)}")
+    print_report("Startup (before the page renders)", startup, startup_result, args.top)
+    print_report("Deferred (loaded on first use)", deferred, deferred_result, args.top)
+
+    print(f"\nStartup budget: {args.budget:.3f} s")
+    if startup_result["missing"]:
+        print(f"NOT CHECKED: startup imports failed here ({', '.join(startup_result['missing'])}); "
+              "install the app's requirements and run again")
+        return 2
+    if startup_result["total"] > args.budget:
+        print("FAIL: startup imports are over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
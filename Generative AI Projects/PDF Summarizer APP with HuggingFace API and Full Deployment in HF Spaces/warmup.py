@@ -0,0 +1,258 @@
+'''
+Model warm-up and health checks for the PDF Summarizer Space.
+
+Without this, the first user after a Space restart waits for the embedder and
+the QA model to download and load inside answer_question(). Here both models
+are loaded once per process in a background thread, from a local cache
+directory, and a dummy inference is run through each so the first real
+request is already fast.
+
+A failed warm-up (e.g. the Hub is briefly unreachable) is retried with
+exponential backoff, and if every attempt fails the next wait() starts a new
+warm-up instead of failing every request for the life of the process.
+
+The registry also keeps a few numbers (load times, cache size, memory) that
+app.py shows on its stats page (?page=stats) and readiness page
+(?page=ready). Those pages are drawn by Streamlit over a websocket, so they
+are for a browser: a plain HTTP GET never sees the status. For load balancers
+and probes, when running locally or on your own server, setting HEALTH_PORT
+starts a small HTTP server with real status codes (HF Spaces only routes the
+app port, so it is not reachable there):
+
+    GET /health  -> 200 while the process is alive
+    GET /ready   -> 200 once the models are warm, 503 before that
+    GET /stats   -> JSON with load times, cache size and memory
+
+To fill the cache ahead of time (for example in a build step) run:
+    python warmup.py
+'''
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ====== CONFIGURATION ======
+# Note: the same model names app.py used to load inside answer_question()
+QA_MODEL_NAME = "deepset/roberta-base-squad2"
+EMBEDDING_MODEL_NAME = "sentence-transformers/multi-qa-mpnet-base-dot-v1"
+
+# Models are downloaded once into this folder and reused on every restart
+MODEL_CACHE_DIR = os.getenv(
+    "MODEL_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
+)
+# Side port for the health server; unset (the default) means no server.
+# Local only: HF Spaces does not route any port other than the app's.
+HEALTH_PORT = int(os.getenv("HEALTH_PORT")) if os.getenv("HEALTH_PORT") else None
+
+# Retries of a failed warm-up: waits 2, 4, 8... seconds between attempts
+WARMUP_ATTEMPTS = 3
+WARMUP_BACKOFF_S = 2.0
+
+
+# ====== HELPERS ======
+def directory_size(path):
+    """Total size in bytes of all files under path (0 if it does not exist)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # file removed while walking
+    return total
+
+
+def memory_usage_mb():
+    """Current and peak resident memory of this process, in MB"""
+    current = None
+    try:
+        # Linux only: second field of statm is the resident set in pages
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except (OSError, ValueError):
+        pass
+
+    peak = None
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KB on Linux and in bytes on macOS
+        peak = peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass  # not available on Windows
+
+    return {"rss_mb": current, "peak_rss_mb": peak}
+
+
+# ====== MODEL REGISTRY ======
+class ModelRegistry:
+    """Loads and warms the embedder and the QA pipeline once per process"""
+
+    def __init__(self, cache_dir=MODEL_CACHE_DIR, attempts=WARMUP_ATTEMPTS, backoff_s=WARMUP_BACKOFF_S):
+        self.cache_dir = cache_dir
+        self.attempts = attempts
+        self.backoff_s = backoff_s
+        self.embeddings = None
+        self.qa_pipeline = None
+        self.load_times = {}
+        self.error = None
+        self.failures = 0  # failed attempts so far, across warm-ups
+        self.started_at = time.time()
+        self._ready = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # --- Loading ---
+    def warm_up(self):
+        """Loads both models, retrying with backoff; sets .error if every attempt failed"""
+        try:
+            for attempt in range(self.attempts):
+                if attempt:
+                    time.sleep(self.backoff_s * 2 ** (attempt - 1))
+                try:
+                    self._load()
+                    self.error = None
+                    return
+                except Exception as e:
+                    self.failures += 1
+                    self.error = str(e)
+        finally:
+            # set even on error so nobody waits forever; callers check .error
+            self._ready.set()
+
+    def _load(self):
+        """Loads both models and runs a dummy inference through each"""
+        # Heavy imports stay here so importing this module is instant
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        from transformers import AutoModelForQuestionAnswering, AutoTokenizer, pipeline
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        self.embeddings = HuggingFaceEmbeddings(
+            model_name=EMBEDDING_MODEL_NAME, cache_folder=self.cache_dir
+        )
+        self.load_times["embeddings_load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.embeddings.embed_query("warm up")  # first call builds the graph
+        self.load_times["embeddings_warmup_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(QA_MODEL_NAME, cache_dir=self.cache_dir)
+        model = AutoModelForQuestionAnswering.from_pretrained(
+            QA_MODEL_NAME, cache_dir=self.cache_dir
+        )
+        self.qa_pipeline = pipeline(
+            "question-answering",
+            model=model,
+            tokenizer=tokenizer,
+            max_seq_len=384,  # Standard for RoBERTa
+            top_k=2,  # Get two potential answers
+            handle_impossible_answer=True,  # Better than failing
+        )
+        self.load_times["qa_model_load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.qa_pipeline(question="What is this?", context="This is a warm-up request.")
+        self.load_times["qa_warmup_s"] = time.perf_counter() - start
+
+    def start(self):
+        """Starts the warm-up in a background thread (again only after a failed one)"""
+        with self._lock:
+            running = self._thread is not None and self._thread.is_alive()
+            if self._thread is None or (self.error and not running):
+                self._ready.clear()
+                self._thread = threading.Thread(target=self.warm_up, name="model-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    # --- Access ---
+    @property
+    def ready(self):
+        return self._ready.is_set() and self.error is None
+
+    @property
+    def status(self):
+        if not self._ready.is_set():
+            return "warming"  # also while retrying after a failed attempt
+        return "error" if self.error else "ready"
+
+    def wait(self, timeout=None):
+        """Blocks until the warm-up finished; raises if it failed.
+
+        After a failed warm-up, this first starts a new one and waits for it.
+        """
+        if self.error:
+            self.start()
+        self._ready.wait(timeout)
+        if self.error:
+            raise RuntimeError(f"Model warm-up failed: {self.error}")
+        return self.ready
+
+    def stats(self):
+        return {
+            "status": self.status,
+            "error": self.error,
+            "failed_attempts": self.failures,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "load_times_s": {k: round(v, 3) for k, v in self.load_times.items()},
+            "models": {"qa": QA_MODEL_NAME, "embeddings": EMBEDDING_MODEL_NAME},
+            "cache_dir": self.cache_dir,
+            "cache_size_mb": round(directory_size(self.cache_dir) / 1024**2, 1),
+            "memory": memory_usage_mb(),
+        }
+
+
+# ====== HEALTH ENDPOINT ======
+def start_health_server(registry, port=HEALTH_PORT):
+    """Serves /health, /ready and /stats on a side port in a daemon thread.
+
+    Local or self-hosted only: HF Spaces routes nothing but the app port, so
+    use ?page=ready there. Returns the server, or None if no port is set or
+    it is already taken (for example by another worker on the same machine).
+    """
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/health":
+                self._send(200, {"status": "alive"})
+            elif path == "/ready":
+                self._send(200 if registry.ready else 503, {"status": registry.status})
+            elif path == "/stats":
+                self._send(200, registry.stats())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def _send(self, code, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # uptime checks would flood the Space logs
+
+    if port is None:
+        return None
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), HealthHandler)
+    except OSError:
+        return None
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    return server
+
+
+# Pre-download and warm the models, e.g. during the image build
+if __name__ == "__main__":
+    registry = ModelRegistry()
+    registry.warm_up()
+    print(json.dumps(registry.stats(), indent=2))
+    sys.exit(1 if registry.error else 0)
@@ -16,16 +16,16 @@
 # Import necessary libraries for the frontend (user interface)
 import streamlit as st
 import os
+import sys
 
-# Import backend libraries for processing
-from langchain.text_splitter import CharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-# from langchain.embeddings import HuggingFaceEmbeddings DESACTUALIZADO
-from langchain.vectorstores import FAISS
-from langchain.chains.question_answering import load_qa_chain
-from langchain_community.chat_models import ChatOpenAI
-from langchain.callbacks import get_openai_callback
-from pypdf import PdfReader
+# Shared OpenAI client (rate limits, retries on 429) lives in the parent folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from openai_client import get_client
+
+# Backend libraries (LangChain, FAISS, sentence-transformers, pypdf) are
+# imported inside the functions that use them. They take seconds to load and
+# Streamlit runs this file top to bottom before drawing the page, so keeping
+# them here would delay the upload UI on every cold start.
 
 
 ## -------- Set up the web page with Streamlit-----------
@@ -43,6 +43,11 @@ submit = st.button("Generate Summary")
 
 # Function to split the text into smaller chunks and generate embeddings
 def process_text(text):
+    from langchain.text_splitter import CharacterTextSplitter
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    # from langchain.embeddings import HuggingFaceEmbeddings DESACTUALIZADO
+    from langchain.vectorstores import FAISS
+
     text_splitter = CharacterTextSplitter(
         separator="\n", chunk_size=1000, chunk_overlap=200, length_function=len
     )
@@ -60,6 +65,8 @@ def process_text(text):
 
 # Function to summarize the content of the uploaded PDF
 def summarizer(pdf):
+    from pypdf import PdfReader
+
     response = ""
     pdf_reader = PdfReader(pdf)
     text = ""
@@ -80,14 +87,23 @@ def summarizer(pdf):
         # Search for the most relevant parts of the document for the query
         docs = knowledgeBase.similarity_search(query)
 
-        # Load the LLM (GPT model) to answer the query
-        llm = ChatOpenAI(model="gpt-3.5-turbo-16k", temperature=0.1)
-        chain = load_qa_chain(llm, chain_type="stuff")
-
-        # Run the chain with cost tracking
-        with get_openai_callback() as cost:
-            response = chain.run(input_documents=docs, question=query)
-            print(cost)  # You can see the cost of the API call in the terminal/log
+        # "Stuff" the relevant parts into one prompt, same as load_qa_chain(chain_type="stuff")
+        context = "\n\n".join(doc.page_content for doc in docs)
+        prompt = (
+            "Use the following pieces of context to answer the question at the end. "
+            "If you don't know the answer, just say that you don't know, don't try to make up an answer."
+            f"\n\n{context}\n\nQuestion: {query}\nHelpful Answer:"
+        )
+
+        # Send it through the shared client instead of a ChatOpenAI of our own,
+        # so it is throttled and retried together with the other apps' calls
+        completion = get_client().chat(
+            model="gpt-3.5-turbo-16k",
+            temperature=0.1,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        response = completion.choices[0].message.content
+        print(completion.usage)  # You can see the tokens used by the API call in the terminal/log
 
     return response
 
@@ -0,0 +1,304 @@
+'''
+Offline evaluation and latency regression suite for the retrieval pipelines.
+
+It replays the retrieval step of our apps on a bundled SQuAD-style dataset
+(squad_sample.json) with local embedding models, so we can tell if a change
+to chunking, embeddings or the vector store helps or hurts. Only 12 of its
+180 passages have questions; the rest are distractors on the same topics, so
+the corpus splits into 50-60 chunks and k=4 is a small fraction of them
+(with 5 chunks, recall@4 would be close to 1 for any configuration).
+
+- hf_answer_question   -> answer_question() in the HF Spaces PDF app
+                          (1200/200 chunks, multi-qa-mpnet, FAISS, k=4)
+- openai_process_text  -> process_text() in the OpenAI PDF summarizer
+                          (1000/200 chunks, all-MiniLM-L6-v2, FAISS, k=4)
+- rag_chroma_query     -> collection.query() in the Streamlit RAG app
+                          (Chroma, cosine HNSW, Chroma's default local embedder)
+
+For each configuration it reports recall@k, MRR, index build time and the
+query latency, which only covers embedding the question + the vector search
+(no QA model or LLM call, unlike in the apps). A chunk
+counts as relevant when it contains the gold answer text, the usual
+"answer containment" rule for retrieval evaluation.
+
+Usage:
+    python eval_retrieval.py                         # all configs, compare with baseline
+    python eval_retrieval.py --configs rag_chroma_query --k 1 3 5
+    python eval_retrieval.py --update-baseline       # record current latencies
+    python eval_retrieval.py --max-regression 0.3 --output report.json
+
+Exits with code 1 when a configuration's p95 query latency or index build time
+is more than --max-regression (default 20%) above latency_baseline.json, and
+also when a configuration has no baseline yet (file missing or values null):
+a gate that cannot compare must not pass. Record one with --update-baseline.
+'''
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(HERE, "squad_sample.json")
+BASELINE_PATH = os.path.join(HERE, "latency_baseline.json")
+
+## -------- Configurations under test -----------
+# Note: keep these in sync with the parameters used in the apps
+CONFIGS = {
+    "hf_answer_question": {
+        "store": "faiss",
+        "embedding_model": "sentence-transformers/multi-qa-mpnet-base-dot-v1",
+        "chunk_size": 1200,
+        "chunk_overlap": 200,
+    },
+    "openai_process_text": {
+        "store": "faiss",
+        "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+        "chunk_size": 1000,
+        "chunk_overlap": 200,
+    },
+    "rag_chroma_query": {
+        "store": "chroma",
+        "embedding_model": None,  # Chroma's default embedder, like the RAG app
+        "chunk_size": 1000,
+        "chunk_overlap": 200,
+    },
+}
+
+
+## -------- Dataset -----------
+
+def load_dataset(path=DATASET_PATH):
+    """Returns (corpus_text, questions) from a SQuAD-format json file.
+
+    The contexts are joined with new lines into one document, like the text
+    extracted from a PDF, and each question keeps its first gold answer.
+    """
+    with open(path, encoding="utf-8") as f:
+        squad = json.load(f)
+
+    contexts, questions = [], []
+    for article in squad["data"]:
+        for paragraph in article["paragraphs"]:
+            contexts.append(paragraph["context"])
+            for qa in paragraph["qas"]:
+                if qa["answers"]:  # SQuAD v2 also has unanswerable questions
+                    questions.append({"id": qa["id"], "question": qa["question"],
+                                      "answer": qa["answers"][0]["text"]})
+    return "\n".join(contexts), questions
+
+
+def split_text(text, chunk_size, chunk_overlap):
+    """Same splitter the apps use"""
+    from langchain.text_splitter import CharacterTextSplitter
+
+    splitter = CharacterTextSplitter(
+        separator="\n", chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len
+    )
+    return splitter.split_text(text)
+
+
+## -------- Vector stores -----------
+
+_embedders = {}
+
+def get_embedder(model_name):
+    """Loads each local embedding model once; returns (embedder, load_seconds)"""
+    if model_name not in _embedders:
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        start = time.perf_counter()
+        embedder = HuggingFaceEmbeddings(model_name=model_name)
+        embedder.embed_query("warm up")  # exclude first-call overhead from the latencies
+        _embedders[model_name] = (embedder, time.perf_counter() - start)
+    return _embedders[model_name]
+
+
+def build_index(config, chunks):
+    """Builds the vector store; returns a search(question, k) -> [chunk texts] function"""
+    if config["store"] == "faiss":
+        from langchain.vectorstores import FAISS
+
+        embedder, _ = get_embedder(config["embedding_model"])
+        knowledge_base = FAISS.from_texts(chunks, embedder)
+
+        def search(question, k):
+            return [doc.page_content for doc in knowledge_base.similarity_search(question, k=k)]
+        return search
+
+    if config["store"] == "chroma":
+        import chromadb
+
+        client = chromadb.EphemeralClient()  # in memory, nothing written to disk
+        name = f"eval_{int(time.time() * 1000)}"
+        collection = client.create_collection(name=name, metadata={"hnsw:space": "cosine"})
+        collection.add(documents=chunks, ids=[f"chunk-{i}" for i in range(len(chunks))])
+
+        def search(question, k):
+            results = collection.query(query_texts=[question], n_results=k, include=["documents"])
+            return results["documents"][0]
+        return search
+
+    raise ValueError(f"Unknown store: {config['store']}")
+
+
+## -------- Metrics -----------
+
+def percentile(values, pct):
+    """Nearest-rank percentile, good enough for a few dozen samples"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def evaluate_config(name, config, corpus, questions, ks):
+    max_k = max(ks)
+
+    # Index build: chunking + embedding all chunks + building the store.
+    # Model loading is reported on its own, it is not part of the build.
+    model_load_s = 0.0
+    if config["embedding_model"]:
+        _, model_load_s = get_embedder(config["embedding_model"])
+
+    start = time.perf_counter()
+    chunks = split_text(corpus, config["chunk_size"], config["chunk_overlap"])
+    search = build_index(config, chunks)
+    index_build_s = time.perf_counter() - start
+
+    # the first query pays for lazy initialisation in some stores
+    search(questions[0]["question"], max_k)
+
+    hits = {k: 0 for k in ks}
+    reciprocal_ranks = []
+    latencies_ms = []
+    for q in questions:
+        start = time.perf_counter()
+        retrieved = search(q["question"], max_k)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        rank = next((i + 1 for i, chunk in enumerate(retrieved) if q["answer"] in chunk), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        for k in ks:
+            if rank and rank <= k:
+                hits[k] += 1
+
+    return {
+        "config": name,
+        "num_chunks": len(chunks),
+        "num_questions": len(questions),
+        "recall": {f"@{k}": hits[k] / len(questions) for k in ks},
+        "mrr": statistics.mean(reciprocal_ranks),
+        "index_build_s": index_build_s,
+        "model_load_s": model_load_s,
+        "query_ms": {
+            "mean": statistics.mean(latencies_ms),
+            "p50": percentile(latencies_ms, 50),
+            "p95": percentile(latencies_ms, 95),
+        },
+    }
+
+
+## -------- Regression check -----------
+
+def check_regressions(results, baseline, max_regression):
+    """Returns a list of messages for configs slower than the baseline allows"""
+    failures = []
+    for result in results:
+        reference = baseline.get(result["config"])
+        if not reference:
+            continue
+        limit = 1 + max_regression
+        current = {"p95_query_ms": result["query_ms"]["p95"], "index_build_s": result["index_build_s"]}
+        for metric, value in current.items():
+            if reference.get(metric) is not None and value > reference[metric] * limit:
+                failures.append(
+                    f"{result['config']}: {metric} {value:.3f} > {reference[metric]:.3f} "
+                    f"(+{max_regression:.0%} allowed)"
+                )
+    return failures
+
+
+def print_table(results, ks):
+    header = f"{'config':<22}{'chunks':>7}" + "".join(f"{'R@' + str(k):>7}" for k in ks)
+    header += f"{'MRR':>7}{'build s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        row = f"{r['config']:<22}{r['num_chunks']:>7}"
+        row += "".join(f"{r['recall'][f'@{k}']:>7.2f}" for k in ks)
+        row += f"{r['mrr']:>7.2f}{r['index_build_s']:>9.3f}"
+        row += f"{r['query_ms']['p50']:>9.2f}{r['query_ms']['p95']:>9.2f}"
+        print(row)
+    print("\nbuild s: chunking + embedding + building the store (model loading excluded)")
+    print("p50/p95 ms: embedding the question + vector search only (no QA model or LLM call)")
+    for r in results:
+        # recall@k means little when k covers a good part of the corpus
+        if max(ks) > 0.1 * r["num_chunks"]:
+            print(f"warning: {r['config']} has only {r['num_chunks']} chunks, "
+                  f"recall@{max(ks)} is high by construction")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval evaluation")
+    parser.add_argument("--configs", nargs="+", choices=sorted(CONFIGS), default=sorted(CONFIGS))
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3, 4])
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed slowdown over the baseline (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="save the current latencies as the new baseline")
+    parser.add_argument("--output", help="write the full results as json")
+    args = parser.parse_args()
+
+    corpus, questions = load_dataset(args.dataset)
+    print(f"Dataset: {len(questions)} questions, {len(corpus)} characters\n")
+
+    results = [evaluate_config(name, CONFIGS[name], corpus, questions, args.k)
+               for name in args.configs]
+    print_table(results, args.k)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["_recorded_on"] = f"{platform.platform()}, {platform.processor() or platform.machine()}"
+        for r in results:
+            baseline[r["config"]] = {"p95_query_ms": round(r["query_ms"]["p95"], 3),
+                                     "index_build_s": round(r["index_build_s"], 3)}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    # a missing config or a null value means no latency was recorded yet for it
+    unchecked = [r["config"] for r in results
+                 if (baseline.get(r["config"]) or {}).get("p95_query_ms") is None]
+    if unchecked:
+        print(f"\nFAIL: no latency baseline for {', '.join(unchecked)}, "
+              "run with --update-baseline on this machine to record one.")
+        return 1
+    failures = check_regressions(results, baseline, args.max_regression)
+    if failures:
+        print("\nLatency regressions:")
+        for message in failures:
+            print(f"  - {message}")
+        return 1
+    print("\nNo latency regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import streamlit as st
 import chromadb
-from openai import OpenAI
 import os
+from concurrent.futures import ThreadPoolExecutor
+from openai_client import get_client  # shared client: rate limits, retries on 429, priorities
 
 # Step 1: Set up the OpenAI client using an API key from the environment (safer than hardcoding)
 # Make sure to set your OPENAI_API_KEY in your .streamlit/secrets.toml file or as an environment variable
@@ -11,11 +12,12 @@ if not openai_api_key:
     st.error("Please set your OpenAI API key as an environment variable or in the .streamlit/secrets.toml file.")
     st.stop()
 
-client_openai = OpenAI(api_key=openai_api_key)
+client_openai = get_client(api_key=openai_api_key)
 
 # Function to get a response from the model
-def get_completion(prompt):
-    response = client_openai.chat.completions.create(
+def get_completion(prompt, priority=10):
+    response = client_openai.chat(
+        priority=priority,  # lower number = served first when we are near the rate limit
         model="gpt-3.5-turbo",  # Using the GPT-3.5 Turbo model
         messages=[
             {
@@ -31,6 +33,88 @@ def get_completion(prompt):
     # Return the model's response
     return response.choices[0].message.content
 
+# Context builder for the prompts
+# Chroma often returns overlapping chunks of the same page (chunk 3 and 4 share
+# their edges) and sometimes the same text twice. Sending them verbatim, each
+# with its full metadata dict, wastes a lot of prompt tokens, so we:
+#   1. drop exact duplicates,
+#   2. merge chunks of the same URL with consecutive chunk indexes, removing the overlap,
+#   3. label each passage [S1], [S2]... and list URL + chunks once in a citation table.
+
+def get_chunk_index(meta):
+    # the collection metadata has used both spellings
+    for key in ("chunk_index", "chunk index", "chunk"):
+        if key in meta:
+            try:
+                return int(meta[key])
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def get_source(meta):
+    for key in ("url", "URL", "source"):
+        if key in meta:
+            return str(meta[key])
+    return None
+
+def merge_texts(first, second, min_overlap=20):
+    """Joins two neighbouring chunks, writing the shared edge only once"""
+    if second in first:
+        return first
+    # longest suffix of `first` that is also a prefix of `second`
+    for size in range(min(len(first), len(second)), min_overlap - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+def build_context(documents, metadatas):
+    """Returns (context_text, citation_table) for a list of retrieved chunks"""
+    # 1. drop duplicates (same text, ignoring extra whitespace)
+    seen = set()
+    chunks = []
+    for rank, (doc, meta) in enumerate(zip(documents, metadatas)):
+        meta = meta or {}
+        key = " ".join(doc.split())
+        if key in seen:
+            continue
+        seen.add(key)
+        chunks.append({"rank": rank, "text": doc, "source": get_source(meta), "index": get_chunk_index(meta)})
+
+    # 2. merge runs of consecutive chunks that come from the same URL
+    chunks.sort(key=lambda c: (c["source"] or "", c["index"] if c["index"] is not None else -1, c["rank"]))
+    passages = []
+    for chunk in chunks:
+        last = passages[-1] if passages else None
+        if (
+            last is not None
+            and chunk["source"] is not None
+            and chunk["source"] == last["source"]
+            and chunk["index"] is not None
+            and last["last_index"] is not None
+            and chunk["index"] <= last["last_index"] + 1
+        ):
+            last["text"] = merge_texts(last["text"], chunk["text"])
+            last["last_index"] = max(last["last_index"], chunk["index"])
+            last["rank"] = min(last["rank"], chunk["rank"])
+        else:
+            passages.append(dict(chunk, first_index=chunk["index"], last_index=chunk["index"]))
+
+    # 3. keep the search order (best match first) and give each passage an ID
+    passages.sort(key=lambda p: p["rank"])
+    context_lines = []
+    citation_lines = []
+    for number, passage in enumerate(passages, start=1):
+        context_lines.append(f"[S{number}] {passage['text'].strip()}")
+        if passage["first_index"] is None:
+            chunk_label = "chunk n/a"
+        elif passage["first_index"] == passage["last_index"]:
+            chunk_label = f"chunk {passage['first_index']}"
+        else:
+            chunk_label = f"chunks {passage['first_index']}-{passage['last_index']}"
+        citation_lines.append(f"[S{number}] {passage['source'] or 'unknown source'} ({chunk_label})")
+
+    return "\n\n".join(context_lines), "\n".join(citation_lines)
+
 # Step 2: Setup ChromaDB for similarity search
 # Chroma is a vector database. We are setting it to use in-memory storage, which is useful for quick prototyping.
 
@@ -56,36 +140,35 @@ if st.button("Get Answers"):
     # Perform similarity search with ChromaDB
     results = collection.query(query_texts=[user_question], n_results=n_results, include=["documents", "metadatas"])
     
-    search_results = []  # Store formatted search results
-
-    # Loop through the search results and format them with metadata
-    for res in results["documents"]:
-        for doc, meta in zip(res, results["metadatas"][0]):
-            # Format the document text and its metadata
-            metadata_str = ", ".join(f"{key}: {value}" for key, value in meta.items())
-            search_results.append(f"{doc}\nMetadata: {metadata_str}")
-    
-    # Join search results into a single text block
-    search_text = "\n\n".join(search_results)
+    # Build one compact context: deduplicated, merged passages labelled [S1], [S2]...
+    search_text, citation_table = build_context(results["documents"][0], results["metadatas"][0])
 
     # Step 3: Format the prompt using the RAG (Retrieve and Generate) Instructions
+    # The plain answer doesn't need the sources, so only the passages go in
     prompt = f"""Your task is to answer the following user question using the supplied search results.
     User Question: {user_question}
     Search Results: {search_text}
     """
-    
-    # Get the response from OpenAI
-    response = get_completion(prompt)
-    st.write(response)  # Display OpenAI's answer
 
     # Step 4: Optional improvement, where we ask the assistant to cite passages from the search results.
+    # Metadata is sent once as a small table instead of after every passage
     metadata_prompt = f"""
-    Your task is to answer the following user question using the supplied search results. 
-    At the end of each search result, include Metadata: Cite the passages, their chunk index, and their URL in your answer.
+    Your task is to answer the following user question using the supplied search results.
+    Cite the passages you use by their ID (for example [S1]) and, at the end, list the cited IDs with their URL and chunk index from the Sources table.
     User Question: {user_question}
     Search Results: {search_text}
+    Sources:
+    {citation_table}
     """
-    
-    # Get and display the response with metadata citation
-    metadata_response = get_completion(metadata_prompt)
+
+    # Both prompts are independent, so we send them at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        response_future = executor.submit(get_completion, prompt, 0)  # shown first
+        metadata_future = executor.submit(get_completion, metadata_prompt, 5)
+        response = response_future.result()
+        metadata_response = metadata_future.result()
+
+    st.write(response)  # Display OpenAI's answer
+
+    # Display the response with metadata citation
     st.write("With citations: ", metadata_response)
@@ -0,0 +1,314 @@
+'''
+Shared, rate-limit-aware OpenAI client for all our scripts and apps.
+
+Every call site used to create its own OpenAI() client, with no throttling,
+so a burst of requests hit the API limits and a 429 simply failed. This module
+gives them one client per process that:
+
+- schedules requests with two token buckets, one for requests/min and one for
+  tokens/min, so we stay just under the account limits instead of bouncing off them,
+- retries 429s (and transient 5xx / connection errors) honoring the
+  Retry-After headers, pausing the whole queue meanwhile,
+- sends requests through one async connection pool with a concurrency limit,
+- serves queued requests by priority (lower number = sooner).
+
+Usage from normal (sync) code:
+
+    from openai_client import get_client
+
+    client = get_client()
+    response = client.chat(model="gpt-3.5-turbo", messages=[...])
+    print(response.choices[0].message.content)
+
+And from async code:
+
+    response = await client.achat(model="gpt-3.5-turbo", messages=[...], priority=0)
+
+Limits come from the arguments or from the OPENAI_RPM, OPENAI_TPM,
+OPENAI_MAX_CONCURRENCY and OPENAI_BURST_SECONDS environment variables.
+`python -m unittest test_openai_client` runs bursts against a local mock server
+that injects 429s, to check the scheduler without spending API credits.
+'''
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+DEFAULT_BURST_SECONDS = float(os.getenv("OPENAI_BURST_SECONDS", "1"))
+
+# Used to estimate the tokens of a request before we know the real usage
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+## -------- Token bucket -----------
+
+class TokenBucket:
+    """Classic token bucket refilling at `per_minute` units per minute.
+
+    It holds at most `burst_seconds` worth of units, because the API enforces
+    its limits over short windows: 600 RPM does not mean 600 requests at once.
+    It starts at `initial_fill` of that: a full bucket plus the refill of the
+    first second would let about twice the limit through in the first window.
+    The level may go below zero when a request used more tokens than we
+    estimated; that debt is paid back by the refill before anything else runs.
+    """
+
+    def __init__(self, per_minute, burst_seconds=1.0, clock=time.monotonic, initial_fill=0.0):
+        self.rate = per_minute / 60.0  # units per second
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity * initial_fill
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount):
+        """Seconds until `amount` units are available (0 if they are now)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # a huge request only waits for a full bucket
+        missing = amount - self.level
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount):
+        self._refill()
+        self.level -= amount
+
+    def refund(self, amount):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """Rough token count of a chat request: prompt characters / 4 + completion budget"""
+    prompt_chars = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):  # multimodal messages
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        prompt_chars += len(content)
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def retry_after_seconds(response):
+    """Reads Retry-After (seconds or HTTP date) or retry-after-ms from a response"""
+    if response is None:
+        return None
+    headers = response.headers
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+## -------- Rate-limited client -----------
+
+class RateLimitedClient:
+    """OpenAI chat client with token-bucket scheduling, priorities and retries"""
+
+    def __init__(
+        self,
+        requests_per_minute=DEFAULT_RPM,
+        tokens_per_minute=DEFAULT_TPM,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        max_retries=6,
+        burst_seconds=DEFAULT_BURST_SECONDS,
+        **client_kwargs,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.burst_seconds = burst_seconds
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.client_kwargs = client_kwargs  # api_key, base_url, organization...
+
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "failed": 0, "tokens": 0}
+
+        # Created inside the event loop on first use
+        self._loop = None  # loop the scheduler runs in
+        self._background = None  # loop thread used by the sync chat()
+        self._background_thread = None
+        self._client = None
+        self._queue = []
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._slots = None
+        self._paused_until = 0.0
+        self._dispatcher_task = None
+        self._start_lock = threading.Lock()
+
+    # --- Public API ---
+    async def achat(self, messages, model="gpt-3.5-turbo", priority=10, **kwargs):
+        """Queues a chat completion and waits for it; returns the ChatCompletion"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        estimate = estimate_tokens(messages, kwargs.get("max_tokens"))
+        request = {"model": model, "messages": messages, **kwargs}
+        heapq.heappush(self._queue, (priority, next(self._counter), request, estimate, future, 0))
+        self._wakeup.set()
+        return await future
+
+    def chat(self, messages, model="gpt-3.5-turbo", priority=10, **kwargs):
+        """Blocking version of achat(), safe to call from any thread"""
+        loop = self._background_loop()
+        coroutine = self.achat(messages, model=model, priority=priority, **kwargs)
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    # --- Event loop plumbing ---
+    def _background_loop(self):
+        """Event loop in a daemon thread, used by the sync chat()"""
+        with self._start_lock:
+            if self._background_thread is None:
+                self._background = asyncio.new_event_loop()
+                self._background_thread = threading.Thread(
+                    target=self._background.run_forever, name="openai-client", daemon=True
+                )
+                self._background_thread.start()
+        return self._background
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._dispatcher_task is not None:
+            if self._loop is not loop:
+                raise RuntimeError("A RateLimitedClient can only be used from one event loop")
+            return
+
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        import httpx
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._requests = TokenBucket(self.requests_per_minute, self.burst_seconds)
+        self._tokens = TokenBucket(self.tokens_per_minute, self.burst_seconds)
+        # One keep-alive connection pool for every request; the SDK's own
+        # retries are off because the scheduler handles them
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            )
+        )
+        self._client = AsyncOpenAI(max_retries=0, http_client=http_client, **self.client_kwargs)
+        self._dispatcher_task = loop.create_task(self._dispatch())
+
+    # --- Scheduler ---
+    async def _dispatch(self):
+        """Starts queued requests in priority order as soon as the limits allow"""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            if not self._queue:
+                await self._wakeup.wait()
+                continue
+
+            _, _, _, estimate, future, _ = self._queue[0]
+            if future.cancelled():
+                heapq.heappop(self._queue)
+                continue
+
+            wait = max(
+                self._paused_until - loop.time(),
+                self._requests.time_until(1),
+                self._tokens.time_until(estimate),
+            )
+            if wait > 0:
+                # wake up early if a more urgent request arrives
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._slots.acquire()
+            item = heapq.heappop(self._queue)
+            self._requests.consume(1)
+            self._tokens.consume(item[3])
+            loop.create_task(self._send(item))
+
+    async def _send(self, item):
+        from openai import APIConnectionError, APIStatusError, RateLimitError
+
+        priority, order, request, estimate, future, attempt = item
+        loop = asyncio.get_running_loop()
+        retry_in = None
+        try:
+            response = await self._client.chat.completions.create(**request)
+        except RateLimitError as e:
+            self.stats["rate_limited"] += 1
+            retry_in = retry_after_seconds(e.response)
+            # the API did not count this request, give the budget back
+            self._requests.refund(1)
+            self._tokens.refund(estimate)
+            error = e
+        except APIStatusError as e:
+            if e.status_code < 500:
+                error, retry_in = e, -1  # client errors are not retried
+            else:
+                error = e
+        except APIConnectionError as e:
+            error = e
+        except Exception as e:
+            error, retry_in = e, -1
+        else:
+            used = response.usage.total_tokens if response.usage else estimate
+            self._tokens.consume(used - estimate)  # settle the estimate with the real usage
+            self.stats["requests"] += 1
+            self.stats["tokens"] += used
+            if not future.done():
+                future.set_result(response)
+            return
+        finally:
+            self._slots.release()
+            self._wakeup.set()
+
+        if retry_in == -1 or attempt >= self.max_retries:
+            self.stats["failed"] += 1
+            if not future.done():
+                future.set_exception(error)
+            return
+
+        # exponential backoff with jitter when the server did not say how long
+        if retry_in is None:
+            retry_in = min(60.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
+        self._paused_until = max(self._paused_until, loop.time() + retry_in)
+        self.stats["retries"] += 1
+        # same priority and place in line, one more attempt
+        heapq.heappush(self._queue, (priority, order, request, estimate, future, attempt + 1))
+        self._wakeup.set()
+
+
+## -------- Shared instance -----------
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_client(**kwargs):
+    """Returns the process-wide client (kwargs only apply on the first call)"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = RateLimitedClient(**kwargs)
+    return _shared_client
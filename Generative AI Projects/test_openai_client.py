@@ -0,0 +1,216 @@
+'''
+Tests for openai_client.py against a local mock OpenAI server.
+
+The mock server speaks the /v1/chat/completions API, enforces its own
+requests-per-second limit and can answer 429 with Retry-After headers, either
+at random or for the first requests it gets. The tests check that the shared
+RateLimitedClient:
+
+1. finishes a burst with mixed priorities without losing a request, and with
+   only a few 429s for going over the server limit,
+2. waits as long as the Retry-After / retry-after-ms headers say before
+   sending a request again,
+3. sends the queued requests with a higher priority (lower number) first,
+4. does not let more than its rate through in the first second (TokenBucket).
+
+No API key or credits needed:
+
+    python -m unittest test_openai_client
+'''
+
+import asyncio
+import json
+import random
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai_client import RateLimitedClient, TokenBucket
+
+
+## -------- Mock OpenAI server -----------
+
+class MockServer:
+    """Mock /v1/chat/completions in a daemon thread.
+
+    Every request is logged as (arrival time, prompt, status). Over
+    `limit_per_second` in a one-second window it answers 429, a random
+    `inject_429` share of the allowed requests get a 429 too, and the first
+    len(fail_first) requests get a 429 with the given headers.
+    """
+
+    def __init__(self, limit_per_second=1000, inject_429=0.0, fail_first=(), seed=0):
+        self.log = []
+        self.counters = {"ok": 0, "limited": 0, "injected": 0}
+        lock = threading.Lock()
+        rng = random.Random(seed)
+        window = {"start": time.monotonic(), "count": 0}
+        fail_first = list(fail_first)
+        mock = self
+
+        class MockHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+
+                with lock:
+                    now = time.monotonic()
+                    if fail_first:
+                        mock.log.append((now, prompt, 429))
+                        return self._too_many(fail_first.pop(0))
+                    if now - window["start"] >= 1.0:
+                        window["start"], window["count"] = now, 0
+                    retry_ms = int((1.0 - (now - window["start"])) * 1000) + 1
+                    if window["count"] >= limit_per_second:
+                        mock.counters["limited"] += 1
+                        mock.log.append((now, prompt, 429))
+                        return self._too_many({"retry-after-ms": str(retry_ms)})
+                    if rng.random() < inject_429:
+                        mock.counters["injected"] += 1
+                        mock.log.append((now, prompt, 429))
+                        return self._too_many({"retry-after-ms": str(rng.randint(50, 300))})
+                    window["count"] += 1
+                    mock.counters["ok"] += 1
+                    mock.log.append((now, prompt, 200))
+
+                time.sleep(0.02)  # pretend the model is thinking
+                prompt_tokens = max(1, len(prompt) // 4)
+                self._send(200, {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"echo: {prompt[:20]}"},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 5,
+                              "total_tokens": prompt_tokens + 5},
+                })
+
+            def _too_many(self, headers):
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                           "code": "rate_limit_exceeded"}}, headers)
+
+            def _send(self, code, body, headers=None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_messages(i):
+    return [{"role": "user", "content": f"Request number {i}: " + "lorem ipsum " * 10}]
+
+
+def run_burst(client, priorities):
+    """Sends one request per priority, all at once; returns the results (or exceptions)"""
+    async def burst():
+        return await asyncio.gather(
+            *(client.achat(make_messages(i), priority=priority, max_tokens=16)
+              for i, priority in enumerate(priorities)),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(burst())
+
+
+## -------- Tests -----------
+
+class TestRateLimitedClient(unittest.TestCase):
+    def serve(self, **kwargs):
+        server = MockServer(**kwargs)
+        self.addCleanup(server.close)
+        return server
+
+    def test_burst_loses_no_request(self):
+        limit, n = 40, 200
+        server = self.serve(limit_per_second=limit, inject_429=0.05)
+        # configured a bit under the server limit, like a real account
+        client = RateLimitedClient(requests_per_minute=int(limit * 60 * 0.95), tokens_per_minute=10_000_000,
+                                   max_concurrency=32, api_key="mock", base_url=server.base_url)
+        results = run_burst(client, [0 if i % 10 == 0 else 10 for i in range(n)])
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        self.assertEqual(errors, [])
+        self.assertEqual(client.stats["requests"], n)
+        self.assertEqual(client.stats["failed"], 0)
+        self.assertEqual(server.counters["ok"], n)
+        # the scheduler stays under the limit: a 429 for going over it is rare
+        self.assertLessEqual(server.counters["limited"], n * 0.05)
+
+    def test_waits_for_retry_after_ms(self):
+        server = self.serve(fail_first=[{"retry-after-ms": "400"}])
+        client = RateLimitedClient(api_key="mock", base_url=server.base_url)
+        results = run_burst(client, [10])
+
+        self.assertFalse(isinstance(results[0], Exception), results[0])
+        (rejected, _, status), (retried, _, _) = server.log
+        self.assertEqual(status, 429)
+        self.assertGreaterEqual(retried - rejected, 0.4)
+        self.assertEqual(client.stats["rate_limited"], 1)
+
+    def test_waits_for_retry_after_seconds(self):
+        server = self.serve(fail_first=[{"retry-after": "1"}])
+        client = RateLimitedClient(api_key="mock", base_url=server.base_url)
+        results = run_burst(client, [10])
+
+        self.assertFalse(isinstance(results[0], Exception), results[0])
+        (rejected, _, _), (retried, _, _) = server.log
+        self.assertGreaterEqual(retried - rejected, 1.0)
+
+    def test_higher_priority_served_first(self):
+        server = self.serve()
+        # one request at a time, so the server sees the order of the queue
+        client = RateLimitedClient(max_concurrency=1, api_key="mock", base_url=server.base_url)
+        priorities = [10] * 10 + [0] * 5 + [5] * 5  # the urgent ones are queued last
+        results = run_burst(client, priorities)
+
+        self.assertFalse(any(isinstance(r, Exception) for r in results))
+        served = [priorities[int(prompt.split()[2].rstrip(":"))] for _, prompt, _ in server.log]
+        self.assertEqual(served, sorted(priorities))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_first_second_stays_under_the_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(600, burst_seconds=1.0, clock=lambda: now[0])  # 10 per second
+        sent = 0
+        while now[0] < 1.0:
+            if bucket.time_until(1) == 0:
+                bucket.consume(1)
+                sent += 1
+            now[0] += 0.001
+        self.assertLessEqual(sent, 10)
+
+    def test_refills_up_to_burst_seconds(self):
+        now = [0.0]
+        bucket = TokenBucket(600, burst_seconds=1.0, clock=lambda: now[0])
+        now[0] = 60.0  # idle for a minute
+        self.assertEqual(bucket.time_until(10), 0)
+        bucket.consume(10)
+        self.assertGreater(bucket.time_until(1), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,11 @@
+import numpy as np
+
+from binning import Scale, bucket_by, decade
+from hurricane_aggregates import YearAggregates
+from hurricane_area_index import AreaIndex
+from hurricane_ingest import parse_damages
+from hurricane_table import DAMAGES_NOT_RECORDED, HurricaneTable
+
 # names of hurricanes
 names = [
     "Cuba I",
@@ -286,18 +294,14 @@ deaths = [
 
 # 1
 # Update Recorded Damages
+# "1.42B" -> 1420000000.0 for the whole list at once (see parse_damages() in
+# hurricane_ingest.py); the missing ones keep the "Damages not recorded"
+# string, which HurricaneTable stores as NaN
 def update_damages(damages):
-    conversion = {"M": 1000000, "B": 1000000000}
-    updated_damages = []
-
-    for damage in damages:
-        if damage == "Damages not recorded":
-            updated_damages.append(damage)
-        else:
-            value = float(damage[:-1])  # Extract the numeric part
-            suffix = damage[-1]  # Extract the suffix ('M' or 'B')
-            updated_damages.append(value * conversion[suffix])
-    return updated_damages
+    return [
+        DAMAGES_NOT_RECORDED if np.isnan(damage) else damage
+        for damage in parse_damages(damages).tolist()
+    ]
 
 
 # test function by updating damages
@@ -343,67 +347,54 @@ print(updated_damages)
 
 # 2
 # Create a Table
+# the hurricanes are stored column by column in NumPy arrays (see hurricane_table.py),
+# so the analyses below are vectorized queries instead of loops over dicts
 def construct_hurricane_dict(
     names, months, years, max_sustained_winds, areas_affected, damages, deaths
 ):
-    hurricanes = {}
-
-    for i in range(len(names)):
-        hurricane_info = {
-            "Name": names[i],
-            "Month": months[i],
-            "Year": years[i],
-            "Max Sustained Wind": max_sustained_winds[i],
-            "Areas Affected": areas_affected[i],
-            "Damage": damages[i],
-            "Deaths": deaths[i],
-        }
-        hurricanes[names[i]] = hurricane_info
-
-    return hurricanes
+    return HurricaneTable(
+        names, months, years, max_sustained_winds, areas_affected, damages, deaths
+    )
 
 
 # Test the function
 hurricanes = construct_hurricane_dict(
     names, months, years, max_sustained_winds, areas_affected, updated_damages, deaths
 )
-print(hurricanes)
+print(hurricanes.to_dict())
 
 
 # 3
 # Organizing by Year
 # create a new dictionary of hurricanes with year and key
-def organize_by_year(hurricanes):
-    hurricanes_by_year = {}
+# the per-year aggregates (see hurricane_aggregates.py) already keep the rows
+# of every year, plus counts and totals that are updated as storms are added
+year_stats = YearAggregates(hurricanes)
 
-    for hurricane in hurricanes.values():
-        year = hurricane["Year"]
-        if year not in hurricanes_by_year:
-            hurricanes_by_year[year] = []
-        hurricanes_by_year[year].append(hurricane)
 
-    return hurricanes_by_year
+def organize_by_year(hurricanes):
+    return {year: hurricanes.rows(year_stats.rows_in(year)) for year in year_stats.years()}
 
 
 # Test the function
 hurricanes_by_year = organize_by_year(hurricanes)
 print(hurricanes_by_year)
 
+# statistics of a year or a range of years, without going through the storms
+print(year_stats.year(2005))
+print(year_stats.between(1950, 2000))
+
 
 # 4
 # Counting Damaged Areas
 # create dictionary of areas to store the number of hurricanes involved in
-def count_affected_areas(hurricanes):
-    affected_areas_count = {}
+# the area index (see hurricane_area_index.py) keeps a count and the list of
+# storms per area, and only reads the storms appended since its last query
+area_index = AreaIndex(hurricanes)
 
-    for hurricane in hurricanes.values():
-        for area in hurricane["Areas Affected"]:
-            if area not in affected_areas_count:
-                affected_areas_count[area] = 1
-            else:
-                affected_areas_count[area] += 1
 
-    return affected_areas_count
+def count_affected_areas(hurricanes):
+    return dict(zip(hurricanes.area_names, area_index.counts.tolist()))
 
 
 # Test the function
@@ -414,37 +405,30 @@ print(affected_areas_count)
 # 5
 # Calculating Maximum Hurricane Count
 # find most frequently affected area and the number of hurricanes involved in
-def find_most_affected_area(affected_areas_count):
-    max_area = None
-    max_area_count = 0
-
-    for area, count in affected_areas_count.items():
-        if count > max_area_count:
-            max_area = area
-            max_area_count = count
-
-    return max_area, max_area_count
+def find_most_affected_area(area_index):
+    top = area_index.top_k(1)  # heap over the counts, first area wins ties
+    return top[0] if top else (None, 0)
 
 
 # Test the function
-most_affected_area, most_affected_count = find_most_affected_area(affected_areas_count)
+most_affected_area, most_affected_count = find_most_affected_area(area_index)
 print(
     f"The most affected area is {most_affected_area}, hit {most_affected_count} times."
 )
 
+# more questions the index answers without going through the hurricanes again
+print(area_index.top_k(5))
+print(hurricanes.names[area_index.storms_hitting("Cuba")].tolist())
+print(area_index.by_year("Cuba"))
+print(area_index.co_occurring("Cuba", k=5))
+
 
 # 6
 # Calculating the Deadliest Hurricane
 # find highest mortality hurricane and the number of deaths
 def find_deadliest_hurricane(hurricanes):
-    max_mortality_cane = None
-    max_mortality = 0
-
-    for hurricane in hurricanes.values():
-        if hurricane["Deaths"] > max_mortality:
-            max_mortality_cane = hurricane["Name"]
-            max_mortality = hurricane["Deaths"]
-
+    row, max_mortality = hurricanes.deadliest()
+    max_mortality_cane = None if row is None else hurricanes.names[row]
     return max_mortality_cane, max_mortality
 
 
@@ -458,40 +442,24 @@ print(
 # 7
 # Rating Hurricanes by Mortality
 # categorize hurricanes in new dictionary with mortality severity as key
-def rate_hurricanes_by_mortality(hurricanes):
-    mortality_scale = {0: 0, 1: 100, 2: 500, 3: 1000, 4: 10000}
-    hurricanes_by_mortality = {0: [], 1: [], 2: [], 3: [], 4: [], 5: []}
+mortality_scale = {0: 0, 1: 100, 2: 500, 3: 1000, 4: 10000}
 
-    for hurricane in hurricanes.values():
-        deaths = hurricane["Deaths"]
-        for rating, upper_bound in mortality_scale.items():
-            if deaths > upper_bound:
-                continue
-            hurricanes_by_mortality[rating].append(hurricane)
-            break
-        else:
-            hurricanes_by_mortality[5].append(hurricane)
 
-    return hurricanes_by_mortality
+def rate_hurricanes_by_mortality(hurricanes):
+    # {rating: row indices}; the whole deaths column is rated at once (see binning.py)
+    return Scale.from_dict(mortality_scale).buckets(hurricanes.deaths)
 
 
 # Test the function
 hurricanes_by_mortality = rate_hurricanes_by_mortality(hurricanes)
-print(hurricanes_by_mortality)
+print({rating: hurricanes.rows(rows) for rating, rows in hurricanes_by_mortality.items()})
 
 
 # 8 Calculating Hurricane Maximum Damage
 # find highest damage inducing hurricane and its total cost
 def find_most_damaging_hurricane(hurricanes):
-    max_damage_cane = None
-    max_damage = 0
-
-    for hurricane in hurricanes.values():
-        damage = hurricane["Damage"]
-        if damage != "Damages not recorded" and damage > max_damage:
-            max_damage_cane = hurricane["Name"]
-            max_damage = damage
-
+    row, max_damage = hurricanes.most_damaging()
+    max_damage_cane = None if row is None else hurricanes.names[row]
     return max_damage_cane, max_damage
 
 
@@ -505,25 +473,20 @@ print(
 # 9
 # Rating Hurricanes by Damage
 # categorize hurricanes in new dictionary with damage severity as key
-def rate_hurricanes_by_damage(hurricanes):
-    damage_scale = {0: 0, 1: 100000000, 2: 1000000000, 3: 10000000000, 4: 50000000000}
-    hurricanes_by_damage = {0: [], 1: [], 2: [], 3: [], 4: [], 5: []}
+damage_scale = {0: 0, 1: 100000000, 2: 1000000000, 3: 10000000000, 4: 50000000000}
 
-    for hurricane in hurricanes.values():
-        damage = hurricane["Damage"]
-        if damage == "Damages not recorded":
-            continue
-        for rating, upper_bound in damage_scale.items():
-            if damage > upper_bound:
-                continue
-            hurricanes_by_damage[rating].append(hurricane)
-            break
-        else:
-            hurricanes_by_damage[5].append(hurricane)
 
-    return hurricanes_by_damage
+def rate_hurricanes_by_damage(hurricanes):
+    # {rating: row indices}; hurricanes without recorded damages (NaN) are left out
+    return Scale.from_dict(damage_scale).buckets(hurricanes.damages)
 
 
 # Test the function
 hurricanes_by_damage = rate_hurricanes_by_damage(hurricanes)
-print(hurricanes_by_damage)
+print({rating: hurricanes.rows(rows) for rating, rows in hurricanes_by_damage.items()})
+
+# several keys at once: hurricanes per (decade, damage rating)
+hurricanes_by_decade_and_damage = bucket_by(
+    decade(hurricanes.years), (Scale.from_dict(damage_scale), hurricanes.damages)
+)
+print({key: hurricanes.names[rows].tolist() for key, rows in hurricanes_by_decade_and_damage.items()})
@@ -1,3 +1,5 @@
+from insurance_records import RecordStore
+
 # Add your code here
 medical_costs = {}
 
@@ -14,12 +16,10 @@ medical_costs["Vinay"] = 3325.0
 # print(medical_costs)
 
 
-total_cost  = 0
-for value in medical_costs.values():
-  total_cost += value
-  #puedo imprimir cada valor si quisiera, con el prin dentro del fos en este caso
-  #print(value)
-average_cost = total_cost /len(medical_costs)
+# el store (ver insurance_records.py) lleva la suma y la cantidad a medida que se
+# agregan registros, el promedio sale sin recorrer los valores
+costs = RecordStore(medical_costs.items())
+average_cost = costs.average_cost
 # print(f"Average Insurance Cost: {average_cost}")
 
 
@@ -1,33 +1,40 @@
+from insurance_estimator import STANDARD
+from insurance_sensitivity import Perturbation, sensitivity
+
 # create the initial variables below
 age = 28
 sex = 0
 bmi = 26.2
 num_of_children = 3
 smoker = 0
+person = {"age": [age], "sex": [sex], "bmi": [bmi], "num_of_children": [num_of_children], "smoker": [smoker]}
 
 # Add insurance estimate formula below
-insurance_cost = insurance_cost = 250 * age - 128 * sex + 370 * bmi + 425 * num_of_children + 24000 * smoker - 12500
+insurance_cost = STANDARD.estimate(person)[0].item()  # shared formula, see insurance_estimator.py
 print(f"This person's {insurance_cost} is {insurance_cost} dollars.")
 #print("This person's insurance cost is " + str(insurance_cost) + " dollars.")
 
+# the what-if scenarios are computed together, without changing the variables
+# above (see insurance_sensitivity.py); the formula is linear, so a change of
+# age or BMI costs the same for everybody: weight * amount
+scenarios = [
+    Perturbation("age +4", shift={"age": 4}),
+    Perturbation("bmi +3.1", shift={"bmi": 3.1}),
+    Perturbation("male", replace={"sex": 1}),
+]
+table = sensitivity(STANDARD, person, scenarios)  # one row per (scenario, person)
+changes = dict(zip(table["perturbation"], table["delta"].tolist()))
+
 # Age Factor
-age += 4
-new_insurance_cost = 250 * age - 128 * sex + 370 * bmi + 425 * num_of_children + 24000 * smoker - 12500
-change_in_insurance_cost = new_insurance_cost - insurance_cost
+change_in_insurance_cost = changes["age +4"]
 print("The change in estimated insurance cost after increasing the age by 4 years is " + str(change_in_insurance_cost) + " dollars")
 
 
 # BMI Factor
-age = 28
-bmi += 3.1
-new_insurance_cost = 250 * age - 128 * sex + 370 * bmi + 425 * num_of_children + 24000 * smoker - 12500
-change_in_insurance_cost = new_insurance_cost - insurance_cost
+change_in_insurance_cost = changes["bmi +3.1"]
 print("The change in estimated insurance cost after increasing BMI by 3.1 is " + str(change_in_insurance_cost) + " dollars.")
 
 
 # Male vs. Female Factor
-bmi = 26.2
-sex = 1
-new_insurance_cost = 250 * age - 128 * sex + 370 * bmi + 425 * num_of_children + 24000 * smoker - 12500
-change_in_insurance_cost = new_insurance_cost - insurance_cost
-print(f"The change in estimated cost for being male instead of female is {change_in_insurance_cost} dollars")
\ No newline at end of file
+change_in_insurance_cost = changes["male"]
+print(f"The change in estimated cost for being male instead of female is {change_in_insurance_cost} dollars")
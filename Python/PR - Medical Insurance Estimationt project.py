@@ -1,6 +1,9 @@
+from insurance_estimator import STANDARD
+
 # Function to estimate insurance cost:
 def estimate_insurance_cost(name, age, sex, bmi, num_of_children, smoker):
-  estimated_cost = 250*age - 128*sex + 370*bmi + 425*num_of_children + 24000*smoker - 12500
+  # shared formula, see insurance_estimator.py
+  estimated_cost = STANDARD.estimate_one(age=age, sex=sex, bmi=bmi, num_of_children=num_of_children, smoker=smoker)
   print(name + "'s Estimated Insurance Cost: " + str(estimated_cost) + " dollars.")
   return estimated_cost
  
@@ -1,6 +1,8 @@
 
 # medical insurance project prctice with conditionals and functions 
 
+from insurance_estimator import PART_2
+
 
 def analyze_smoker(smoker_status):
   if smoker_status == 1:
@@ -11,7 +13,8 @@ def analyze_smoker(smoker_status):
  
 # Function to estimate insurance cost:
 def estimate_insurance_cost(name, age, sex, num_of_children, smoker):
-  estimated_cost = 400*age - 128*sex + 425*num_of_children + 10000*smoker - 2500
+  # 400*age - 128*sex + 425*num_of_children + 10000*smoker - 2500, see insurance_estimator.py
+  estimated_cost = PART_2.estimate_one(age=age, sex=sex, num_of_children=num_of_children, smoker=smoker)
   print(name + "'s Estimated Insurance Cost: " + str(estimated_cost) + " dollars.")
   analyze_smoker(smoker)
   return estimated_cost
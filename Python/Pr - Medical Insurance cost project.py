@@ -1,4 +1,6 @@
 
+from insurance_records import RecordStore
+
 # as part of the Python list practice, here we have a list of medical records that contain names and insurance costs.
 
 names = ["Mohamed", "Sara", "Xia", "Paul", "Valentina", "Jide", "Aaron", "Emily", "Nikita", "Paul"]
@@ -21,23 +23,27 @@ print(f" There are {num_medical_records} medical records")
 first_medical_record = medical_records[0]
 print(f"Here is the first medical record: {first_medical_record}")
 
+# el store (ver insurance_records.py) mantiene un indice ordenado por costo y
+# uno por nombre, asi no hace falta ordenar ni recorrer la lista en cada consulta
+records = RecordStore((name, cost) for cost, name in medical_records)
+
 #Sorting and Ordering Lists
-medical_records.sort()
+medical_records = records.sorted()
 print(f"Here are the medical records sorted by insurance cost: {medical_records}")
 
 #Slicing List
-cheapest_three = medical_records[:3] # primeros 3 o 3 mas baratos
+cheapest_three = records.cheapest(3) # primeros 3 o 3 mas baratos
 print(f"Here are the three cheapest insurance costs in our medical records: {cheapest_three}")
 
-priciest_three = medical_records[-3:] # ultimos 3 o 3 mas caros
+priciest_three = records.priciest(3) # ultimos 3 o 3 mas caros
 print(f"Here are the three most expensive insurance costs in our medical records: {priciest_three}")
 
 
 #Counting Elements in a List
 #chequea valor boleano si "Paul" se encuentra en names
-occurrences_paul = "Paul" in names 
+occurrences_paul = "Paul" in records
 print(occurrences_paul) 
 
 #cuenta la cantidad de veces que "Paul" se repite dentro de names
-occurrences_paul_b =  names.count("Paul")
+occurrences_paul_b = records.name_count("Paul")
 print(f"There are {occurrences_paul_b} individuals with the name Paul in our medical records.")
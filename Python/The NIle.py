@@ -4,6 +4,10 @@
 
 import math
 
+from nile_dispatch import DriverIndex
+from nile_ledger import RevenueLedger, format_cents
+from nile_shipping import driver_arrays, format_prices, quote_trips
+
 # Constantes simuladas
 SHIPPING_PRICES = {
     "standard": 1.0,
@@ -64,3 +68,38 @@ def calculate_money_made(**trips):
 
 # Test the function llamándola
 test_function(calculate_money_made)
+
+# Cotizacion por lotes (ver nile_shipping.py): todas las distancias de una vez,
+# precios numericos hasta el final y el conductor mas barato de cada viaje
+# con un argmin sobre la matriz viajes x conductores
+origins = [(0, 0), (2, 3), (-1, 4)]
+destinations = [(3, 4), (5, 7), (2, 0)]
+drivers = [{"name": "Ana", "speed": 7, "salary": 10}, {"name": "Luis", "speed": 9, "salary": 8},
+           {"name": "Eva", "speed": 5, "salary": 4}]
+driver_positions = [(0, 1), (2, 2), (9, 9)]  # el conductor tambien tiene que llegar al origen
+quote = quote_trips(origins, destinations, ["standard", "express", "overnight"], *driver_arrays(drivers),
+                    driver_positions=driver_positions)
+for price, driver, driver_cost in zip(format_prices(quote.shipping_cost), quote.driver, format_prices(quote.driver_cost)):
+    print(f"Shipping {price}, driver {drivers[driver]['name']} ({driver_cost})")
+
+# Indice espacial de conductores (ver nile_dispatch.py): los conductores se
+# mueven y cada consulta solo mira las celdas cercanas al origen del viaje
+dispatch = DriverIndex(cell_size=5)
+for driver, position in zip(drivers, driver_positions):
+    dispatch.insert(driver["name"], position, driver["salary"], driver["speed"])
+dispatch.move("Eva", (1, 1))
+for name, cost, distance in dispatch.cheapest((0, 0), radius=5, k=2, trip_distance=5):
+    print(f"{name} is {distance:.2f} away and costs {format_prices([cost])[0]}")
+
+# Libro de ingresos (ver nile_ledger.py): los viajes llegan de a uno (de un
+# iterador o un archivo) y los totales se llevan en centavos exactos
+trip_feed = [
+    {"cost": 45.10, "driver": {"name": "Ana", "cost": 20.05}, "time": "2024-05-02T09:15:00"},
+    {"cost": 30.20, "driver": {"name": "Luis", "cost": 12.10}, "time": "2024-05-02T09:50:00"},
+    {"cost": 18.30, "driver": {"name": "Ana", "cost": 7.70}, "time": "2024-05-02T11:05:00"},
+]
+ledger = RevenueLedger()
+ledger.consume(iter(trip_feed))
+print(f"Money made: {format_cents(ledger.total_cents)}")
+for hour, cents in ledger.hourly():
+    print(f"  {hour:%H:00}  {format_cents(cents)}")
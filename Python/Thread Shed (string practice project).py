@@ -2,6 +2,10 @@
 
 
 
+from collections import Counter
+
+from thread_shed import SalesParser
+
 # Define daily_sales (datos ficticios para que el código funcione)
 daily_sales = """John Doe ;,; $20.15 ;,; red ;,; 
 Jane Smith ;,; $13.45 ;,; green&yellow ;,; 
@@ -54,12 +58,11 @@ for sale in thread_sold:
     for color in sale.split("&"):
         thread_sold_split.append(color)
 
+# un solo recorrido de la lista: Counter cuenta todos los colores a la vez
+thread_counts = Counter(thread_sold_split)
+
 def color_count(color):
-    color_total = 0
-    for thread_color in thread_sold_split:
-        if color == thread_color:
-            color_total += 1
-    return color_total
+    return thread_counts[color]
 
 # print(color_count('white'))
 
@@ -68,4 +71,14 @@ colors = ['red', 'yellow', 'green', 'white', 'black', 'blue', 'purple']
 for color in colors:
     print("Thread Shed sold {0} threads of {1} thread today".format(color_count(color), color))
 
-# print(thread_sold_split)
\ No newline at end of file
+# print(thread_sold_split)
+
+# El parser de thread_shed.py lee las ventas en una sola pasada (montos en
+# centavos, colores contados mientras lee). Aqui las ventas van separadas por
+# saltos de linea y no por ",", asi que el split(",") de arriba solo ve la
+# primera venta; el parser las encuentra todas.
+parser = SalesParser()
+parser.parse_text(daily_sales)
+print("Total sales (parser):", parser.tally.total)
+for color in colors:
+    print("Thread Shed sold {0} threads of {1} thread today (parser)".format(parser.tally.color_count(color), color))
@@ -0,0 +1,40 @@
+
+# Helpers shared by the benchmarks in this folder.
+#
+# Importing this module also puts the folder above (where the modules under
+# test live) on sys.path, so every benchmark starts with
+#
+#   from _common import timed
+#
+# before importing the modules it measures.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def timed(label, func, *args, **kwargs):
+    """Runs func(*args, **kwargs) once and prints its time in seconds; returns (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34}{elapsed:>9.3f} s")
+    return result, elapsed
+
+
+def timed_ms(label, func, *args, **kwargs):
+    """timed(), printing milliseconds, for the short runs"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34}{elapsed * 1000:>9.1f} ms")
+    return result, elapsed
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (Linux; ru_maxrss is in KB there)"""
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
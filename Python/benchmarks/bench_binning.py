@@ -0,0 +1,56 @@
+
+# Benchmark: rating hurricanes by mortality with the original loop over the
+# scale dict vs Scale.buckets() from binning.py, on generated death counts.
+#
+# Usage:
+#   python benchmarks/bench_binning.py
+#   python benchmarks/bench_binning.py --rows 10000000
+
+import argparse
+
+import numpy as np
+
+from _common import timed
+from binning import Scale, bucket_by, decade
+
+mortality_scale = {0: 0, 1: 100, 2: 500, 3: 1000, 4: 10000}
+
+
+# the loop from the original rate_hurricanes_by_mortality(), on row numbers
+# instead of hurricane dicts
+def rate_loop(deaths):
+    hurricanes_by_mortality = {0: [], 1: [], 2: [], 3: [], 4: [], 5: []}
+    for row, death in enumerate(deaths):
+        for rating, limit in mortality_scale.items():
+            if death <= limit:
+                hurricanes_by_mortality[rating].append(row)
+                break
+        else:
+            hurricanes_by_mortality[5].append(row)
+    return hurricanes_by_mortality
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    deaths = rng.integers(0, 20000, args.rows)
+    years = rng.integers(1850, 2025, args.rows)
+    print(f"Rating {args.rows:,} hurricanes")
+
+    deaths_list = deaths.tolist()
+    loop_result, loop_time = timed("loop over the scale dict", rate_loop, deaths_list)
+    scale = Scale.from_dict(mortality_scale)
+    fast_result, fast_time = timed("Scale.buckets()", scale.buckets, deaths)
+    print(f"speed-up: {loop_time / fast_time:.1f}x")
+    for rating, rows in loop_result.items():
+        assert np.array_equal(rows, fast_result[rating])
+
+    buckets, _ = timed("bucket_by(decade, mortality)", bucket_by, decade(years), (scale, deaths))
+    print(f"{len(buckets)} (decade, rating) buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+
+# Benchmark: damage parsing and CSV loading for the hurricane project.
+#
+# Compares the original update_damages() loop (one float() per string, with
+# the "Damages not recorded" sentinel kept in the list) against
+# parse_damages(), which parses the usual "1.42B" strings with pandas string
+# methods, also accepts currencies, commas and K/T suffixes and returns a
+# float64 array, and measures how fast read_hurricanes_csv() streams a
+# generated CSV into a HurricaneTable.
+#
+# Usage:
+#   python benchmarks/bench_damage_parsing.py
+#   python benchmarks/bench_damage_parsing.py --rows 5000000
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from _common import timed
+from hurricane_ingest import parse_damages, read_hurricanes_csv
+
+
+# the loop from the original "Hurricaine Analysis.py", kept here as the reference
+def update_damages_loop(damages):
+    conversion = {"M": 1000000, "B": 1000000000}
+    updated_damages = []
+
+    for damage in damages:
+        if damage == "Damages not recorded":
+            updated_damages.append(damage)
+        else:
+            value = float(damage[:-1])  # Extract the numeric part
+            suffix = damage[-1]  # Extract the suffix ('M' or 'B')
+            updated_damages.append(value * conversion[suffix])
+    return updated_damages
+
+
+def make_damages(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.uniform(1, 999, rows), 2).astype(str)
+    suffixes = rng.choice(["M", "B"], rows)
+    damages = np.char.add(values, suffixes).astype(object)
+    damages[rng.random(rows) < 0.1] = "Damages not recorded"
+    return damages.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    damages = make_damages(args.rows)
+    print(f"Parsing {args.rows:,} damage strings")
+    loop_result, loop_time = timed("update_damages() loop", update_damages_loop, damages)
+    parse_damages(damages[:100])  # imports pandas / pyarrow outside the timing
+    fast_result, fast_time = timed("parse_damages()", parse_damages, damages)
+    print(f"parse_damages() / loop time: {fast_time / loop_time:.1f}x")
+
+    # same numbers, NaN where the loop kept the sentinel string
+    expected = np.array([np.nan if isinstance(d, str) else d for d in loop_result])
+    assert np.allclose(expected, fast_result, equal_nan=True, rtol=0, atol=0)
+
+    # CSV streaming
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "hurricanes.csv")
+        rng = np.random.default_rng(1)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Name,Month,Year,Max Sustained Wind,Areas Affected,Damage,Deaths\n")
+            areas = ["Cuba", "Florida", "Texas", "Mexico", "The Bahamas", "Jamaica"]
+            for i, damage in enumerate(damages):
+                picked = ";".join(rng.choice(areas, 1 + i % 3, replace=False))
+                f.write(f"Storm {i},September,{1900 + i % 120},{150 + i % 40},{picked},{damage},{i % 500}\n")
+        size_mb = os.path.getsize(path) / 1024**2
+
+        table, elapsed = timed("read_hurricanes_csv()", read_hurricanes_csv, path)
+        print(f"{len(table):,} storms, {size_mb:.0f} MB -> {len(table) / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
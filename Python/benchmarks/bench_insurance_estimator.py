@@ -0,0 +1,60 @@
+
+# Benchmark: scoring patients one at a time with the scalar formula (what the
+# Medical Insurance scripts did) vs CostModel.estimate() on the whole batch,
+# given as NumPy arrays, a pandas DataFrame and a pyarrow Table.
+#
+# Usage:
+#   python benchmarks/bench_insurance_estimator.py
+#   python benchmarks/bench_insurance_estimator.py --rows 10000000
+
+import argparse
+
+import numpy as np
+
+from _common import timed
+from insurance_estimator import STANDARD
+
+
+def make_patients(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "age": rng.integers(18, 65, rows),
+        "sex": rng.integers(0, 2, rows),
+        "bmi": np.round(rng.uniform(16, 45, rows), 1),
+        "num_of_children": rng.integers(0, 5, rows),
+        "smoker": (rng.random(rows) < 0.2).astype(np.int64),
+    }
+
+
+def scalar_loop(patients):
+    columns = [patients[field].tolist() for field in ("age", "sex", "bmi", "num_of_children", "smoker")]
+    return [250*age - 128*sex + 370*bmi + 425*num_of_children + 24000*smoker - 12500
+            for age, sex, bmi, num_of_children, smoker in zip(*columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    patients = make_patients(args.rows)
+    print(f"Scoring {args.rows:,} patients")
+    expected, loop_time = timed("scalar formula, one per patient", scalar_loop, patients)
+    costs, numpy_time = timed("estimate() on NumPy arrays", STANDARD.estimate, patients)
+    print(f"speed-up: {loop_time / numpy_time:.1f}x")
+    assert np.array_equal(np.array(expected), costs)  # same order of operations, same floats
+
+    try:
+        import pandas as pd
+        import pyarrow as pa
+    except ImportError:
+        return
+    frame = pd.DataFrame(patients)
+    table = pa.table(patients)
+    from_frame, _ = timed("estimate() on a DataFrame", STANDARD.estimate, frame)
+    from_arrow, _ = timed("estimate() on an Arrow table", STANDARD.estimate, table)
+    assert np.array_equal(from_frame, costs) and np.array_equal(from_arrow, costs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+
+# Benchmark: a Scrabble leaderboard under many concurrent games. Words are
+# played one at a time with play_word() (interleaved between games, with a
+# top-10 query every --query-every words), then the same plays are replayed
+# in bulk from a game log. Both must give the totals of the nested loop of
+# "project Scrabble.py".
+#
+# Usage:
+#   python benchmarks/bench_leaderboard.py
+#   python benchmarks/bench_leaderboard.py --rows 5000000 --players 200000
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from _common import timed
+from scrabble_engine import score_words
+from scrabble_leaderboard import Leaderboard
+from bench_scrabble import make_words
+
+
+def live(players, words, query_every):
+    leaderboard = Leaderboard()
+    for number, (player, word) in enumerate(zip(players, words)):
+        leaderboard.play_word(player, word)
+        if number % query_every == 0:
+            leaderboard.top(10)
+    return leaderboard
+
+
+def replayed(path):
+    leaderboard = Leaderboard()
+    leaderboard.replay(path)
+    return leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000, help="words played")
+    parser.add_argument("--players", type=int, default=20_000, help="players (2 per game)")
+    parser.add_argument("--query-every", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocabulary = make_words(50_000)
+    players = [f"player{number}" for number in rng.integers(0, args.players, args.rows)]
+    words = [vocabulary[number] for number in rng.zipf(1.3, args.rows) % len(vocabulary)]
+    print(f"{args.rows:,} words by {args.players:,} players ({args.players // 2:,} games)")
+
+    expected = {}
+    for player, score in zip(players, score_words(words).tolist()):
+        expected[player] = expected.get(player, 0) + score
+
+    leaderboard, elapsed = timed(f"play_word(), top(10) every {args.query_every}", live, players, words,
+                                 args.query_every)
+    print(f"{args.rows / elapsed:,.0f} words/s")
+    assert leaderboard.totals() == expected
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.log")
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(f"{player}\t{word}\n" for player, word in zip(players, words))
+        leaderboard, elapsed = timed("replay() of the game log", replayed, path)
+    print(f"{args.rows / elapsed:,.0f} words/s")
+    assert leaderboard.totals() == expected
+
+    timed("1000 rank() queries", lambda: [leaderboard.rank(player) for player in players[:1000]])
+    print(leaderboard.top(3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+
+# Benchmark: dispatching with nile_dispatch.DriverIndex while drivers move.
+# Every tick moves --moves drivers, then answers --queries "5 cheapest drivers
+# within the radius" queries, checked against a brute-force pass over every
+# driver with NumPy.
+#
+# Usage:
+#   python benchmarks/bench_nile_dispatch.py
+#   python benchmarks/bench_nile_dispatch.py --drivers 1000000 --ticks 3
+
+import argparse
+import time
+
+import numpy as np
+
+import _common  # noqa: F401  (puts the modules under test on sys.path)
+from nile_dispatch import DriverIndex
+from nile_shipping import distances
+
+
+def brute_force(positions, salaries, speeds, pickup, radius, k, trip_distance):
+    found = distances(positions, pickup)
+    costs = salaries * ((found + trip_distance) / speeds)
+    inside = np.flatnonzero(found <= radius)
+    return inside[np.lexsort((inside, costs[inside]))][:k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drivers", type=int, default=100_000)
+    parser.add_argument("--size", type=float, default=1000.0, help="side of the square area")
+    parser.add_argument("--radius", type=float, default=15.0)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--moves", type=int, default=20_000, help="driver moves per tick")
+    parser.add_argument("--queries", type=int, default=1000, help="queries per tick")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, args.size, (args.drivers, 2))
+    salaries = rng.uniform(10, 40, args.drivers)
+    speeds = rng.uniform(30, 90, args.drivers)
+    index = DriverIndex(cell_size=args.radius, capacity=args.drivers)
+
+    start = time.perf_counter()
+    for driver, (position, salary, speed) in enumerate(zip(positions.tolist(), salaries.tolist(), speeds.tolist())):
+        index.insert(driver, position, salary, speed)
+    print(f"{args.drivers:,} drivers inserted in {time.perf_counter() - start:.3f} s")
+
+    move_time = query_time = brute_time = 0.0
+    for _ in range(args.ticks):
+        moved = rng.choice(args.drivers, args.moves, replace=False)
+        positions[moved] = np.clip(positions[moved] + rng.normal(0, 2, (args.moves, 2)), 0, args.size)
+        start = time.perf_counter()
+        for driver, position in zip(moved.tolist(), positions[moved].tolist()):
+            index.move(driver, position)
+        move_time += time.perf_counter() - start
+
+        for pickup, trip in zip(rng.uniform(0, args.size, (args.queries, 2)).tolist(),
+                                rng.uniform(1, 50, args.queries).tolist()):
+            start = time.perf_counter()
+            got = index.cheapest(pickup, args.radius, 5, trip)
+            query_time += time.perf_counter() - start
+            start = time.perf_counter()
+            expected = brute_force(positions, salaries, speeds, np.array(pickup), args.radius, 5, trip)
+            brute_time += time.perf_counter() - start
+            assert [driver for driver, _, _ in got] == expected.tolist()
+
+    moves, queries = args.ticks * args.moves, args.ticks * args.queries
+    print(f"move():                {move_time / moves * 1e6:8.2f} us")
+    print(f"cheapest(), grid:      {query_time / queries * 1e6:8.2f} us")
+    print(f"cheapest(), brute:     {brute_time / queries * 1e6:8.2f} us")
+    print(f"average drivers within the radius: {args.drivers * np.pi * args.radius**2 / args.size**2:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+
+# Benchmark: a day-after-day trip feed through nile_ledger.RevenueLedger, vs
+# calculate_money_made(**trips) of "The NIle.py", which needs every trip in
+# memory at once. The feed is a generator, so the ledger's memory (peak RSS)
+# should not grow with --rows.
+#
+# Usage:
+#   python benchmarks/bench_nile_ledger.py
+#   python benchmarks/bench_nile_ledger.py --rows 10000000
+
+import argparse
+import os
+import random
+import tempfile
+
+from _common import peak_rss_mb, timed
+from nile_ledger import RevenueLedger, to_cents
+
+
+def calculate_money_made(**trips):
+    total_money_made = 0
+    for trip_id, trip in trips.items():
+        trip_revenue = trip["cost"] - trip["driver"]["cost"]
+        total_money_made += trip_revenue
+    return total_money_made
+
+
+def trip_feed(rows, drivers=2000, seed=0, start=1_714_521_600):
+    """Trips a few seconds apart, with amounts in cents like real prices"""
+    rng = random.Random(seed)
+    for number in range(rows):
+        yield {"cost": rng.randrange(500, 9000) / 100,
+               "driver": {"name": f"driver{rng.randrange(drivers)}", "cost": rng.randrange(100, 3000) / 100},
+               "time": start + number * 3}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} trips, peak RSS at start {peak_rss_mb():,.0f} MB")
+    _, feed_time = timed("generating the feed alone", lambda: sum(1 for _ in trip_feed(args.rows)))
+    ledger = RevenueLedger()
+    _, elapsed = timed("RevenueLedger.consume(feed)", ledger.consume, trip_feed(args.rows))
+    print(f"{args.rows / (elapsed - feed_time):,.0f} trips/s in the ledger, peak RSS {peak_rss_mb():,.0f} MB, "
+          f"{len(ledger.by_day)} days, {len(ledger.by_driver):,} drivers")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ledger.json")
+        _, elapsed = timed("checkpoint()", ledger.checkpoint, path)
+        restored, _ = timed("restore()", RevenueLedger.restore, path)
+        assert restored.state() == RevenueLedger.restore(path).state()
+
+    rows = min(args.rows, 1_000_000)
+    trips = {f"trip{number}": trip for number, trip in enumerate(trip_feed(rows))}
+    total, _ = timed(f"calculate_money_made(), {rows:,}", lambda: calculate_money_made(**trips))
+    print(f"peak RSS {peak_rss_mb():,.0f} MB with the trips in memory; float total off by "
+          f"{abs(to_cents(round(total, 2)) - _ledger_cents(rows))} cents")
+
+
+def _ledger_cents(rows):
+    ledger = RevenueLedger()
+    ledger.consume(trip_feed(rows))
+    return ledger.total_cents
+
+
+if __name__ == "__main__":
+    main()
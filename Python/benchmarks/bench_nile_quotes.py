@@ -0,0 +1,78 @@
+
+# Benchmark: quoting trips one at a time with the functions of "The NIle.py"
+# (get_distance + calculate_driver_cost over every driver dict) vs
+# nile_shipping.quote_trips() on the whole batch. The loop is timed on the
+# first --loop-rows trips only and extrapolated to the whole batch.
+#
+# Usage:
+#   python benchmarks/bench_nile_quotes.py
+#   python benchmarks/bench_nile_quotes.py --rows 100000 --drivers 1000
+
+import argparse
+import math
+
+import numpy as np
+
+from _common import timed
+from nile_shipping import SHIPPING_PRICES, driver_arrays, quote_trips
+
+
+def get_distance(from_lat, from_long, to_lat, to_long):
+    return math.sqrt((to_lat - from_lat)**2 + (to_long - from_long)**2)
+
+
+def calculate_driver_cost(distance, *drivers):
+    cheapest_driver = None
+    cheapest_driver_price = None
+    for driver in drivers:
+        driver_time = distance / driver["speed"]
+        price_for_driver = driver["salary"] * driver_time
+        if cheapest_driver is None or price_for_driver < cheapest_driver_price:
+            cheapest_driver = driver
+            cheapest_driver_price = price_for_driver
+    return cheapest_driver_price, cheapest_driver
+
+
+def loop_quotes(origins, destinations, shipping_type, drivers):
+    quotes = []
+    for (from_lat, from_long), (to_lat, to_long) in zip(origins.tolist(), destinations.tolist()):
+        distance = get_distance(from_lat, from_long, to_lat, to_long)
+        quotes.append((distance * SHIPPING_PRICES[shipping_type], *calculate_driver_cost(distance, *drivers)))
+    return quotes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--drivers", type=int, default=1000)
+    parser.add_argument("--loop-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    origins = rng.uniform([-40, -10], [60, 50], (args.rows, 2))
+    destinations = origins + rng.normal(0, 2, (args.rows, 2))
+    drivers = [{"speed": speed, "salary": salary}
+               for speed, salary in zip(rng.uniform(30, 90, args.drivers).tolist(),
+                                        rng.uniform(10, 40, args.drivers).tolist())]
+    salaries, speeds = driver_arrays(drivers)
+    positions = rng.uniform([-40, -10], [60, 50], (args.drivers, 2))
+    print(f"{args.rows:,} trips x {args.drivers:,} drivers")
+
+    n = min(args.loop_rows, args.rows)
+    expected, loop_time = timed(f"loop, first {n:,} trips", loop_quotes, origins[:n], destinations[:n],
+                                "express", drivers)
+    print(f"    ~{loop_time * args.rows / n:,.0f} s for all the trips")
+    quote, numpy_time = timed("quote_trips()", quote_trips, origins, destinations, "express", salaries, speeds)
+    print(f"speed-up: {loop_time * args.rows / n / numpy_time:,.0f}x")
+    for (shipping_cost, driver_cost, driver), i in zip(expected, range(n)):
+        assert shipping_cost == quote.shipping_cost[i] and driver_cost == quote.driver_cost[i]
+        assert driver is drivers[quote.driver[i]]
+
+    timed("quote_trips(), with pickup legs", quote_trips, origins, destinations, "express", salaries, speeds,
+          driver_positions=positions)
+    timed("quote_trips(), pickups, haversine", quote_trips, origins, destinations, "express", salaries, speeds,
+          driver_positions=positions, metric="haversine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+
+# Benchmark: memory per patient and cost estimation time for Patient objects
+# (like "classes practice - Medical INsirance.py") vs PatientStore.
+#
+# Usage:
+#   python benchmarks/bench_patient_store.py
+#   python benchmarks/bench_patient_store.py --rows 5000000
+
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from _common import timed
+from patient_store import PatientStore
+
+
+# the Patient class of the practice script, without the prints
+class Patient:
+    def __init__(self, name, age, sex, bmi, num_of_children, smoker):
+        self.name = name
+        self.age = age
+        self.sex = sex
+        self.bmi = bmi
+        self.num_of_children = num_of_children
+        self.smoker = smoker
+
+    def estimated_insurance_cost(self):
+        return 250 * self.age - 128 * self.sex + 370 * self.bmi + 425 * self.num_of_children + 24000 * self.smoker - 12500
+
+
+def make_columns(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        [f"Patient {i}" for i in range(rows)],
+        rng.integers(18, 65, rows).tolist(),
+        rng.integers(0, 2, rows).tolist(),
+        np.round(rng.uniform(16, 45, rows), 1).tolist(),
+        rng.integers(0, 5, rows).tolist(),
+        (rng.random(rows) < 0.2).astype(int).tolist(),
+    )
+
+
+def measured(label, func, rows):
+    tracemalloc.start()
+    result = func()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<34}{used / rows:>9.1f} bytes/patient")
+    return result, used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows)
+    print(f"{args.rows:,} patients")
+    # the names, numbers and floats of the objects are built inside the measurement
+    objects, object_bytes = measured(
+        "Patient objects", lambda: [Patient(n.encode().decode(), a + 0, s + 0, b * 1.0, c + 0, m + 0)
+                                    for n, a, s, b, c, m in zip(*columns)], args.rows)
+    store, store_bytes = measured(
+        "PatientStore", lambda: _filled_store(columns), args.rows)
+    print(f"memory: {object_bytes / store_bytes:.1f}x smaller")
+
+    expected, loop_time = timed("costs, Patient objects",
+                                lambda: [patient.estimated_insurance_cost() for patient in objects])
+    costs, store_time = timed("costs, PatientStore", store.estimated_insurance_costs)
+    print(f"speed-up: {loop_time / store_time:.0f}x")
+    assert np.array_equal(np.array(expected), costs)
+
+
+def _filled_store(columns):
+    store = PatientStore(capacity=len(columns[0]))  # no spare capacity in the measurement
+    store.extend(*columns)
+    return store
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+
+# Benchmark: reconciling estimated vs actual insurance costs with
+# insurance_reconciliation (partitioned, chunk by chunk) vs one in-memory
+# pandas merge of the whole data, which it must agree with.
+#
+# Usage:
+#   python benchmarks/bench_reconciliation.py
+#   python benchmarks/bench_reconciliation.py --rows 20000000 --partitions 32 --no-check
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from _common import peak_rss_mb, timed
+from insurance_reconciliation import reconcile
+
+COHORTS = np.array(["18-29", "30-44", "45-64", "smoker"], dtype=object)
+
+
+def chunks(rows, chunk_rows, seed, actual):
+    """Estimate (or actual) chunks of a shuffled member population, generated on the fly"""
+    rng = np.random.default_rng(seed)
+    members = np.random.default_rng(0).permutation(rows)  # same members, different order per stream
+    if actual:
+        members = members[::-1]
+    for start in range(0, rows, chunk_rows):
+        ids = members[start:start + chunk_rows]
+        estimated = 5000 + (ids % 997) * 20.0  # the estimate is a function of the member
+        if actual:
+            yield {"member_id": ids, "cost": estimated * rng.lognormal(0.05, 0.3, len(ids))}
+        else:
+            yield {"member_id": ids, "cost": estimated, "cohort": COHORTS[ids % len(COHORTS)]}
+
+
+def in_memory(rows, chunk_rows):
+    estimates = pd.concat(map(pd.DataFrame, chunks(rows, chunk_rows, 1, False)))
+    actuals = pd.concat(map(pd.DataFrame, chunks(rows, chunk_rows, 2, True)))
+    merged = estimates.merge(actuals, on="member_id", suffixes=("_estimated", "_actual"))
+    error = merged["cost_actual"] - merged["cost_estimated"]
+    return error.abs().mean(), error.mean(), error.abs().groupby(merged["cohort"]).mean()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--no-check", action="store_true", help="skip the in-memory merge")
+    args = parser.parse_args()
+
+    print(f"Reconciling {args.rows:,} members in chunks of {args.chunk_rows:,}, {args.partitions} partitions")
+    result, elapsed = timed("reconcile(), streamed", lambda: reconcile(
+        chunks(args.rows, args.chunk_rows, 1, False), chunks(args.rows, args.chunk_rows, 2, True),
+        partitions=args.partitions))
+    print(f"{args.rows / elapsed:,.0f} members/s, peak RSS {peak_rss_mb():,.0f} MB")
+    print(f"MAE {result.overall['mae']:,.2f}, bias {result.overall['bias']:+,.2f}, "
+          f"outliers {result.overall['outliers']:,}")
+    if args.no_check:
+        return
+
+    (mae, bias, cohort_mae), _ = timed("pandas merge, all in memory", in_memory, args.rows, args.chunk_rows)
+    print(f"peak RSS {peak_rss_mb():,.0f} MB")
+    assert np.isclose(result.overall["mae"], mae) and np.isclose(result.overall["bias"], bias)
+    assert np.allclose(result.cohorts["mae"].sort_index(), cohort_mae.sort_index())
+
+
+if __name__ == "__main__":
+    main()
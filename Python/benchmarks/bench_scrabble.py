@@ -0,0 +1,68 @@
+
+# Benchmark: scoring a lexicon with score_word() of "project Scrabble.py"
+# (one dict lookup per letter) vs the byte lookup table of scrabble_engine,
+# and rack queries on a Lexicon.
+#
+# The lexicon is random letter strings with English letter frequencies, or a
+# real word list given with --words (one word per line).
+#
+# Usage:
+#   python benchmarks/bench_scrabble.py
+#   python benchmarks/bench_scrabble.py --words /usr/share/dict/words
+
+import argparse
+
+import numpy as np
+
+from _common import timed_ms
+from scrabble_engine import LETTER_POINTS, LETTERS, Lexicon, encode_words, score_buffer, score_words
+
+FREQUENCIES = [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+               6.7, 7.5, 1.9, 0.1, 6.0, 6.3, 9.1, 2.8, 1.0, 2.4, 0.15, 2.0, 0.07]
+RACKS = ["AEINRST", "QUIZ?AE", "ETAOIN?", "??SSXYZ", "retains"]
+
+letter_to_points = dict(zip(LETTERS, LETTER_POINTS))
+letter_to_points[" "] = 0
+
+
+def score_word(word):
+    point_total = 0
+    for letter in word:
+        point_total += letter_to_points.get(letter, 0)
+    return point_total
+
+
+def make_words(count, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(2, 16, count)
+    letters = rng.choice(list(LETTERS), lengths.sum(), p=np.array(FREQUENCIES) / sum(FREQUENCIES))
+    return ["".join(word) for word in np.split(letters, np.cumsum(lengths)[:-1])]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=250_000, help="random words to generate")
+    parser.add_argument("--words", help="word list file to use instead")
+    args = parser.parse_args()
+
+    if args.words:
+        with open(args.words, encoding="utf-8") as file:
+            words = [line.strip().upper() for line in file if line.strip()]
+    else:
+        words = make_words(args.rows)
+    print(f"{len(words):,} words")
+
+    expected, _ = timed_ms("score_word(), one word at a time", lambda: [score_word(word) for word in words])
+    scores, _ = timed_ms("score_words(), str list", score_words, words)
+    assert scores.tolist() == expected
+    encoded = encode_words(words)
+    timed_ms("score_buffer(), already encoded", score_buffer, *encoded)
+
+    lexicon, _ = timed_ms("Lexicon()", Lexicon, words)
+    for rack in RACKS:
+        best, _ = timed_ms(f"best_words({rack!r})", lexicon.best_words, rack, 5)
+        print(f"    {best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+
+# Benchmark: pricing packages one at a time with the if/elif ladders of
+# "Pr - Sal's Shipping" vs shipping_rates.RateEngine.cheapest() on an array of
+# weights. The loop is timed on the first --loop-rows weights only and
+# extrapolated to the whole batch.
+#
+# Usage:
+#   python benchmarks/bench_shipping_rates.py
+#   python benchmarks/bench_shipping_rates.py --rows 10000000
+
+import argparse
+
+import numpy as np
+
+from _common import timed
+from shipping_rates import RateEngine
+
+
+def cheapest_ladder(weight):
+    if weight <= 2:
+        cost_ground = weight * 1.5 + 20
+    elif weight <= 6:
+        cost_ground = weight * 3.00 + 20
+    elif weight <= 10:
+        cost_ground = weight * 4.00 + 20
+    else:
+        cost_ground = weight * 4.75 + 20
+    cost_ground_premium = 125.00
+    if weight <= 2:
+        cost_drone = weight * 4.5
+    elif weight <= 6:
+        cost_drone = weight * 9.00
+    elif weight <= 10:
+        cost_drone = weight * 12.00
+    else:
+        cost_drone = weight * 14.25
+    # first method listed wins ties, like RateEngine
+    return min((cost_ground, 0), (cost_ground_premium, 1), (cost_drone, 2), key=lambda quote: quote[0])
+
+
+def loop_quotes(weights):
+    return [cheapest_ladder(weight) for weight in weights.tolist()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--loop-rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    weights = np.round(rng.exponential(8.0, args.rows), 2)
+    engine = RateEngine.from_config()
+    print(f"{args.rows:,} packages x {len(engine.methods)} methods")
+
+    n = min(args.loop_rows, args.rows)
+    expected, loop_time = timed(f"if/elif loop, first {n:,}", loop_quotes, weights[:n])
+    print(f"    ~{loop_time * args.rows / n:,.1f} s for all the packages")
+    (methods, prices), numpy_time = timed("RateEngine.cheapest()", engine.cheapest, weights)
+    print(f"    {args.rows / numpy_time:,.0f} packages/s")
+    print(f"speed-up: {loop_time * args.rows / n / numpy_time:,.0f}x")
+    assert [price for price, _ in expected] == prices[:n].tolist()
+    assert [method for _, method in expected] == methods[:n].tolist()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+
+# Benchmark: the string-method pipeline of "Thread Shed (string practice
+# project).py" (replace, split, strip loops, one color_count() scan per color)
+# vs thread_shed.SalesParser, and a log directory parsed by a process pool.
+#
+# Usage:
+#   python benchmarks/bench_thread_shed.py
+#   python benchmarks/bench_thread_shed.py --rows 5000000 --days 8
+
+import argparse
+import io
+import os
+import random
+import tempfile
+
+from _common import timed
+from thread_shed import SalesParser, tally_directory
+
+COLORS = ["red", "yellow", "green", "white", "black", "blue", "purple"]
+
+
+def make_log(rows, seed=0):
+    """Sales in the Codecademy layout: fields ";,;"-separated, sales ","-separated"""
+    rng = random.Random(seed)
+    return ",".join(
+        f"Customer {rng.randrange(10000)}   ;,;${rng.randrange(100)}.{rng.randrange(100):02d} "
+        f";,; {'&'.join(rng.sample(COLORS, rng.randint(1, 3)))} ;,;\n09/{rng.randint(10, 30)}/17 "
+        for _ in range(rows))
+
+
+def string_methods(daily_sales):
+    """The practice script, without the prints"""
+    daily_transactions = daily_sales.replace(";,;", "+").split(",")
+    transactions_clean = [[data_point.replace("\n", "").strip(" ") for data_point in transaction.split("+")]
+                          for transaction in daily_transactions]
+    total_sales = 0
+    for transaction in transactions_clean:
+        total_sales += float(transaction[1].strip("$"))
+    thread_sold_split = [color for transaction in transactions_clean for color in transaction[2].split("&")]
+    counts = {color: sum(1 for thread_color in thread_sold_split if thread_color == color) for color in COLORS}
+    return total_sales, counts
+
+
+def tallied(daily_sales):
+    return SalesParser().tally_stream(io.StringIO(daily_sales))
+
+
+def parsed(daily_sales):
+    return SalesParser().parse_text(daily_sales)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=4)
+    args = parser.parse_args()
+
+    log = make_log(args.rows)
+    print(f"{args.rows:,} sales, {len(log) / 1e6:.1f} MB")
+    (total, counts), loop_time = timed("string methods + color_count()", string_methods, log)
+    tally, parser_time = timed("SalesParser.tally_stream()", tallied, log)
+    print(f"speed-up: {loop_time / parser_time:.1f}x")
+    assert round(total * 100) == tally.total_cents and counts == {color: tally.colors[color] for color in COLORS}
+    sales, _ = timed("SalesParser.parse_text(), Sales", parsed, log)
+    assert len(sales) == args.rows
+
+    with tempfile.TemporaryDirectory() as directory:
+        for day in range(args.days):
+            with open(os.path.join(directory, f"day{day:02d}.txt"), "w", encoding="utf-8") as file:
+                file.write(make_log(args.rows // args.days, seed=day))
+        (serial, _), serial_time = timed(f"{args.days} daily logs, one process", tally_directory, directory, ".txt", 1)
+        (pooled, _), pool_time = timed(f"{args.days} daily logs, process pool", tally_directory, directory)
+        print(f"speed-up: {serial_time / pool_time:.1f}x on {os.cpu_count()} CPUs")
+        assert serial.total_cents == pooled.total_cents and serial.colors == pooled.colors
+
+
+if __name__ == "__main__":
+    main()
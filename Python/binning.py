@@ -0,0 +1,122 @@
+
+# Binning whole columns of numbers into rating buckets.
+#
+# A Scale is a sorted list of upper bounds: a value gets the rating of the
+# first bound that is >= the value, and len(bounds) if it is above all of
+# them. That is the rule of the mortality and damage scales of
+# "Hurricaine Analysis.py":
+#
+#   Scale([0, 100, 500, 1000, 10000]).rate([0, 90, 4000, 19325]) -> [0, 1, 4, 5]
+#
+# rate() is one np.searchsorted over the whole column, and buckets are
+# returned as arrays of row indices (slices of a single argsort, no copies of
+# the rows themselves), so the same code works for 30 rows or 30 million.
+# bucket_by() combines several keys, e.g. (decade, damage rating).
+
+import numpy as np
+
+MISSING = -1  # rating of NaN values; they are left out of the buckets
+
+
+class Scale:
+    """Rating scale given by its upper bounds (rating i <=> bounds[i-1] < value <= bounds[i])"""
+
+    def __init__(self, upper_bounds, labels=None):
+        self.upper_bounds = np.asarray(upper_bounds, dtype=np.float64)
+        if np.any(np.diff(self.upper_bounds) < 0):
+            raise ValueError("upper_bounds must be sorted")
+        self.labels = list(labels) if labels is not None else list(range(len(self.upper_bounds) + 1))
+        if len(self.labels) != len(self.upper_bounds) + 1:
+            raise ValueError(f"a scale with {len(self.upper_bounds)} bounds needs "
+                             f"{len(self.upper_bounds) + 1} labels")
+
+    @classmethod
+    def from_dict(cls, scale, above=None):
+        """Scale from a {label: upper bound} dict like mortality_scale / damage_scale.
+
+        The keys are the labels of their bounds; values above every bound get
+        the label `above`, by default the last key + 1 when the keys are
+        integers ({0: 0, ..., 4: 10000} -> 5, like the loops of the project).
+        """
+        items = sorted(scale.items(), key=lambda item: item[1])
+        labels = [label for label, _ in items]
+        if above is None:
+            if not labels or not all(isinstance(label, (int, np.integer)) for label in labels):
+                raise ValueError("pass `above`, the label of values above every bound, for non-integer labels")
+            above = max(labels) + 1
+        return cls([bound for _, bound in items], labels + [above])
+
+    def __len__(self):
+        return len(self.labels)
+
+    def rate(self, values):
+        """Rating index of every value (MISSING for NaN)"""
+        values = np.asarray(values, dtype=np.float64)
+        ratings = np.searchsorted(self.upper_bounds, values, side="left")
+        ratings[np.isnan(values)] = MISSING
+        return ratings
+
+    def buckets(self, values):
+        """{label: row indices} with every label of the scale, rows in order"""
+        groups = group_rows(self.rate(values), len(self))
+        return dict(zip(self.labels, groups))
+
+
+def group_rows(codes, count):
+    """Row indices for each code 0..count-1 (negative codes are dropped).
+
+    One stable argsort, split at the bincount boundaries: each group is a view
+    of the same array and keeps the rows in their original order.
+    """
+    codes = np.asarray(codes)
+    kept = np.flatnonzero(codes >= 0)
+    codes = codes[kept]
+    order = kept[np.argsort(codes, kind="stable")]
+    sizes = np.bincount(codes, minlength=count)
+    return np.split(order, np.cumsum(sizes)[:-1])
+
+
+def decade(years):
+    """1924 -> 1920, for the whole column"""
+    return np.asarray(years) // 10 * 10
+
+
+def bucket_by(*keys):
+    """{(key1, key2, ...): row indices} for rows sharing the same value of every key.
+
+    Each key is a column (e.g. decade(years)) or a (Scale, column) pair, which
+    is rated first. Only combinations that occur are returned, sorted by key;
+    rows with a missing rating are left out.
+    """
+    codes, values, sizes = [], [], []
+    missing = None
+    for key in keys:
+        if isinstance(key, tuple):
+            scale, column = key
+            ratings = scale.rate(column)
+            is_missing = ratings == MISSING
+            codes.append(np.where(is_missing, 0, ratings))
+            values.append(scale.labels)
+            sizes.append(len(scale))
+        else:
+            unique, inverse = np.unique(np.asarray(key), return_inverse=True)
+            is_missing = None
+            codes.append(inverse.reshape(-1))
+            values.append(unique.tolist())
+            sizes.append(len(unique))
+        if is_missing is not None:
+            missing = is_missing if missing is None else missing | is_missing
+
+    combined = np.ravel_multi_index(codes, sizes)
+    if missing is not None:
+        combined[missing] = MISSING
+    present, compact = np.unique(combined[combined >= 0], return_inverse=True)
+    dense = np.full(len(combined), MISSING, dtype=np.int64)
+    dense[combined >= 0] = compact
+    groups = group_rows(dense, len(present))
+
+    result = {}
+    for flat, rows in zip(present, groups):
+        index = np.unravel_index(flat, sizes)
+        result[tuple(values[k][i] for k, i in enumerate(index))] = rows
+    return result
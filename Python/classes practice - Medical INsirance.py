@@ -1,6 +1,9 @@
 
 #lets practice creating a class and methods to estimate the insurance cost of a patient and formulating a patient profile with methods to update the patient's age and number of children.
 
+from insurance_estimator import STANDARD
+from patient_store import PatientStore
+
 class Patient:
     # Constructor method
     def __init__(self, name, age, sex, bmi, num_of_children, smoker):
@@ -13,7 +16,7 @@ class Patient:
 
     # Method to estimate insurance cost
     def estimated_insurance_cost(self):
-        estimated_cost = (250 * self.age - 128 * self.sex + 370 * self.bmi + 425 * self.num_of_children + 24000 * self.smoker - 12500)
+        estimated_cost = STANDARD.estimate_one(**vars(self))  # shared formula, see insurance_estimator.py
         print(f"{self.name}'s estimated insurance cost is {estimated_cost} dollars.")
 
     # Method to update the patient's age
@@ -59,4 +62,12 @@ patient1.update_num_children(4)
 patient1.estimated_insurance_cost()
 
 # call the patient_profile() method and print it, because the method itself don not print the result by itself in the return
-print(patient1.patient_profile())
\ No newline at end of file
+print(patient1.patient_profile())
+
+# for many patients, PatientStore (see patient_store.py) keeps them in typed
+# column arrays and hands out light row views with the same methods
+patients = PatientStore()
+patients.extend(["John Doe", "Maria", "Omar"], [25, 28, 35], [1, 0, 1], [22.2, 26.2, 22.2], [0, 3, 0], [0, 0, 1])
+patients.update_age(patients.column("ages") >= 28, 40)  # a whole cohort at once
+print(patients.estimated_insurance_costs())
+print(patients[1].patient_profile())
@@ -1,11 +1,13 @@
 
 #lest practice functions with a medical insurance cost calculator
 
+from insurance_estimator import STANDARD
 
 
 # Create calculate_insurance_cost() function below: 
 def calculate_insurance_cost(name, age, sex, bmi, num_of_children, smoker):
-  estimated_cost = 250*age - 128*sex + 370*bmi + 425*num_of_children + 24000*smoker - 12500
+  # shared formula, see insurance_estimator.py
+  estimated_cost = STANDARD.estimate_one(age=age, sex=sex, bmi=bmi, num_of_children=num_of_children, smoker=smoker)
   print(f"The estimated insurance cost for {name} is {estimated_cost}  dollars.")
   return estimated_cost
   
@@ -0,0 +1,199 @@
+
+# Per-year aggregates of a HurricaneTable, maintained as storms are appended.
+#
+# For every year (arrays indexed by year - first_year) we keep:
+#
+#   counts, month_counts  -> storms per year, and per (year, month)
+#   max_wind              -> highest max sustained wind
+#   deaths, damage        -> totals (damage ignores "Damages not recorded")
+#   deadliest, costliest  -> row of the deadliest / most damaging storm (no
+#                            deadliest storm in a year where nobody died)
+#   rows                  -> row numbers of the storms of that year
+#
+# refresh() (run by every query) only reads the rows appended since the last
+# call and folds them in with np.add.at / np.maximum.at, which is O(1) per
+# storm. The per-year arrays grow geometrically (a new year is amortized
+# O(1), like list.append), so they may span a few empty years.
+#
+# Range queries ("1950-2000") use prefix sums over the per-year arrays,
+# rebuilt only after new storms arrive, so polling never rescans the storms.
+
+import numpy as np
+
+from hurricane_table import MONTHS
+
+NO_ROW = -1
+
+
+def _empty():
+    return {"storms": 0, "deaths": 0, "damage": 0.0, "max_wind": 0,
+            "deadliest": None, "most_damaging": None, "by_month": {}}
+
+
+class YearAggregates:
+    """Materialized per-year and per-month statistics of a HurricaneTable"""
+
+    def __init__(self, table):
+        self.table = table
+        self.first_year = None
+        self._indexed_rows = 0
+        self._prefix = None  # cumulative sums, rebuilt lazily after an update
+        self._allocate(0)
+
+    # --- Storage ---
+    def _allocate(self, size):
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.month_counts = np.zeros((size, len(MONTHS) + 1), dtype=np.int64)  # last column: unknown month
+        self.max_wind = np.zeros(size, dtype=np.int64)
+        self.deaths = np.zeros(size, dtype=np.int64)
+        self.damage = np.zeros(size, dtype=np.float64)
+        self.max_deaths = np.full(size, -1, dtype=np.int64)
+        self.max_damage = np.full(size, -np.inf)
+        self.deadliest = np.full(size, NO_ROW, dtype=np.int64)
+        self.costliest = np.full(size, NO_ROW, dtype=np.int64)
+        self._rows = [[] for _ in range(size)]
+
+    _ARRAYS = ("counts", "month_counts", "max_wind", "deaths", "damage",
+               "max_deaths", "max_damage", "deadliest", "costliest")
+
+    def _cover(self, low, high):
+        """Makes the per-year arrays span the years low..high"""
+        if self.first_year is not None and self.first_year <= low and high < self.first_year + len(self.counts):
+            return
+        old = {name: getattr(self, name) for name in self._ARRAYS}
+        old_rows, old_first = self._rows, self.first_year
+        if old_first is not None:
+            old_last = old_first + len(self.counts) - 1
+            grows_up = high > old_last
+            low, high = min(low, old_first), max(high, old_last)
+            # at least double the span, on the side that grew
+            spare = max(0, 2 * len(self.counts) - (high - low + 1))
+            if grows_up:
+                high += spare
+            else:
+                low -= spare
+        self.first_year = low
+        self._allocate(high - low + 1)
+        if old_first is not None:
+            shift = old_first - low
+            for name, values in old.items():
+                getattr(self, name)[shift:shift + len(values)] = values
+            self._rows[shift:shift + len(old_rows)] = old_rows
+
+    # --- Updating ---
+    def refresh(self):
+        """Folds in the rows appended to the table since the last call; returns how many"""
+        table = self.table
+        start, stop = self._indexed_rows, len(table)
+        if start == stop:
+            return 0
+        rows = np.arange(start, stop)
+        years = table.years[start:stop]
+        self._cover(int(years.min()), int(years.max()))
+        slots = years - self.first_year
+
+        months = table.month_codes[start:stop].astype(np.int64)
+        deaths = table.deaths[start:stop]
+        damages = table.damages[start:stop]
+
+        np.add.at(self.counts, slots, 1)
+        np.add.at(self.month_counts, (slots, np.where(months >= 0, months, len(MONTHS))), 1)
+        np.maximum.at(self.max_wind, slots, table.max_sustained_winds[start:stop])
+        np.add.at(self.deaths, slots, deaths)
+        np.add.at(self.damage, slots, np.nan_to_num(damages, nan=0.0))
+        for slot, row in zip(slots.tolist(), rows.tolist()):
+            self._rows[slot].append(row)
+
+        died = deaths > 0  # a year where nobody died has no deadliest storm
+        self._update_argmax(self.max_deaths, self.deadliest, slots[died], rows[died], deaths[died])
+        recorded = ~np.isnan(damages)
+        self._update_argmax(self.max_damage, self.costliest, slots[recorded], rows[recorded], damages[recorded])
+
+        self._indexed_rows = stop
+        self._prefix = None
+        return stop - start
+
+    @staticmethod
+    def _update_argmax(best, pointers, slots, rows, values):
+        """Per-year running argmax; on ties the earlier row is kept (like np.argmax)"""
+        before = best[slots]  # only the years of this batch
+        np.maximum.at(best, slots, values)
+        after = best[slots]
+        improved = (after > before) & (values == after)
+        # first new row reaching the new maximum of its year
+        years, first = np.unique(slots[improved], return_index=True)
+        pointers[years] = rows[improved][first]
+
+    # --- Queries ---
+    def years(self):
+        """Years with at least one storm, in order"""
+        self.refresh()
+        return (np.flatnonzero(self.counts) + (self.first_year or 0)).tolist()
+
+    def _slot(self, year):
+        if self.first_year is None or not 0 <= year - self.first_year < len(self.counts):
+            return None
+        return year - self.first_year
+
+    def rows_in(self, year):
+        """Row numbers of the storms of `year`"""
+        self.refresh()
+        slot = self._slot(year)
+        return np.array(self._rows[slot] if slot is not None else [], dtype=np.int64)
+
+    def year(self, year):
+        """Statistics of one year"""
+        self.refresh()
+        slot = self._slot(year)
+        if slot is None or self.counts[slot] == 0:
+            return _empty()
+        return {
+            "storms": int(self.counts[slot]),
+            "deaths": int(self.deaths[slot]),
+            "damage": float(self.damage[slot]),
+            "max_wind": int(self.max_wind[slot]),
+            "deadliest": self._name(self.deadliest[slot]),
+            "most_damaging": self._name(self.costliest[slot]),
+            "by_month": {MONTHS[m]: int(c) for m, c in enumerate(self.month_counts[slot, :len(MONTHS)]) if c},
+        }
+
+    def _name(self, row):
+        return None if row == NO_ROW else self.table.names[row]
+
+    def _prefix_sums(self):
+        if self._prefix is None:
+            zero = lambda values: np.concatenate((np.zeros((1,) + values.shape[1:], values.dtype), values))
+            self._prefix = {
+                "storms": zero(np.cumsum(self.counts)),
+                "deaths": zero(np.cumsum(self.deaths)),
+                "damage": zero(np.cumsum(self.damage)),
+                "by_month": zero(np.cumsum(self.month_counts, axis=0)),
+            }
+        return self._prefix
+
+    def between(self, first, last):
+        """Statistics of the years first..last (both included)"""
+        self.refresh()
+        if self.first_year is None:
+            return _empty()
+        low = min(max(first - self.first_year, 0), len(self.counts))
+        high = min(max(last - self.first_year + 1, 0), len(self.counts))
+        if low >= high:
+            return _empty()
+        prefix = self._prefix_sums()
+        by_month = prefix["by_month"][high] - prefix["by_month"][low]
+
+        deadliest = costliest = NO_ROW
+        if (self.max_deaths[low:high] > 0).any():
+            deadliest = self.deadliest[low + int(np.argmax(self.max_deaths[low:high]))]
+        if np.isfinite(self.max_damage[low:high]).any():
+            costliest = self.costliest[low + int(np.argmax(self.max_damage[low:high]))]
+        return {
+            "storms": int(prefix["storms"][high] - prefix["storms"][low]),
+            "deaths": int(prefix["deaths"][high] - prefix["deaths"][low]),
+            "damage": float(prefix["damage"][high] - prefix["damage"][low]),
+            "max_wind": int(self.max_wind[low:high].max()),
+            "deadliest": self._name(deadliest),
+            "most_damaging": self._name(costliest),
+            "by_month": {MONTHS[m]: int(c) for m, c in enumerate(by_month[:len(MONTHS)]) if c},
+        }
@@ -0,0 +1,108 @@
+
+# Inverted index from affected areas to hurricanes, on top of a HurricaneTable.
+#
+# The table already interns every area string to an integer ID (area_code()).
+# The index keeps, for each area ID:
+#
+#   postings[code] -> row numbers of the hurricanes that hit the area, in order
+#   counts[code]   -> len(postings[code]), so "how many times was X hit" is O(1)
+#
+# It is incremental: the index remembers how many rows of the table it has
+# seen, and refresh() (called by every query) only reads the rows appended
+# since then. Nothing ever rescans the whole dataset.
+
+import heapq
+
+import numpy as np
+
+
+class AreaIndex:
+    """Area -> hurricanes index of a HurricaneTable, kept up to date as storms are appended"""
+
+    def __init__(self, table):
+        self.table = table
+        self._postings = []  # one list of row numbers per area code
+        self._counts = np.zeros(16, dtype=np.int64)
+        self._indexed_rows = 0
+
+    # --- Updating ---
+    def refresh(self):
+        """Indexes the rows appended to the table since the last call; returns how many"""
+        table = self.table
+        start, stop = self._indexed_rows, len(table)
+        if start == stop:
+            return 0
+
+        offsets = table.area_offsets[start:stop + 1]
+        codes = table.area_codes[offsets[0]:offsets[-1]]
+        rows = np.repeat(np.arange(start, stop), np.diff(offsets))
+
+        area_count = len(table.area_names)
+        while len(self._postings) < area_count:
+            self._postings.append([])
+        if area_count > len(self._counts):
+            counts = np.zeros(max(area_count, len(self._counts) * 2), dtype=np.int64)
+            counts[:len(self._counts)] = self._counts
+            self._counts = counts
+
+        # group the new (code, row) pairs by code; the stable sort keeps rows in order
+        order = np.argsort(codes, kind="stable")
+        new_counts = np.bincount(codes, minlength=area_count)
+        grouped_rows = np.split(rows[order], np.cumsum(new_counts)[:-1])
+        for code in np.flatnonzero(new_counts):
+            self._postings[code].extend(grouped_rows[code].tolist())
+        self._counts[:area_count] += new_counts
+
+        self._indexed_rows = stop
+        return stop - start
+
+    # --- Lookups ---
+    def _code(self, area):
+        self.refresh()
+        return self.table.area_to_code.get(area)
+
+    @property
+    def counts(self):
+        """Number of hurricanes per area code (a view, indexed like table.area_names)"""
+        self.refresh()
+        return self._counts[:len(self.table.area_names)]
+
+    def hit_count(self, area):
+        """How many hurricanes hit `area` (0 for an unknown area)"""
+        code = self._code(area)
+        return 0 if code is None else int(self._counts[code])
+
+    def storms_hitting(self, area):
+        """Row numbers of the hurricanes that hit `area`, in table order"""
+        code = self._code(area)
+        return np.array(self._postings[code] if code is not None else [], dtype=np.int64)
+
+    def top_k(self, k):
+        """The k most affected areas as [(area, count)], ties in order of first appearance"""
+        counts = self.counts
+        best = heapq.nlargest(k, range(len(counts)), key=counts.__getitem__)
+        return [(self.table.area_names[code], int(counts[code])) for code in best]
+
+    def by_year(self, area):
+        """{year: number of hurricanes that hit `area` that year}, years in order"""
+        years, counts = np.unique(self.table.years[self.storms_hitting(area)], return_counts=True)
+        return dict(zip(years.tolist(), counts.tolist()))
+
+    def co_occurring(self, area, k=None):
+        """[(other area, storms in common)] for the areas hit by the same hurricanes as
+        `area`, most shared first (the k first if k is given)"""
+        rows = self.storms_hitting(area)
+        if len(rows) == 0:
+            return []
+        # area codes of all those rows, gathered from the table's ragged area array
+        offsets = self.table.area_offsets
+        starts, lengths = offsets[rows], offsets[rows + 1] - offsets[rows]
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        shared = np.bincount(self.table.area_codes[positions], minlength=len(self.table.area_names))
+        shared[self.table.area_to_code[area]] = 0
+
+        others = np.flatnonzero(shared)
+        others = others[np.argsort(-shared[others], kind="stable")]
+        if k is not None:
+            others = others[:k]
+        return [(self.table.area_names[code], int(shared[code])) for code in others]
@@ -0,0 +1,231 @@
+
+# Command line entry point for the hurricane analyses, for batch jobs.
+#
+# "Hurricaine Analysis.py" runs every analysis on the hard-coded lists and
+# prints the results. This script reads any number of season files (CSV with
+# the columns of the practice project, or NOAA HURDAT2 .txt) in parallel with
+# a process pool, merges them into one HurricaneTable, runs the analyses you
+# pick and writes one Parquet (or Arrow/Feather) file per analysis.
+#
+# Usage:
+#   python hurricane_cli.py seasons/*.csv --output results/
+#   python hurricane_cli.py hurdat2.txt --analyses by_year areas --format arrow
+#   python hurricane_cli.py seasons/*.csv --workers 8 --profile
+#
+# --profile prints, for every stage, the wall time, how much the resident
+# memory (RSS) of the main process grew and the peak RSS so far. Only the
+# main process is measured, not the workers. (tracemalloc would give exact
+# allocations, but it made the stages several times slower.)
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from binning import Scale
+from hurricane_aggregates import YearAggregates
+from hurricane_ingest import read_hurdat2, read_hurricanes_csv
+from hurricane_table import MONTHS, HurricaneTable
+
+MORTALITY_SCALE = {0: 0, 1: 100, 2: 500, 3: 1000, 4: 10000}
+DAMAGE_SCALE = {0: 0, 1: 100000000, 2: 1000000000, 3: 10000000000, 4: 50000000000}
+
+
+## -------- Profiling -----------
+
+def rss_mb():
+    """(current, peak) resident memory of this process in MB"""
+    import resource  # Unix only, like --profile
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak / 1024**2 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2, peak
+    except OSError:
+        return peak, peak
+
+
+class Profiler:
+    """Times stages and measures their memory; does nothing if not enabled"""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.stages = []
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def report(self):
+        if not self.enabled:
+            return
+        print(f"{'stage':<24}{'time (s)':>10}{'RSS +MB':>10}{'peak RSS MB':>13}", file=sys.stderr)
+        for name, seconds, grown, peak in self.stages:
+            print(f"{name:<24}{seconds:>10.3f}{grown:>10.1f}{peak:>13.1f}", file=sys.stderr)
+        print(f"{'total':<24}{sum(s[1] for s in self.stages):>10.3f}", file=sys.stderr)
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.rss = rss_mb()[0]
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler.enabled:
+            seconds = time.perf_counter() - self.start
+            rss, peak = rss_mb()
+            self.profiler.stages.append((self.name, seconds, rss - self.rss, peak))
+        return False
+
+
+## -------- Ingest -----------
+
+def load_file(path):
+    """One season file -> HurricaneTable (runs in a worker process)"""
+    if path.lower().endswith(".csv"):
+        return read_hurricanes_csv(path)
+    return read_hurdat2(path)
+
+
+def load_files(paths, workers):
+    """Reads the files in parallel and merges them, in the order given"""
+    table = HurricaneTable()
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            table.extend_table(load_file(path))
+        return table
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(load_file, paths):
+            table.extend_table(part)
+    return table
+
+
+## -------- Analyses -----------
+# each one returns a pandas DataFrame
+
+def storms(table):
+    """Every storm, one row each"""
+    import pandas as pd
+
+    months = np.array(MONTHS + (None,), dtype=object)
+    return pd.DataFrame({
+        "name": table.names,
+        "month": months[table.month_codes],  # -1 (unknown) -> None
+        "year": table.years,
+        "max_sustained_wind": table.max_sustained_winds,
+        "areas_affected": [table.areas_of(row) for row in range(len(table))],
+        "damage": table.damages,
+        "deaths": table.deaths,
+    })
+
+
+def areas(table):
+    """Hurricanes per area, most affected first"""
+    import pandas as pd
+
+    counts = table.area_counts()  # one bincount; AreaIndex would also build the posting lists
+    order = np.argsort(-counts, kind="stable")
+    return pd.DataFrame({"area": np.array(table.area_names, dtype=object)[order], "hurricanes": counts[order]})
+
+
+def by_year(table):
+    """Per-year counts and totals, with the deadliest and most damaging storm"""
+    import pandas as pd
+
+    stats = YearAggregates(table)
+    records = []
+    for year in stats.years():
+        record = stats.year(year)
+        record.pop("by_month")
+        records.append({"year": year, **record})
+    return pd.DataFrame(records, columns=["year", "storms", "deaths", "damage", "max_wind",
+                                          "deadliest", "most_damaging"])
+
+
+def _ratings(table, scale, values):
+    import pandas as pd
+
+    ratings = Scale.from_dict(scale).rate(values)
+    return pd.DataFrame({"name": table.names, "year": table.years, "rating": ratings})
+
+
+def mortality_ratings(table):
+    """Mortality rating of every storm (0-5)"""
+    return _ratings(table, MORTALITY_SCALE, table.deaths)
+
+
+def damage_ratings(table):
+    """Damage rating of every storm (0-5, -1 if damages were not recorded)"""
+    return _ratings(table, DAMAGE_SCALE, table.damages)
+
+
+def extremes(table):
+    """The deadliest and the most damaging storm"""
+    import pandas as pd
+
+    deadliest, deaths = table.deadliest()
+    costliest, damage = table.most_damaging()
+    return pd.DataFrame({
+        "record": ["deadliest", "most_damaging"],
+        "name": [table.names[deadliest] if deadliest is not None else None,
+                 table.names[costliest] if costliest is not None else None],
+        "value": [float(deaths), float(damage)],
+    })
+
+
+ANALYSES = {
+    "storms": storms,
+    "areas": areas,
+    "by_year": by_year,
+    "mortality": mortality_ratings,
+    "damage": damage_ratings,
+    "extremes": extremes,
+}
+
+
+def write(frame, path, file_format):
+    if file_format == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.reset_index(drop=True).to_feather(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hurricane analyses over many season files")
+    parser.add_argument("files", nargs="+", help="CSV (practice project columns) or HURDAT2 files")
+    parser.add_argument("--analyses", nargs="+", choices=sorted(ANALYSES), default=sorted(ANALYSES))
+    parser.add_argument("--output", default="hurricane_results", help="folder for the result files")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--profile", action="store_true", help="time and memory of every stage")
+    args = parser.parse_args(argv)
+
+    profiler = Profiler(args.profile)
+    with profiler.stage(f"ingest ({len(args.files)} files)"):
+        table = load_files(args.files, args.workers)
+    print(f"Loaded {len(table):,} storms, {len(table.area_names):,} areas", file=sys.stderr)
+
+    os.makedirs(args.output, exist_ok=True)
+    extension = "parquet" if args.format == "parquet" else "arrow"
+    for name in args.analyses:
+        with profiler.stage(name):
+            frame = ANALYSES[name](table)
+        with profiler.stage(f"write {name}"):
+            path = os.path.join(args.output, f"{name}.{extension}")
+            write(frame, path, args.format)
+        print(f"{path}: {len(frame):,} rows", file=sys.stderr)
+
+    profiler.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
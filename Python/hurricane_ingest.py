@@ -0,0 +1,175 @@
+
+# Loading hurricane data into a HurricaneTable.
+#
+# parse_damages()       -> "1.42B", "$27.9 M", "2,500,000", "Damages not recorded"...
+#                          to a float64 array (NaN for missing): the usual
+#                          "<number><suffix>" strings are parsed by pandas string
+#                          methods (pyarrow-backed when available), the rest one
+#                          string at a time
+# read_hurricanes_csv() -> streams a CSV with the columns of the practice project
+#                          (Name, Month, Year, Max Sustained Wind, Areas Affected,
+#                          Damage, Deaths) in chunks of rows
+# read_hurdat2()        -> streams a NOAA HURDAT2 best-track file and returns one
+#                          row per storm (name, month and year of the first fix,
+#                          highest wind of all its observations)
+#
+# pandas is only needed for parse_damages() and the two file readers.
+
+import re
+
+import numpy as np
+
+from hurricane_table import HurricaneTable, MONTH_TO_CODE
+
+SUFFIX_MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+_SUFFIXES = {**SUFFIX_MULTIPLIERS, **{letter.lower(): value for letter, value in SUFFIX_MULTIPLIERS.items()}}
+_USUAL_DAMAGE = r"(?:\d+(?:\.\d*)?|\.\d+)[KMBTkmbt]"  # "1.42B": float(number) * multiplier
+# "$27.9 M", "USD 4B", "US$ 4B", "€3.5m", "2,500,000": optional currency, number, optional suffix
+_DAMAGE = re.compile(r"\s*(?:USD?\s*)?[$€£]?\s*(\d[\d,]*(?:\.\d*)?|\.\d+)\s*([KMBT]?)\s*", re.IGNORECASE)
+
+
+## -------- Damage strings -----------
+
+def parse_damage(value):
+    """"1.42B" -> 1420000000.0, float(number) * multiplier like the old loop; NaN if it is not an amount"""
+    if isinstance(value, str):
+        number, multiplier = value[:-1], _SUFFIXES.get(value[-1:])
+        if multiplier and number.replace(".", "", 1).isdecimal():  # the usual "1.42B", no regex needed
+            return float(number) * multiplier
+    match = _DAMAGE.fullmatch(str(value))
+    if match is None:  # "Damages not recorded", "unknown", "N/A", ""...
+        return np.nan
+    number, suffix = match.groups()
+    return float(number.replace(",", "")) * _SUFFIXES.get(suffix, 1.0)
+
+
+def parse_damages(values):
+    """Damage strings (a list or a pandas Series) to a float64 array, NaN for missing values"""
+    import pandas as pd
+
+    try:  # pyarrow parses the numbers in C, with the same rounding as float()
+        import pyarrow as pa
+
+        number_dtype = pd.ArrowDtype(pa.float64())
+    except ImportError:
+        number_dtype = "float64"
+
+    text = pd.Series(values, dtype="str") if not isinstance(values, pd.Series) else values.astype("str")
+    usual = text.str.fullmatch(_USUAL_DAMAGE).to_numpy(dtype=bool, na_value=False)
+    damages = np.full(len(text), np.nan)
+    matched = text[usual]
+    damages[usual] = (matched.str[:-1].astype(number_dtype).to_numpy(np.float64)
+                      * matched.str[-1].map(_SUFFIXES).to_numpy(np.float64))
+    # the rest ("Damages not recorded", "$27.9 M"...) repeats a lot: one parse_damage() per distinct string
+    codes, distinct = pd.factorize(text[~usual].fillna(""))
+    damages[~usual] = np.array([parse_damage(value) for value in distinct.tolist()], dtype=np.float64)[codes]
+    return damages
+
+
+## -------- CSV files -----------
+
+CSV_COLUMNS = ["Name", "Month", "Year", "Max Sustained Wind", "Areas Affected", "Damage", "Deaths"]
+
+
+def read_hurricanes_csv(path, chunk_rows=100_000, area_separator=";", table=None):
+    """Streams a hurricane CSV into a HurricaneTable, `chunk_rows` rows at a time.
+
+    Areas Affected holds all the areas of a storm separated by `area_separator`.
+    Pass an existing `table` to append to it.
+    """
+    import pandas as pd
+
+    table = table if table is not None else HurricaneTable()
+    month_codes = pd.Series(MONTH_TO_CODE, dtype=np.int8)
+    text_columns = {"Name": str, "Month": str, "Areas Affected": str, "Damage": str}
+    numbers = {column: [""] for column in ("Year", "Max Sustained Wind", "Deaths")}
+    # numeric columns go through the C parser (empty -> NaN), the rest stays text
+    for chunk in pd.read_csv(path, usecols=CSV_COLUMNS, dtype=text_columns, chunksize=chunk_rows,
+                             keep_default_na=False, na_values=numbers):
+        months = chunk["Month"].str.strip().map(month_codes).fillna(-1).to_numpy(np.int8)
+
+        # one long Series with every area of the chunk, then intern its unique values
+        flat = chunk["Areas Affected"].str.split(area_separator).explode().str.strip()
+        flat = flat[flat != ""]
+        lengths = flat.groupby(level=0).size().reindex(chunk.index, fill_value=0).to_numpy(np.int64)
+        uniques_codes, uniques = pd.factorize(flat, sort=False)
+        lookup = np.array([table.area_code(area) for area in uniques], dtype=np.int32)
+
+        table.extend_arrays(
+            names=chunk["Name"].str.strip().to_numpy(object),
+            month_codes=months,
+            years=chunk["Year"].fillna(0).to_numpy(np.int32),
+            max_sustained_winds=chunk["Max Sustained Wind"].fillna(0).to_numpy(np.int32),
+            area_codes=lookup[uniques_codes] if len(uniques_codes) else np.zeros(0, np.int32),
+            area_lengths=lengths,
+            damages=parse_damages(chunk["Damage"]),
+            deaths=chunk["Deaths"].fillna(0).to_numpy(np.int64),
+        )
+    return table
+
+
+## -------- HURDAT2 files -----------
+
+# data lines: date, time, record id, status, lat, lon, wind, pressure, 12 wind
+# radii and (since 2022) the radius of maximum wind, then a trailing comma:
+# 21 or 22 fields; header lines have 4
+HURDAT2_COLUMNS = 22
+
+
+def read_hurdat2(path, chunk_rows=500_000, table=None):
+    """Streams a HURDAT2 best-track file into a HurricaneTable (one row per storm).
+
+    HURDAT2 mixes header lines ("AL011851, UNNAMED, 14,") with the observation
+    lines of that storm. Each chunk is parsed by pandas, header lines are found
+    with a vectorized regex and their storm ID is forward-filled down to the
+    observations. A storm split between two chunks is merged at the end.
+    HURDAT2 has no areas, damages or deaths: they stay empty / NaN / 0.
+    """
+    import pandas as pd
+
+    table = table if table is not None else HurricaneTable()
+    storms = []  # one small DataFrame of per-storm aggregates per chunk
+    storm_id = name = None  # storm whose header was in a previous chunk
+
+    reader = pd.read_csv(path, header=None, names=range(HURDAT2_COLUMNS), dtype=str,
+                         skipinitialspace=True, chunksize=chunk_rows, keep_default_na=False)
+    for chunk in reader:
+        first = chunk[0].str.strip()
+        is_header = first.str.match(r"^[A-Z]{2}\d{6}$")
+
+        ids = first.where(is_header)
+        names = chunk[1].str.strip().where(is_header)
+        # observations at the top of the chunk belong to the last storm of the previous one
+        if storm_id is not None and not is_header.iloc[0]:
+            ids.iloc[0], names.iloc[0] = storm_id, name
+        ids, names = ids.ffill(), names.ffill()
+        storm_id, name = ids.iloc[-1], names.iloc[-1]
+
+        data = ~is_header
+        observations = pd.DataFrame({
+            "id": ids[data],
+            "name": names[data],
+            "date": first[data],
+            "wind": pd.to_numeric(chunk.loc[data, 6], errors="coerce"),
+        })
+        storms.append(observations.groupby("id", sort=False).agg(
+            name=("name", "first"), date=("date", "first"), wind=("wind", "max")))
+
+    if not storms:
+        return table
+    per_storm = pd.concat(storms)
+    per_storm = per_storm.groupby(level=0, sort=False).agg(
+        name=("name", "first"), date=("date", "first"), wind=("wind", "max"))
+
+    dates = per_storm["date"].str.slice(0, 8)
+    table.extend_arrays(
+        names=per_storm["name"].to_numpy(object),
+        month_codes=(pd.to_numeric(dates.str.slice(4, 6)) - 1).to_numpy(np.int8),
+        years=pd.to_numeric(dates.str.slice(0, 4)).to_numpy(np.int32),
+        max_sustained_winds=per_storm["wind"].fillna(0).clip(lower=0).to_numpy(np.int32),
+        area_codes=np.zeros(0, dtype=np.int32),
+        area_lengths=np.zeros(len(per_storm), dtype=np.int64),
+        damages=np.full(len(per_storm), np.nan),
+        deaths=np.zeros(len(per_storm), dtype=np.int64),
+    )
+    return table
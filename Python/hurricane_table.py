@@ -0,0 +1,239 @@
+
+# Columnar storage for the hurricane data used in "Hurricaine Analysis.py".
+#
+# Instead of one dict per hurricane (which makes every analysis a Python loop
+# over all the dicts), each field is kept in its own NumPy array, so questions
+# like "which one is the deadliest" are a single vectorized call:
+#
+#   names       -> object array of strings
+#   month_codes -> int8 array, index into MONTHS (-1 if unknown)
+#   years, max_sustained_winds, deaths -> integer arrays
+#   damages     -> float64 array, NaN when "Damages not recorded"
+#   areas       -> CSR-style ragged array: area_codes holds the area IDs of
+#                  every hurricane one after another, and the areas of row i
+#                  are area_codes[area_offsets[i]:area_offsets[i + 1]].
+#                  area_names[code] gives the area string back.
+#
+# The arrays grow by doubling their capacity, so append() is cheap on average
+# and the same class works for the 34 storms of the practice project or the
+# ~2,000 storms of the full HURDAT2 archive.
+
+import numpy as np
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+MONTH_TO_CODE = {month: code for code, month in enumerate(MONTHS)}
+
+DAMAGES_NOT_RECORDED = "Damages not recorded"
+
+
+def _to_damage(value):
+    """Number (already converted by update_damages) or NaN for the missing marker"""
+    if value is None or value == DAMAGES_NOT_RECORDED:
+        return np.nan
+    return float(value)
+
+
+class HurricaneTable:
+    """Hurricane data stored column by column in NumPy arrays"""
+
+    def __init__(self, names=(), months=(), years=(), max_sustained_winds=(),
+                 areas_affected=(), damages=(), deaths=()):
+        self._size = 0
+        self._area_size = 0
+        self._allocate(max(len(names), 16), max(sum(len(a) for a in areas_affected), 16))
+
+        # area string <-> integer ID (IDs follow the order areas first appear)
+        self.area_names = []
+        self.area_to_code = {}
+
+        self.extend(names, months, years, max_sustained_winds, areas_affected, damages, deaths)
+
+    # --- Storage ---
+    def _allocate(self, capacity, area_capacity):
+        self._names = np.empty(capacity, dtype=object)
+        self._month_codes = np.full(capacity, -1, dtype=np.int8)
+        self._years = np.zeros(capacity, dtype=np.int32)
+        self._winds = np.zeros(capacity, dtype=np.int32)
+        self._damages = np.full(capacity, np.nan, dtype=np.float64)
+        self._deaths = np.zeros(capacity, dtype=np.int64)
+        self._area_offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self._area_codes = np.zeros(area_capacity, dtype=np.int32)
+
+    def _grow(self, needed, area_needed):
+        """Doubles the arrays that are too small to hold `needed` rows / areas"""
+        capacity = len(self._names)
+        if needed > capacity:
+            new_capacity = max(needed, capacity * 2)
+            for attr in ("_names", "_month_codes", "_years", "_winds", "_damages", "_deaths"):
+                old = getattr(self, attr)
+                new = np.empty(new_capacity, dtype=old.dtype)
+                if attr == "_damages":
+                    new.fill(np.nan)
+                new[:self._size] = old[:self._size]
+                setattr(self, attr, new)
+            offsets = np.zeros(new_capacity + 1, dtype=np.int64)
+            offsets[:self._size + 1] = self._area_offsets[:self._size + 1]
+            self._area_offsets = offsets
+        if area_needed > len(self._area_codes):
+            codes = np.zeros(max(area_needed, len(self._area_codes) * 2), dtype=np.int32)
+            codes[:self._area_size] = self._area_codes[:self._area_size]
+            self._area_codes = codes
+
+    def area_code(self, area):
+        """Integer ID of an area, creating it the first time it is seen"""
+        code = self.area_to_code.get(area)
+        if code is None:
+            code = len(self.area_names)
+            self.area_to_code[area] = code
+            self.area_names.append(area)
+        return code
+
+    def append(self, name, month, year, max_sustained_wind, areas, damage, deaths):
+        """Adds one hurricane; returns its row number"""
+        return self.extend([name], [month], [year], [max_sustained_wind], [areas], [damage], [deaths])[0]
+
+    def extend(self, names, months, years, max_sustained_winds, areas_affected, damages, deaths):
+        """Adds many hurricanes given as parallel lists; returns their row numbers"""
+        return self.extend_arrays(
+            names=names,
+            month_codes=[MONTH_TO_CODE.get(m, -1) for m in months],
+            years=years,
+            max_sustained_winds=max_sustained_winds,
+            area_codes=np.array([self.area_code(a) for areas in areas_affected for a in areas], dtype=np.int32),
+            area_lengths=np.fromiter((len(a) for a in areas_affected), dtype=np.int64, count=len(names)),
+            damages=[_to_damage(d) for d in damages],
+            deaths=deaths,
+        )
+
+    def extend_arrays(self, names, month_codes, years, max_sustained_winds,
+                      area_codes, area_lengths, damages, deaths):
+        """Adds many hurricanes that are already encoded as arrays (fast path for loaders).
+
+        area_codes holds the area IDs of all the new rows one after another
+        (see area_code()) and area_lengths how many of them belong to each row.
+        """
+        count = len(names)
+        start, stop = self._size, self._size + count
+        self._grow(stop, self._area_size + len(area_codes))
+
+        self._names[start:stop] = names
+        self._month_codes[start:stop] = month_codes
+        self._years[start:stop] = years
+        self._winds[start:stop] = max_sustained_winds
+        self._damages[start:stop] = damages
+        self._deaths[start:stop] = deaths
+
+        self._area_offsets[start + 1:stop + 1] = self._area_size + np.cumsum(area_lengths)
+        self._area_codes[self._area_size:self._area_size + len(area_codes)] = area_codes
+        self._area_size += len(area_codes)
+        self._size = stop
+        return np.arange(start, stop)
+
+    def extend_table(self, other):
+        """Adds all the rows of another HurricaneTable (its area IDs are translated to ours)"""
+        lookup = np.array([self.area_code(area) for area in other.area_names], dtype=np.int32)
+        return self.extend_arrays(
+            names=other.names,
+            month_codes=other.month_codes,
+            years=other.years,
+            max_sustained_winds=other.max_sustained_winds,
+            area_codes=lookup[other.area_codes],
+            area_lengths=np.diff(other.area_offsets),
+            damages=other.damages,
+            deaths=other.deaths,
+        )
+
+    # --- Columns (views, no copies) ---
+    def __len__(self):
+        return self._size
+
+    @property
+    def names(self):
+        return self._names[:self._size]
+
+    @property
+    def month_codes(self):
+        return self._month_codes[:self._size]
+
+    @property
+    def years(self):
+        return self._years[:self._size]
+
+    @property
+    def max_sustained_winds(self):
+        return self._winds[:self._size]
+
+    @property
+    def damages(self):
+        return self._damages[:self._size]
+
+    @property
+    def deaths(self):
+        return self._deaths[:self._size]
+
+    @property
+    def area_offsets(self):
+        return self._area_offsets[:self._size + 1]
+
+    @property
+    def area_codes(self):
+        return self._area_codes[:self._area_size]
+
+    # --- Rows ---
+    def areas_of(self, row):
+        start, stop = self._area_offsets[row], self._area_offsets[row + 1]
+        return [self.area_names[code] for code in self._area_codes[start:stop]]
+
+    def row(self, row):
+        """One hurricane in the same dict format construct_hurricane_dict() used"""
+        damage = self._damages[row]
+        month = self._month_codes[row]
+        return {
+            "Name": self._names[row],
+            "Month": MONTHS[month] if month >= 0 else None,
+            "Year": int(self._years[row]),
+            "Max Sustained Wind": int(self._winds[row]),
+            "Areas Affected": self.areas_of(row),
+            "Damage": DAMAGES_NOT_RECORDED if np.isnan(damage) else float(damage),
+            "Deaths": int(self._deaths[row]),
+        }
+
+    def rows(self, indices):
+        return [self.row(i) for i in indices]
+
+    def to_dict(self):
+        """{name: hurricane dict}, only for printing / backwards compatibility"""
+        return {self._names[i]: self.row(i) for i in range(self._size)}
+
+    # --- Vectorized queries ---
+    def deadliest(self):
+        """(row, deaths) of the deadliest hurricane, or (None, 0) if nobody died"""
+        if self._size == 0 or self.deaths.max() <= 0:
+            return None, 0
+        row = int(np.argmax(self.deaths))  # argmax keeps the first of ties
+        return row, int(self.deaths[row])
+
+    def most_damaging(self):
+        """(row, damage) of the costliest hurricane, ignoring unrecorded damages"""
+        damages = self.damages
+        if self._size == 0 or not np.any(damages > 0):  # NaN > 0 is False
+            return None, 0
+        row = int(np.nanargmax(damages))
+        return row, float(damages[row])
+
+    def area_counts(self):
+        """Number of hurricanes that hit each area, indexed by area code"""
+        return np.bincount(self.area_codes, minlength=len(self.area_names))
+
+    def group_by(self, keys):
+        """{key: row indices} with keys in order of first appearance"""
+        if self._size == 0:
+            return {}
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")  # rows grouped, original order kept
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(unique)))[:-1]
+        groups = np.split(order, bounds)
+        return {unique[g].item(): groups[g] for g in np.argsort(first)}
@@ -0,0 +1,87 @@
+
+# Shared insurance cost estimator for the Medical Insurance scripts.
+#
+# Every script had its own copy of the linear formula
+#
+#   250*age - 128*sex + 370*bmi + 425*num_of_children + 24000*smoker - 12500
+#
+# (and Part 2 a different one). Here a formula is a CostModel: a weight per
+# patient field plus an intercept, so new coefficient sets are one line.
+#
+#   STANDARD.estimate_one(age=28, sex=0, bmi=26.2, num_of_children=3, smoker=0)  -> 5469.0
+#   STANDARD.estimate(patients)  -> float64 array, one cost per row
+#
+# estimate() takes a batch of patients as anything that gives a column by
+# name: a dict of lists/arrays, a NumPy structured array, a pandas DataFrame
+# or a pyarrow Table. It never prints; the scripts do their own printing.
+
+import numpy as np
+
+FIELDS = ("age", "sex", "bmi", "num_of_children", "smoker")
+
+
+class CostModel:
+    """Linear insurance cost formula: sum(weight * field) + intercept"""
+
+    def __init__(self, name, weights, intercept):
+        unknown = set(weights) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown patient fields: {sorted(unknown)}")
+        self.name = name
+        self.weights = dict(weights)  # fields left out have weight 0
+        self.intercept = intercept
+
+    def __repr__(self):
+        terms = " ".join(f"{'-' if w < 0 else '+'} {abs(w)}*{f}" for f, w in self.weights.items())
+        return f"CostModel({self.name!r}: {terms.lstrip('+ ')} {'-' if self.intercept < 0 else '+'} {abs(self.intercept)})"
+
+    def estimate_one(self, **patient):
+        """Cost of one patient given as keyword arguments (extra fields are ignored).
+
+        The terms are added in the order of the formula, so the result is
+        exactly what the hand-written formula gives (int if all inputs are ints).
+        """
+        cost = 0
+        for field, weight in self.weights.items():
+            cost = cost + weight * patient[field]
+        return cost + self.intercept
+
+    def estimate(self, patients, out=None):
+        """Costs of a whole batch of patients as a float64 array.
+
+        One NumPy operation per field over all the rows, no Python loop per
+        patient. Pass `out` to reuse an array instead of allocating one.
+        """
+        columns = [(np.asarray(patients[field], dtype=np.float64), weight)
+                   for field, weight in self.weights.items()]
+        size = len(columns[0][0]) if columns else 0
+        if out is None:
+            out = np.empty(size, dtype=np.float64)
+        out[:] = 0.0
+        term = np.empty(size, dtype=np.float64)
+        for values, weight in columns:
+            np.multiply(values, weight, out=term)
+            out += term
+        out += self.intercept
+        return out
+
+
+STANDARD = CostModel(
+    "standard",
+    {"age": 250, "sex": -128, "bmi": 370, "num_of_children": 425, "smoker": 24000},
+    -12500,
+)
+# formula of "Pr - Medical Insurance Project Part 2.py" (no BMI)
+PART_2 = CostModel(
+    "part 2",
+    {"age": 400, "sex": -128, "num_of_children": 425, "smoker": 10000},
+    -2500,
+)
+
+MODELS = {model.name: model for model in (STANDARD, PART_2)}
+
+
+def register_model(model):
+    """Makes a CostModel available by name in MODELS"""
+    MODELS[model.name] = model
+    return model
@@ -0,0 +1,231 @@
+
+# Reconciling estimated insurance costs with the actual costs, for
+# "loops - Medical insturance estimates vs cost.py" at any scale.
+#
+# The estimates and the actual costs come as two streams of chunks (pandas
+# DataFrames, e.g. pd.read_csv(..., chunksize=...), or dicts of arrays) with a
+# member_id column, a cost column and optionally a cohort column. They do not
+# have to be sorted or even read at the same time, so the join is a
+# partitioned hash join:
+#
+#   1. every chunk is split by member_id % partitions and appended to one
+#      binary file per (stream, partition) in a temporary directory
+#   2. each partition is then loaded (both streams), joined on member_id with
+#      np.unique + np.intersect1d, and folded into running totals
+#
+# Memory is bounded by one chunk plus one partition: for tens of millions of
+# members, pick partitions so that rows / partitions is a few million at most.
+# Several rows of the same member in a stream are added up (several claims);
+# the member keeps the cohort of its first estimate row.
+#
+# The error of a member is actual - estimate: bias is its mean (> 0 means
+# the estimates are too low), MAE the mean of its absolute value. A member is
+# an outlier when |error| > outlier_ratio * |estimate| (and >= min_outlier_error).
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from binning import group_rows
+
+NO_COHORT = -1
+_RECORD = np.dtype([("member_id", np.int64), ("cost", np.float64), ("cohort", np.int32)])
+_STREAMS = ("estimates", "actuals")
+_OUTLIER_COLUMNS = ["member_id", "cohort", "estimated", "actual", "error"]
+_TOTALS = ("members", "outliers", "estimated", "actual", "error", "abs_error", "squared_error")
+
+
+class Reconciler:
+    """Joins estimate and actual chunks by member ID and accumulates error metrics"""
+
+    def __init__(self, partitions=16, outlier_ratio=0.5, min_outlier_error=0.0, keep_outliers=1000,
+                 id_column="member_id", cost_column="cost", cohort_column="cohort", workdir=None):
+        self.partitions = partitions
+        self.outlier_ratio = outlier_ratio
+        self.min_outlier_error = min_outlier_error
+        self.keep_outliers = keep_outliers  # at most this many are kept in the result
+        self.columns = id_column, cost_column, cohort_column
+        self.cohorts = {}  # cohort label -> code, in order of first appearance
+        self.rows = dict.fromkeys(_STREAMS, 0)
+        self._workdir = tempfile.mkdtemp(prefix="reconcile-", dir=workdir)
+
+    # --- Spilling the streams ---
+    def _path(self, stream, partition):
+        return os.path.join(self._workdir, f"{stream}-{partition}.bin")
+
+    def _cohort_codes(self, chunk, size):
+        column = self.columns[2]
+        if column not in chunk:
+            return np.full(size, NO_COHORT, dtype=np.int32)
+        import pandas as pd
+
+        codes, labels = pd.factorize(np.asarray(chunk[column]))  # NaN/None -> -1
+        mapping = np.array([self.cohorts.setdefault(label, len(self.cohorts)) for label in labels] + [NO_COHORT],
+                           dtype=np.int32)
+        return mapping[codes]  # code -1 picks the trailing NO_COHORT
+
+    def _add(self, stream, chunk):
+        if self._workdir is None:
+            raise RuntimeError("run() was already called")
+        id_column, cost_column, _ = self.columns
+        members = np.asarray(chunk[id_column])
+        if members.dtype.kind not in "iu":
+            raise ValueError(f"{id_column} must hold integers, not {members.dtype}")
+        records = np.empty(len(members), dtype=_RECORD)
+        records["member_id"] = members
+        records["cost"] = chunk[cost_column]
+        records["cohort"] = self._cohort_codes(chunk, len(members))
+        for partition, rows in enumerate(group_rows(records["member_id"] % self.partitions, self.partitions)):
+            if len(rows):
+                with open(self._path(stream, partition), "ab") as file:
+                    records[rows].tofile(file)
+        self.rows[stream] += len(members)
+
+    def add_estimates(self, chunk):
+        self._add("estimates", chunk)
+
+    def add_actuals(self, chunk):
+        self._add("actuals", chunk)
+
+    def close(self):
+        """Deletes the spilled partitions (run() does it when it is done)"""
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+    # --- Joining ---
+    def _load(self, stream, partition):
+        """(member IDs, summed costs, cohorts) of one partition, one entry per member, sorted by ID"""
+        path = self._path(stream, partition)
+        records = np.fromfile(path, dtype=_RECORD) if os.path.exists(path) else np.empty(0, dtype=_RECORD)
+        members, first, inverse = np.unique(records["member_id"], return_index=True, return_inverse=True)
+        costs = np.bincount(inverse, weights=records["cost"], minlength=len(members))
+        return members, costs, records["cohort"][first]
+
+    def run(self, outliers_path=None):
+        """Joins every partition; returns a Reconciliation. Outliers are also written to outliers_path (CSV)"""
+        import pandas as pd
+
+        totals = dict.fromkeys(_TOTALS, 0.0)
+        cohort_totals = {name: np.zeros(0) for name in _TOTALS}
+        unmatched = dict.fromkeys(_STREAMS, 0)
+        outliers, kept, outlier_header = [], 0, True
+        labels = np.array(list(self.cohorts) + [None], dtype=object)  # code -1 -> None
+        try:
+            for partition in range(self.partitions):
+                est_members, estimated, est_cohorts = self._load("estimates", partition)
+                act_members, actual, act_cohorts = self._load("actuals", partition)
+                members, e, a = np.intersect1d(est_members, act_members, assume_unique=True, return_indices=True)
+                unmatched["estimates"] += len(est_members) - len(members)
+                unmatched["actuals"] += len(act_members) - len(members)
+                estimated, actual = estimated[e], actual[a]
+                cohorts = np.where(est_cohorts[e] != NO_COHORT, est_cohorts[e], act_cohorts[a])
+                error = actual - estimated
+                flagged = (np.abs(error) > self.outlier_ratio * np.abs(estimated)) & \
+                          (np.abs(error) >= self.min_outlier_error)
+
+                values = {"members": np.ones(len(members)), "outliers": flagged.astype(np.float64),
+                          "estimated": estimated, "actual": actual, "error": error,
+                          "abs_error": np.abs(error), "squared_error": error * error}
+                grouped = cohorts != NO_COHORT
+                for name, column in values.items():
+                    totals[name] += float(column.sum())
+                    sums = np.bincount(cohorts[grouped], weights=column[grouped], minlength=len(self.cohorts))
+                    sums[:len(cohort_totals[name])] += cohort_totals[name]
+                    cohort_totals[name] = sums
+
+                if flagged.any():
+                    found = pd.DataFrame({"member_id": members[flagged], "cohort": labels[cohorts[flagged]],
+                                          "estimated": estimated[flagged], "actual": actual[flagged],
+                                          "error": error[flagged]})
+                    if outliers_path is not None:
+                        found.to_csv(outliers_path, mode="w" if outlier_header else "a",
+                                     header=outlier_header, index=False)
+                        outlier_header = False
+                    if kept < self.keep_outliers:
+                        outliers.append(found.iloc[:self.keep_outliers - kept])
+                        kept += len(outliers[-1])
+        finally:
+            self.close()
+        if outliers_path is not None and outlier_header:  # no outliers: just the header
+            pd.DataFrame(columns=_OUTLIER_COLUMNS).to_csv(outliers_path, index=False)
+
+        cohorts = pd.DataFrame({name: cohort_totals[name] for name in _TOTALS},
+                               index=pd.Index(list(self.cohorts), name="cohort"))
+        if outliers:
+            outliers = pd.concat(outliers, ignore_index=True)
+        else:
+            outliers = pd.DataFrame(columns=_OUTLIER_COLUMNS)
+        return Reconciliation(totals, cohorts, outliers, unmatched, dict(self.rows))
+
+
+def reconcile(estimates, actuals, outliers_path=None, **options):
+    """Reconciles two iterables of chunks (see Reconciler for the options)"""
+    reconciler = Reconciler(**options)
+    try:
+        for chunk in estimates:
+            reconciler.add_estimates(chunk)
+        for chunk in actuals:
+            reconciler.add_actuals(chunk)
+        return reconciler.run(outliers_path)
+    finally:
+        reconciler.close()
+
+
+def _metrics(totals):
+    """Error metrics from summed totals (a dict of numbers or a DataFrame of columns)"""
+    members = totals["members"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "members": members,
+            "estimated_total": totals["estimated"],
+            "actual_total": totals["actual"],
+            "mae": totals["abs_error"] / members,
+            "bias": totals["error"] / members,
+            "rmse": np.sqrt(totals["squared_error"] / members),
+            "relative_bias": totals["error"] / totals["estimated"],
+            "outliers": totals["outliers"],
+        }
+
+
+def _metrics_table(cohort_totals):
+    import pandas as pd
+
+    return pd.DataFrame(_metrics(cohort_totals)).astype({"members": np.int64, "outliers": np.int64})
+
+
+class Reconciliation:
+    """Result of a reconciliation: overall and per-cohort metrics, outliers, unmatched members"""
+
+    def __init__(self, totals, cohort_totals, outliers, unmatched, rows):
+        self.overall = {name: float(value) for name, value in _metrics(totals).items()}
+        for name in ("members", "outliers"):
+            self.overall[name] = int(self.overall[name])
+        self.cohorts = _metrics_table(cohort_totals)
+        self.outliers = outliers  # the first keep_outliers, by partition (not in input order)
+        self.unmatched = unmatched  # members found in only one of the streams
+        self.rows = rows
+
+    def report(self):
+        """Plain-text report"""
+        overall = self.overall
+        lines = [
+            f"Rows read: {self.rows['estimates']:,} estimates, {self.rows['actuals']:,} actual costs",
+            f"Members reconciled: {overall['members']:,} "
+            f"(estimate only: {self.unmatched['estimates']:,}, actual only: {self.unmatched['actuals']:,})",
+            f"Estimated total: {overall['estimated_total']:,.2f}   Actual total: {overall['actual_total']:,.2f}",
+            f"MAE: {overall['mae']:,.2f}   Bias: {overall['bias']:+,.2f}   RMSE: {overall['rmse']:,.2f}   "
+            f"Relative bias: {overall['relative_bias']:+.2%}",
+            f"Outliers: {overall['outliers']:,}",
+        ]
+        if len(self.cohorts):
+            lines += ["", "By cohort:", self.cohorts.to_string(float_format=lambda value: f"{value:,.2f}")]
+        if len(self.outliers):
+            lines += ["", f"First {len(self.outliers)} outliers:", self.outliers.to_string(index=False)]
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.report() + "\n")
@@ -0,0 +1,118 @@
+
+# Medical records with indexes, for the list / dict practice projects.
+#
+# "Pr - Medical Insurance cost project.py" sorts the whole list of
+# (cost, name) tuples to get the three cheapest, and counts names with
+# list.count(); the dict project loops over .values() for the average.
+# RecordStore keeps, next to the records themselves:
+#
+#   a sorted cost index   -> list of (cost, name, row) kept sorted with bisect,
+#                            so cheapest/priciest k, percentiles and cost
+#                            ranges are slices of it
+#   a name index          -> name -> rows with that name
+#   running sum and count -> the average without a loop
+#
+# Lookups are O(log n) (+ k for the records returned); adding or popping a
+# record is a bisect plus one list insert/delete (a memmove, fast even for
+# millions of records).
+
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+
+_cost = itemgetter(0)
+
+
+class RecordStore:
+    """Medical records indexed by insurance cost and by name"""
+
+    def __init__(self, records=()):
+        self._records = {}  # row -> (name, cost, fields)
+        self._by_cost = []  # (cost, name, row), sorted
+        self._by_name = {}  # name -> {row: None}, rows in insertion order
+        self._next_row = 0
+        self.total_cost = 0.0
+        for name, cost in records:
+            self.add(name, cost)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        """(cost, name) of every record, in insertion order"""
+        return ((cost, name) for name, cost, _ in self._records.values())
+
+    # --- Updating ---
+    def add(self, name, cost, **fields):
+        """Adds a record (extra fields like Age or BMI are kept with it); returns its row"""
+        row = self._next_row
+        self._next_row += 1
+        self._records[row] = (name, cost, fields)
+        insort(self._by_cost, (cost, name, row))
+        self._by_name.setdefault(name, {})[row] = None
+        self.total_cost += cost
+        return row
+
+    def pop(self, row):
+        """Removes a record; returns (name, cost, fields)"""
+        name, cost, fields = self._records.pop(row)
+        del self._by_cost[bisect_left(self._by_cost, (cost, name, row))]
+        rows = self._by_name[name]
+        del rows[row]
+        if not rows:
+            del self._by_name[name]
+        self.total_cost -= cost
+        return name, cost, fields
+
+    def pop_name(self, name):
+        """Removes the first record added with this name, like dict.pop(name)"""
+        rows = self._by_name.get(name)
+        if not rows:
+            raise KeyError(name)
+        return self.pop(next(iter(rows)))
+
+    # --- Queries ---
+    @property
+    def average_cost(self):
+        return self.total_cost / len(self._records) if self._records else 0.0
+
+    def record(self, row):
+        name, cost, fields = self._records[row]
+        return {"Name": name, "Insurance_cost": cost, **fields}
+
+    def cheapest(self, k):
+        """The k cheapest records as (cost, name), cheapest first"""
+        return [(cost, name) for cost, name, _ in self._by_cost[:k]]
+
+    def priciest(self, k):
+        """The k most expensive records as (cost, name), in increasing cost like a sorted slice"""
+        return [(cost, name) for cost, name, _ in self._by_cost[len(self._by_cost) - k:]] if k > 0 else []
+
+    def sorted(self):
+        """Every record as (cost, name), sorted like sorted(zip(costs, names))"""
+        return [(cost, name) for cost, name, _ in self._by_cost]
+
+    def percentile(self, percent):
+        """Cost at the given percentile (0-100), interpolating like numpy.percentile"""
+        if not self._by_cost:
+            raise ValueError("no records")
+        position = (len(self._by_cost) - 1) * percent / 100
+        low = int(position)
+        high = min(low + 1, len(self._by_cost) - 1)
+        fraction = position - low
+        return self._by_cost[low][0] * (1 - fraction) + self._by_cost[high][0] * fraction
+
+    def between(self, low, high):
+        """Records with low <= cost <= high as (cost, name), cheapest first"""
+        start = bisect_left(self._by_cost, low, key=_cost)
+        stop = bisect_right(self._by_cost, high, key=_cost)
+        return [(cost, name) for cost, name, _ in self._by_cost[start:stop]]
+
+    def name_count(self, name):
+        """Number of records with this name"""
+        return len(self._by_name.get(name, ()))
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def rows_named(self, name):
+        return list(self._by_name.get(name, ()))
@@ -0,0 +1,107 @@
+
+# What-if analysis for the insurance cost formulas of insurance_estimator.py.
+#
+# A Perturbation changes some patient fields: `shift` adds to them ("age +4",
+# "bmi +3.1") and `replace` overwrites them ("sex = 1"). Because a CostModel is
+# linear, the change in cost is just
+#
+#   delta = sum over fields of weight * (new value - old value)
+#
+# so a shift gives the same delta for everybody (weight * amount, the
+# marginal effect) and only a replacement depends on each patient. sensitivity()
+# computes the deltas of a whole grid of perturbations for a whole population
+# with one broadcast (perturbations x patients x fields) and returns a tidy
+# table: one row per (perturbation, patient). iter_sensitivity() yields the
+# same table in chunks of patients when grid x population is too big.
+
+import numpy as np
+
+from insurance_estimator import FIELDS
+
+
+class Perturbation:
+    """What-if scenario: {field: amount} in `shift`, {field: new value} in `replace`"""
+
+    def __init__(self, name, shift=None, replace=None):
+        shift, replace = dict(shift or {}), dict(replace or {})
+        unknown = (shift.keys() | replace.keys()) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown patient fields: {sorted(unknown)}")
+        if shift.keys() & replace.keys():
+            raise ValueError("a field can be shifted or replaced, not both")
+        self.name, self.shift, self.replace = name, shift, replace
+
+    def __repr__(self):
+        return f"Perturbation({self.name!r}, shift={self.shift}, replace={self.replace})"
+
+
+def marginal_effects(model):
+    """{field: change in cost per unit of the field}; for a linear model, its weights"""
+    return {field: model.weights.get(field, 0) for field in FIELDS}
+
+
+def _grid_arrays(perturbations):
+    """(amounts, replaced, values) arrays of shape (perturbations, fields)"""
+    amounts = np.zeros((len(perturbations), len(FIELDS)))
+    replaced = np.zeros((len(perturbations), len(FIELDS)), dtype=bool)
+    values = np.zeros((len(perturbations), len(FIELDS)))
+    for p, perturbation in enumerate(perturbations):
+        for f, field in enumerate(FIELDS):
+            if field in perturbation.shift:
+                amounts[p, f] = perturbation.shift[field]
+            elif field in perturbation.replace:
+                replaced[p, f], values[p, f] = True, perturbation.replace[field]
+    return amounts, replaced, values
+
+
+def _deltas(model, population, start, stop, grid):
+    """Cost changes of every perturbation for patients start..stop-1, shape (perturbations, patients)"""
+    amounts, replaced, values = grid
+    weights = np.array([model.weights.get(field, 0) for field in FIELDS], dtype=np.float64)
+    if not replaced.any():
+        # only shifts: closed form, the population is not even read
+        return np.broadcast_to((amounts @ weights)[:, None], (len(amounts), stop - start))
+    patients = np.stack([np.asarray(population[field][start:stop], dtype=np.float64)
+                         if field in model.weights else np.zeros(stop - start)
+                         for field in FIELDS], axis=1)  # (patients, fields)
+    changes = np.where(replaced[:, None, :], values[:, None, :] - patients[None, :, :], amounts[:, None, :])
+    return changes @ weights
+
+
+def iter_sensitivity(model, population, perturbations, max_cells=5_000_000):
+    """Yields the tidy table of sensitivity() in chunks of patients.
+
+    Each chunk holds at most about `max_cells` (perturbation, patient) pairs,
+    so memory stays flat however large the population and the grid are.
+    """
+    import pandas as pd
+
+    size = len(population[FIELDS[0]])
+    grid = _grid_arrays(perturbations)
+    names = [p.name for p in perturbations]
+    chunk = max(1, max_cells // max(1, len(perturbations)))
+    for start in range(0, size, chunk):
+        stop = min(start + chunk, size)
+        base = model.estimate({field: population[field][start:stop] for field in model.weights})
+        deltas = _deltas(model, population, start, stop, grid)
+        yield pd.DataFrame({
+            # categorical: grid order is kept when sorting, and it is small in memory
+            "perturbation": pd.Categorical.from_codes(
+                np.repeat(np.arange(len(names)), stop - start), categories=names),
+            "patient": np.tile(np.arange(start, stop), len(perturbations)),
+            "base_cost": np.tile(base, len(perturbations)),
+            "new_cost": (base[None, :] + deltas).ravel(),
+            "delta": deltas.ravel(),
+        })
+
+
+def sensitivity(model, population, perturbations, max_cells=5_000_000):
+    """Tidy table (perturbation, patient, base_cost, new_cost, delta) for the whole grid"""
+    import pandas as pd
+
+    chunks = list(iter_sensitivity(model, population, perturbations, max_cells))
+    if not chunks:
+        return pd.DataFrame(columns=["perturbation", "patient", "base_cost", "new_cost", "delta"])
+    table = pd.concat(chunks, ignore_index=True)
+    # perturbation by perturbation, in grid order, like a single chunk
+    return table.sort_values(["perturbation", "patient"], kind="stable").reset_index(drop=True)
@@ -1,3 +1,5 @@
+from insurance_reconciliation import reconcile
+
 names = ["Judith", "Abel", "Tyson", "Martha", "Beverley", "David", "Anabel"]
 estimated_insurance_costs = [1000.0, 2000.0, 3000.0, 4000.0, 5000.0, 6000.0, 7000.0]
 actual_insurance_costs = [1100.0, 2200.0, 3300.0, 4400.0, 5500.0, 6600.0, 7700.0]
@@ -10,7 +12,8 @@ total_cost = 0
 # total_cost.
 for item in actual_insurance_costs:
     total_cost += item
-    average_cost = total_cost / len(actual_insurance_costs)
+# el promedio se calcula una sola vez, despues del loop
+average_cost = total_cost / len(actual_insurance_costs)
 # print(average_cost)
 print(f"Average Insurance Cost: {average_cost} dollars.")
 
@@ -34,3 +37,14 @@ updated_estimated_costs = [
     estimated_cost * 11 / 10 for estimated_cost in estimated_insurance_costs
 ]
 print(updated_estimated_costs)
+
+# reconciliacion de estimados vs costos reales (ver insurance_reconciliation.py):
+# junta los dos por member_id en chunks, asi funciona igual con millones de filas
+member_ids = list(range(len(names)))
+cohorts = ["above average" if cost > average_cost else "not above average" for cost in actual_insurance_costs]
+reconciliation = reconcile(
+    [{"member_id": member_ids, "cost": estimated_insurance_costs, "cohort": cohorts}],
+    [{"member_id": member_ids, "cost": actual_insurance_costs}],
+    partitions=1,
+)
+print(reconciliation.report())
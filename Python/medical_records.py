@@ -0,0 +1,156 @@
+
+# Streaming parser for the medical record format of
+# "strings practice - Medical Insurance.py":
+#
+#   Marina Allison   ,27   ,   31.1 ,
+#   #7010.0   ;Markus Valdez   ,   30, ...
+#
+# Records end with ";", fields are separated by "," and the insurance cost
+# starts with "#"; spaces and line breaks can be anywhere. The parser reads
+# the input in fixed-size buffers (a file, a socket via sock.makefile("rb"),
+# or anything with read(n)), so the whole export is never in memory, and
+# keeps running totals as it goes.
+#
+# Each buffer is parsed as a whole: ";" is turned into "," so one split()
+# gives every field, and every 4th field is a name, an age... converted with
+# NumPy. Only a buffer that fails a check (wrong number of fields, a cost
+# without "#", a number that does not parse) is parsed again record by record,
+# to report exactly which records are malformed.
+
+import codecs
+from collections import namedtuple
+
+import numpy as np
+
+MedicalRecord = namedtuple("MedicalRecord", ["name", "age", "bmi", "insurance_cost"])
+MalformedRecord = namedtuple("MalformedRecord", ["number", "text", "reason"])
+RecordBatch = namedtuple("RecordBatch", ["names", "ages", "bmis", "insurance_costs"])
+
+
+class MedicalRecordParser:
+    """Parses records one buffer at a time and keeps count, mean BMI and mean cost"""
+
+    def __init__(self, buffer_size=1 << 20, encoding="utf-8", keep_malformed=1000):
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.keep_malformed = keep_malformed  # at most this many are kept in self.malformed
+        self.count = 0
+        self.malformed_count = 0
+        self.malformed = []
+        self.bmi_total = 0.0
+        self.cost_total = 0.0
+        self._number = 0  # records seen so far, malformed ones included
+
+    @property
+    def mean_bmi(self):
+        return self.bmi_total / self.count if self.count else 0.0
+
+    @property
+    def mean_cost(self):
+        return self.cost_total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {"records": self.count, "malformed": self.malformed_count,
+                "mean_bmi": self.mean_bmi, "mean_cost": self.mean_cost}
+
+    # --- Reading ---
+    def _blocks(self, stream):
+        """Text made of whole records, one block per buffer read"""
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        rest = ""
+        while True:
+            chunk = stream.read(self.buffer_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)  # keeps a character cut by the buffer for the next one
+            text = rest + chunk
+            end = text.rfind(";")
+            if end < 0:
+                rest = text  # no record ends in this buffer yet
+                continue
+            rest = text[end + 1:]  # start of a record that continues in the next buffer
+            yield text[:end]
+        rest += decoder.decode(b"", final=True)
+        if rest.strip():  # the last record does not need a ";"
+            yield rest
+
+    def parse_batches(self, stream):
+        """Yields a RecordBatch (a list of names, float64 arrays of the rest) per buffer"""
+        for block in self._blocks(stream):
+            batch = self._parse_block(block)
+            if batch is None:
+                batch = self._parse_records(block)
+            self.count += len(batch.names)
+            self.bmi_total += float(batch.bmis.sum())
+            self.cost_total += float(batch.insurance_costs.sum())
+            if batch.names:
+                yield batch
+
+    def consume(self, stream):
+        """Parses the whole stream only for the running totals; returns summary()"""
+        for _ in self.parse_batches(stream):  # one step per buffer, the batches are dropped
+            pass
+        return self.summary()
+
+    def parse(self, stream):
+        """Yields a MedicalRecord for every well-formed record of `stream`"""
+        for batch in self.parse_batches(stream):
+            yield from map(MedicalRecord, batch.names, batch.ages.tolist(),
+                           batch.bmis.tolist(), batch.insurance_costs.tolist())
+
+    # --- Parsing ---
+    def _parse_block(self, block):
+        """Whole block at once; None if anything looks wrong"""
+        count = block.count(";") + 1
+        fields = block.replace(";", ",").split(",")
+        if len(fields) != 4 * count:
+            return None
+        names = list(map(str.strip, fields[0::4]))
+        if "" in names:
+            return None
+        # every cost must start with "#" and have no other "#"
+        costs = "\0".join(map(str.strip, fields[3::4]))
+        if not costs.startswith("#") or costs.count("#") != count or costs.count("\0#") != count - 1:
+            return None
+        try:
+            batch = RecordBatch(names,
+                                np.array(fields[1::4], dtype=np.float64),
+                                np.array(fields[2::4], dtype=np.float64),
+                                np.array(costs.replace("#", "").split("\0"), dtype=np.float64))
+        except ValueError:
+            return None
+        self._number += count
+        return batch
+
+    def _parse_records(self, block):
+        """Record by record, reporting the malformed ones"""
+        names, ages, bmis, costs = [], [], [], []
+        for text in block.split(";"):
+            self._number += 1
+            fields = text.split(",")
+            if len(fields) != 4:
+                self._malformed(text, f"{len(fields)} fields instead of 4")
+                continue
+            name, age, bmi, cost = (field.strip() for field in fields)
+            if not name:
+                self._malformed(text, "missing name")
+                continue
+            if not cost.startswith("#"):
+                self._malformed(text, "the cost does not start with #")
+                continue
+            try:
+                values = float(age), float(bmi), float(cost[1:])
+            except ValueError as error:
+                self._malformed(text, str(error))
+                continue
+            names.append(name)
+            ages.append(values[0])
+            bmis.append(values[1])
+            costs.append(values[2])
+        return RecordBatch(names, np.array(ages), np.array(bmis), np.array(costs))
+
+    def _malformed(self, text, reason):
+        self.malformed_count += 1
+        if len(self.malformed) < self.keep_malformed:
+            self.malformed.append(MalformedRecord(self._number, text.strip(), reason))
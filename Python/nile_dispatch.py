@@ -0,0 +1,165 @@
+
+# Spatial index of drivers for dispatching The NIle trips.
+#
+# calculate_driver_cost() of "The NIle.py" compares every driver over the
+# same distance, wherever they are. DriverIndex knows where each driver is and
+# answers "the k cheapest drivers within this radius of the pickup", pricing
+# each one with the rule of calculate_driver_cost():
+#
+#   cost = salary * (distance to the pickup + trip distance) / speed
+#
+# The index is a uniform grid: the plane is cut into square cells of
+# cell_size and each cell keeps the set of drivers in it. Salary, speed and
+# position of each driver live in NumPy arrays (one slot per driver, slots of
+# removed drivers are reused), so
+#
+#   insert / move / remove -> O(1): a set update (and one more when a driver
+#                             changes cells)
+#   cheapest(pickup, ...)  -> the cells that overlap the radius, then the
+#                             distances and costs of their drivers as arrays
+#
+# A good cell_size is about the usual query radius. Positions are (lat, long)
+# like in nile_shipping; with metric="haversine" the radius is in km and the
+# cells are in degrees (searches do not wrap around at +-180 degrees longitude).
+
+from itertools import chain
+
+import numpy as np
+
+from nile_shipping import EARTH_RADIUS_KM, distances
+
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+class DriverIndex:
+    """Drivers with positions, in a grid, for nearest / cheapest driver queries"""
+
+    def __init__(self, cell_size, metric="euclidean", capacity=1024):
+        if metric not in ("euclidean", "haversine"):
+            raise ValueError(f"unknown metric {metric!r}: use 'euclidean' or 'haversine'")
+        self.cell_size = cell_size
+        self.metric = metric
+        self._cells = {}  # (row, column) -> {slot, ...}
+        self._slots = {}  # driver id -> slot
+        self._ids = [None] * capacity  # slot -> driver id
+        self._cell_of = [None] * capacity  # slot -> cell
+        self._free = list(range(capacity - 1, -1, -1))
+        self._positions = np.zeros((capacity, 2))
+        self._salaries = np.zeros(capacity)
+        self._speeds = np.ones(capacity)
+        self._inserted = np.zeros(capacity, dtype=np.int64)  # insertion number, to break ties
+        self._insertions = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, driver):
+        return driver in self._slots
+
+    def _cell(self, lat, long):
+        return int(lat // self.cell_size), int(long // self.cell_size)
+
+    # --- Updating ---
+    def _grow(self):
+        capacity = len(self._ids)
+        self._ids.extend([None] * capacity)
+        self._cell_of.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+        self._positions = np.concatenate([self._positions, np.zeros((capacity, 2))])
+        self._salaries = np.concatenate([self._salaries, np.zeros(capacity)])
+        self._speeds = np.concatenate([self._speeds, np.ones(capacity)])
+        self._inserted = np.concatenate([self._inserted, np.zeros(capacity, dtype=np.int64)])
+
+    def insert(self, driver, position, salary, speed):
+        """Adds a driver (any hashable id) at position (lat, long)"""
+        if driver in self._slots:
+            raise KeyError(f"driver {driver!r} is already in the index")
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._slots[driver] = slot
+        self._ids[slot] = driver
+        self._salaries[slot] = salary
+        self._speeds[slot] = speed
+        self._inserted[slot] = self._insertions
+        self._insertions += 1
+        self._place(slot, position)
+
+    def _place(self, slot, position):
+        lat, long = position
+        self._positions[slot] = lat, long
+        cell = self._cell(lat, long)
+        if cell != self._cell_of[slot]:
+            if self._cell_of[slot] is not None:
+                self._leave(slot)
+            self._cells.setdefault(cell, set()).add(slot)
+            self._cell_of[slot] = cell
+
+    def _leave(self, slot):
+        cell = self._cell_of[slot]
+        members = self._cells[cell]
+        members.discard(slot)
+        if not members:
+            del self._cells[cell]
+        self._cell_of[slot] = None
+
+    def move(self, driver, position):
+        self._place(self._slots[driver], position)
+
+    def remove(self, driver):
+        slot = self._slots.pop(driver)
+        self._leave(slot)
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def position(self, driver):
+        return tuple(self._positions[self._slots[driver]].tolist())
+
+    # --- Queries ---
+    def _candidates(self, lat, long, radius):
+        """Slots of the drivers in the cells that overlap the circle"""
+        lat_radius = long_radius = radius
+        if self.metric == "haversine":
+            lat_radius = radius / KM_PER_DEGREE
+            cos_lat = np.cos(np.radians(min(abs(lat) + lat_radius, 90.0)))
+            long_radius = 360.0 if cos_lat < 1e-9 else min(lat_radius / cos_lat, 360.0)
+        first_row, first_column = self._cell(lat - lat_radius, long - long_radius)
+        last_row, last_column = self._cell(lat + lat_radius, long + long_radius)
+        if (last_row - first_row + 1) * (last_column - first_column + 1) > len(self._cells):
+            cells = [members for (row, column), members in self._cells.items()  # fewer occupied cells than in the box
+                     if first_row <= row <= last_row and first_column <= column <= last_column]
+        else:
+            cells = [self._cells[cell] for cell in
+                     ((row, column) for row in range(first_row, last_row + 1)
+                      for column in range(first_column, last_column + 1)) if cell in self._cells]
+        return np.fromiter(chain.from_iterable(cells), dtype=np.int64)
+
+    def nearby(self, position, radius):
+        """[(driver, distance)] within radius of position, nearest first"""
+        slots, found = self._within(position, radius)
+        order = np.lexsort((self._inserted[slots], found))
+        return [(self._ids[slot], distance) for slot, distance in zip(slots[order].tolist(), found[order].tolist())]
+
+    def _within(self, position, radius):
+        lat, long = position
+        slots = self._candidates(lat, long, radius)
+        found = distances(self._positions[slots], np.array([lat, long], dtype=np.float64), self.metric)
+        inside = found <= radius
+        return slots[inside], found[inside]
+
+    def cheapest(self, pickup, radius, k=1, trip_distance=0.0):
+        """The k cheapest drivers within radius of the pickup, as [(driver, cost, distance)], cheapest first.
+
+        cost = salary * (distance to the pickup + trip_distance) / speed; ties
+        go to the driver inserted first.
+        """
+        if k <= 0:
+            return []
+        slots, found = self._within(pickup, radius)
+        costs = self._salaries[slots] * ((found + trip_distance) / self._speeds[slots])
+        if len(slots) > k:
+            best = costs <= np.partition(costs, k - 1)[k - 1]  # the k cheapest and any tied with the last
+            slots, found, costs = slots[best], found[best], costs[best]
+        order = np.lexsort((self._inserted[slots], costs))[:k]
+        return [(self._ids[slot], cost, distance) for slot, cost, distance in
+                zip(slots[order].tolist(), costs[order].tolist(), found[order].tolist())]
@@ -0,0 +1,230 @@
+
+# Streaming revenue ledger for The NIle, replacing calculate_money_made(**trips).
+#
+# calculate_money_made() needs every trip at once as keyword arguments and
+# adds up float dollars. RevenueLedger takes the trips one by one (from any
+# iterable, or a JSON-lines file) and keeps, in integer cents:
+#
+#   overall        -> revenue (trip cost - driver cost) and trip count
+#   per driver     -> revenue of each driver
+#   per day        -> revenue of each UTC day
+#   per hour       -> the last keep_hours hours only (older hours are
+#                     dropped as the feed moves on; a trip older than that
+#                     still counts for its day and driver, as a late trip)
+#
+# so memory depends on the number of drivers and days, never on the number of
+# trips. A trip is a dict like the ones of calculate_money_made():
+#
+#   {"cost": 32.5, "driver": {"name": "Ana", "cost": 12.25}, "time": "2024-05-02T14:31:00"}
+#
+# where "time" (ISO 8601 or epoch seconds; naive times are UTC) is optional
+# and amounts can be numbers or strings. A trip with a missing field, or a
+# NaN, infinite or unreadable amount or time, raises ValueError naming the
+# trip and is not counted. checkpoint() writes the whole state as JSON
+# (atomically), with how far each file was read, so consume_file() on a
+# restored ledger goes on where the last checkpoint stopped.
+
+import json
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_EVEN, Decimal
+
+CHECKPOINT_VERSION = 1
+
+
+def to_cents(amount):
+    """12.345 -> 1234, "12.35" -> 1235, 7 -> 700 (half-even rounding, like the decimal module)
+
+    ValueError if the amount is not a finite number (NaN, inf, "abc").
+    """
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, float):
+        if not math.isfinite(amount):
+            raise ValueError(f"not a finite amount: {amount!r}")
+        cents = round(amount * 100)
+        if abs(amount * 100 - cents) < 1e-6:  # whole cents: no rounding to decide
+            return cents
+    try:
+        # repr() of a float is the shortest string that reads back the same: 0.1 -> "0.1"
+        value = Decimal(repr(amount) if isinstance(amount, float) else str(amount).strip().lstrip("$"))
+    except ArithmeticError:
+        raise ValueError(f"not an amount: {amount!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"not a finite amount: {amount!r}")
+    return int((value * 100).quantize(1, rounding=ROUND_HALF_EVEN))
+
+
+def format_cents(cents):
+    sign = "-" if cents < 0 else ""
+    return f"{sign}${abs(cents) // 100:,}.{abs(cents) % 100:02d}"
+
+
+def _hour_of(time):
+    """Hours since the epoch (UTC) of a trip time"""
+    if isinstance(time, (int, float)):
+        return int(time // 3600)
+    if isinstance(time, str):
+        time = datetime.fromisoformat(time)
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return int(time.timestamp() // 3600)
+
+
+def _hour_start(hour):
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(hours=hour)
+
+
+class RevenueLedger:
+    """Revenue totals in cents per driver, per day, per recent hour and overall"""
+
+    def __init__(self, keep_hours=48):
+        self.keep_hours = keep_hours
+        self.trips = 0
+        self.total_cents = 0
+        self.late_trips = 0  # older than the hours kept: in the totals, not in hourly()
+        self.untimed_trips = 0  # no "time": in the totals and per driver only
+        self.by_driver = {}  # driver -> cents
+        self.by_day = {}  # "YYYY-MM-DD" -> cents
+        self._hours = {}  # hours since the epoch -> cents, the last keep_hours hours
+        self._latest_hour = None
+        self._day_hour, self._day = None, None  # day of the last hour seen
+        self.file_offsets = {}  # path -> bytes of it already consumed
+
+    # --- Consuming ---
+    def add(self, trip):
+        """Adds one trip; returns its revenue in cents.
+
+        ValueError, naming the trip, if it lacks a field or has a bad amount
+        or time; the ledger is left untouched then.
+        """
+        try:
+            driver = trip["driver"]
+            cents = to_cents(trip["cost"]) - to_cents(driver["cost"])
+            name = driver.get("id", driver.get("name"))
+            time = trip.get("time")
+            hour = None if time is None else _hour_of(time)
+        except (KeyError, TypeError, AttributeError, ValueError, OverflowError) as error:
+            reason = f"missing {error}" if isinstance(error, KeyError) else error
+            raise ValueError(f"trip {trip!r}: {reason}") from None
+        self.trips += 1
+        self.total_cents += cents
+        self.by_driver[name] = self.by_driver.get(name, 0) + cents
+        if hour is None:
+            self.untimed_trips += 1
+            return cents
+        if hour != self._day_hour:  # most trips fall in the same hour as the previous one
+            self._day_hour, self._day = hour, _hour_start(hour).date().isoformat()
+        day = self._day
+        self.by_day[day] = self.by_day.get(day, 0) + cents
+        if self._latest_hour is None or hour > self._latest_hour:
+            self._latest_hour = hour
+            oldest = hour - self.keep_hours + 1
+            for old in [old for old in self._hours if old < oldest]:
+                del self._hours[old]
+        if hour > self._latest_hour - self.keep_hours:
+            self._hours[hour] = self._hours.get(hour, 0) + cents
+        else:
+            self.late_trips += 1
+        return cents
+
+    def consume(self, trips):
+        """Adds every trip of an iterable (a generator, a socket reader...); returns the number added"""
+        count = 0
+        for trip in trips:
+            self.add(trip)
+            count += 1
+        return count
+
+    def consume_file(self, path, checkpoint_path=None, checkpoint_every=100_000):
+        """Adds the trips of a JSON-lines file, starting where this ledger stopped reading it.
+
+        With checkpoint_path, the state is saved every checkpoint_every trips
+        and at the end. If a trip raises, file_offsets points at its line, so
+        the trips before it are not added twice by the next call.
+        """
+        count = 0
+        offset = self.file_offsets.get(path, 0)
+        try:
+            with open(path, "rb") as file:
+                file.seek(offset)
+                for line in file:
+                    if line.strip():
+                        self.add(json.loads(line))
+                        count += 1
+                    offset += len(line)
+                    if checkpoint_path is not None and count and count % checkpoint_every == 0:
+                        self.file_offsets[path] = offset
+                        self.checkpoint(checkpoint_path)
+        finally:
+            self.file_offsets[path] = offset  # the start of the line that raised, if any
+        if checkpoint_path is not None:
+            self.checkpoint(checkpoint_path)
+        return count
+
+    # --- Queries ---
+    @property
+    def total(self):
+        """Overall revenue in dollars, as an exact Decimal"""
+        return Decimal(self.total_cents) / 100
+
+    def hourly(self):
+        """[(hour start as a UTC datetime, cents)] of the hours kept, oldest first"""
+        return [(_hour_start(hour), self._hours[hour]) for hour in sorted(self._hours)]
+
+    def window(self, hours):
+        """Cents of the last `hours` hours (up to the latest trip), at most keep_hours"""
+        if self._latest_hour is None:
+            return 0
+        oldest = self._latest_hour - min(hours, self.keep_hours) + 1
+        return sum(cents for hour, cents in self._hours.items() if hour >= oldest)
+
+    def top_drivers(self, n=10):
+        """[(driver, cents)] of the n drivers with the most revenue"""
+        return sorted(self.by_driver.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    # --- Checkpoints ---
+    def state(self):
+        """The whole state as JSON-compatible data (driver ids keep their type)"""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "keep_hours": self.keep_hours,
+            "trips": self.trips,
+            "total_cents": self.total_cents,
+            "late_trips": self.late_trips,
+            "untimed_trips": self.untimed_trips,
+            "by_driver": list(self.by_driver.items()),
+            "by_day": self.by_day,
+            "hours": list(self._hours.items()),
+            "latest_hour": self._latest_hour,
+            "file_offsets": self.file_offsets,
+        }
+
+    def checkpoint(self, path):
+        """Writes state() to path; a crash while writing leaves the previous checkpoint intact"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.state(), file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def restore(cls, path):
+        """Ledger saved by checkpoint()"""
+        with open(path, encoding="utf-8") as file:
+            state = json.load(file)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version {state.get('version')!r}")
+        ledger = cls(state["keep_hours"])
+        ledger.trips = state["trips"]
+        ledger.total_cents = state["total_cents"]
+        ledger.late_trips = state["late_trips"]
+        ledger.untimed_trips = state["untimed_trips"]
+        ledger.by_driver = {driver: cents for driver, cents in state["by_driver"]}
+        ledger.by_day = state["by_day"]
+        ledger._hours = {hour: cents for hour, cents in state["hours"]}
+        ledger._latest_hour = state["latest_hour"]
+        ledger.file_offsets = state["file_offsets"]
+        return ledger
@@ -0,0 +1,136 @@
+
+# Batch shipping quotes for "The NIle.py".
+#
+# calculate_shipping_cost() prices one trip and returns a string, and
+# calculate_driver_cost() loops over every driver for every trip. Here a
+# batch of trips is a set of arrays:
+#
+#   origins, destinations   -> (trips, 2) arrays of (lat, long)
+#   shipping types          -> one name for all trips or one per trip
+#   drivers                 -> salary and speed arrays (+ optional positions)
+#
+# distances() computes every trip distance at once, either like get_distance()
+# (straight line on the coordinates) or as a great-circle distance
+# (metric="haversine", in km). Prices stay float64 arrays until format_prices().
+#
+# assign_drivers() prices every (trip, driver) pair with the rule of
+# calculate_driver_cost(), salary * (distance / speed), and takes the argmin
+# of each row. When the drivers have positions, the distance a driver covers
+# is the pickup leg (driver -> origin) plus the trip (for haversine, computed
+# from unit vectors with a matrix product). The trips x drivers
+# matrix is built a block of trips at a time (max_cells entries), so 100k
+# trips x 1k drivers never needs the whole 800 MB matrix.
+
+from collections import namedtuple
+
+import numpy as np
+
+SHIPPING_PRICES = {"standard": 1.0, "express": 1.5, "overnight": 2.0}
+EARTH_RADIUS_KM = 6371.0088
+
+Quote = namedtuple("Quote", ["distance", "shipping_cost", "driver", "driver_cost"])
+
+
+def _coordinates(points):
+    points = np.asarray(points, dtype=np.float64)
+    return points.reshape(-1, 2) if points.ndim == 1 else points
+
+
+def distances(origins, destinations, metric="euclidean"):
+    """Distance of every trip: "euclidean" like get_distance(), or "haversine" in km.
+
+    The coordinates broadcast: points[:, None] against others[None, :] gives all pairs.
+    """
+    origins, destinations = _coordinates(origins), _coordinates(destinations)
+    if metric == "euclidean":
+        return np.sqrt((destinations[..., 0] - origins[..., 0])**2 + (destinations[..., 1] - origins[..., 1])**2)
+    if metric == "haversine":
+        lat1, long1 = np.radians(origins[..., 0]), np.radians(origins[..., 1])
+        lat2, long2 = np.radians(destinations[..., 0]), np.radians(destinations[..., 1])
+        a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((long2 - long1) / 2)**2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    raise ValueError(f"unknown metric {metric!r}: use 'euclidean' or 'haversine'")
+
+
+class _UnitVectors:
+    """Points on the unit sphere: the haversine of two points is (1 - u.v) / 2,
+    so all the pickup distances of a block are one matrix product"""
+
+    def __init__(self, points):
+        lat, long = np.radians(points[:, 0]), np.radians(points[:, 1])
+        self.vectors = np.stack([np.cos(lat) * np.cos(long), np.cos(lat) * np.sin(long), np.sin(lat)], axis=1)
+
+    def distances_to(self, others, rows):
+        """(len(rows), len(others)) great-circle distances in km (to ~0.1 m)"""
+        a = (1 - self.vectors[rows] @ others.vectors.T) / 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def shipping_rates(shipping_types, prices=SHIPPING_PRICES):
+    """Rate of every trip, from a shipping type name or an array of names"""
+    if isinstance(shipping_types, str):
+        return np.float64(prices[shipping_types])
+    names, codes = np.unique(np.asarray(shipping_types, dtype=object), return_inverse=True)
+    unknown = set(names.tolist()) - set(prices)
+    if unknown:
+        raise KeyError(f"unknown shipping types: {sorted(unknown)}")
+    return np.array([prices[name] for name in names.tolist()], dtype=np.float64)[codes]
+
+
+def shipping_costs(origins, destinations, shipping_types, prices=SHIPPING_PRICES, metric="euclidean"):
+    """distance * rate for every trip, like calculate_shipping_cost() but numeric"""
+    return distances(origins, destinations, metric) * shipping_rates(shipping_types, prices)
+
+
+def format_prices(prices):
+    """["$12.30", ...], the format of format_price()"""
+    return [f"${price:.2f}" for price in np.asarray(prices, dtype=np.float64).tolist()]
+
+
+def driver_arrays(drivers):
+    """(salaries, speeds) arrays of driver dicts like the ones of calculate_driver_cost()"""
+    return (np.array([driver["salary"] for driver in drivers], dtype=np.float64),
+            np.array([driver["speed"] for driver in drivers], dtype=np.float64))
+
+
+def assign_drivers(trip_distances, salaries, speeds, origins=None, driver_positions=None,
+                   metric="euclidean", max_cells=4_000_000):
+    """(cheapest driver index, its cost) for every trip.
+
+    Ties go to the first driver, like calculate_driver_cost(). With origins
+    and driver_positions, the pickup leg is added to each driver's distance.
+    """
+    trip_distances = np.asarray(trip_distances, dtype=np.float64)
+    salaries, speeds = np.asarray(salaries, dtype=np.float64), np.asarray(speeds, dtype=np.float64)
+    if not len(salaries):
+        raise ValueError("no drivers")
+    pickups = driver_positions is not None
+    if pickups:
+        origins, driver_positions = _coordinates(origins), _coordinates(driver_positions)
+        if metric == "haversine":
+            origins, driver_positions = _UnitVectors(origins), _UnitVectors(driver_positions)
+    best = np.empty(len(trip_distances), dtype=np.int64)
+    costs = np.empty(len(trip_distances))
+    block = max(1, max_cells // len(salaries))
+    for start in range(0, len(trip_distances), block):
+        stop = min(start + block, len(trip_distances))
+        covered = trip_distances[start:stop, None]
+        if pickups:
+            if metric == "haversine":
+                pickup = origins.distances_to(driver_positions, slice(start, stop))
+            else:
+                pickup = distances(driver_positions[None, :], origins[start:stop, None], metric)
+            covered = covered + pickup
+        matrix = salaries * (covered / speeds)  # (trips, drivers)
+        best[start:stop] = np.argmin(matrix, axis=1)
+        costs[start:stop] = matrix[np.arange(stop - start), best[start:stop]]
+    return best, costs
+
+
+def quote_trips(origins, destinations, shipping_types, salaries, speeds, driver_positions=None,
+                prices=SHIPPING_PRICES, metric="euclidean", max_cells=4_000_000):
+    """Quote of a batch of trips: distance, shipping cost, cheapest driver and its cost (arrays)"""
+    trip_distances = distances(origins, destinations, metric)
+    driver, driver_cost = assign_drivers(trip_distances, salaries, speeds, origins, driver_positions,
+                                         metric, max_cells)
+    return Quote(trip_distances, trip_distances * shipping_rates(shipping_types, prices), driver, driver_cost)
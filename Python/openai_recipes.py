@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+# The shared client, which rate-limits and retries on 429, lives in
+# "Generative AI Projects" (not an importable package name), so it is loaded
+# from its file instead of changing sys.path
+CLIENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Generative AI Projects",
+                           "openai_client.py")
+_spec = importlib.util.spec_from_file_location("openai_client", CLIENT_PATH)
+openai_client = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(openai_client)
+RateLimitedClient, get_client = openai_client.RateLimitedClient, openai_client.get_client
+
+# Usage:
+#   python openai_recipes.py                          -> one recipe for the profile below
+#   python openai_recipes.py --batch profiles.jsonl   -> one recipe per profile (JSONL or CSV)
+#   python openai_recipes.py --batch profiles.csv --output recipes.jsonl --concurrency 32
+#   python openai_recipes.py --batch profiles.jsonl --user-template my_prompt.txt
+# In batch mode results are appended to the output file as soon as each one is
+# ready, so if the run crashes just start it again: profiles already in the
+# output file are skipped (they work as a cache keyed by the profile hash).
+# A profile that does not fit the templates (a missing {field}) is written as
+# an error record and the batch goes on with the next one.
+
+MODEL = "gpt-3.5-turbo"
+
+# Create user profile with dietary preferences, cuisine type, and available ingredients
+user_profile = {}
+user_profile["dietary_restrictions"] = "no fat neither alcohol"
+user_profile["cuisine_preferences"] = "boiled or raw food"
+user_profile["ingredients_available"] = "eggs, water, flour, butter, salt, pepper, vegetables, pork"
+
+# System prompt to instruct the AI on the task — generating an HTML recipe blog post
+SYSTEM_TEMPLATE = "Generate an enhanced HTML code for a recipe blog with inline CSS. Consider dietary restrictions, cuisine type, and ingredients."
+
+# User input for personalized recipe details; {fields} are filled from each profile
+user_content1 = "I want to create a recipe blog post. Here are my dietary restrictions: {dietary_restrictions}. My cuisine preferences include: {cuisine_preferences}. The ingredients I have available are: {ingredients_available}."
+
+# Instructions for formatting the blog post
+user_content2 = "Please provide a blog post with a title, description, ingredients, and instructions. Format the ingredients as a bulleted list and instructions as a numbered list. Include simple inline CSS for styling: use a clean font, soft colors, and space between sections."
+
+# Constraint to use only the provided ingredients and limit the steps
+user_content3 = "The recipe must use only the listed ingredients and should result in a single blog post with instructions not exceeding six steps. Ensure the HTML is clean and well-commented."
+
+# Combine all user inputs into one template
+USER_TEMPLATE = user_content1 + "\n" + user_content2 + "\n" + user_content3
+
+
+def render_messages(profile, system_template=SYSTEM_TEMPLATE, user_template=USER_TEMPLATE):
+    """Fills the templates with a profile and returns the chat messages"""
+    system_prompt = {"role": "system", "content": system_template.format_map(profile)}
+    user_prompt = {"role": "user", "content": user_template.format_map(profile)}
+    return [system_prompt, user_prompt]
+
+
+## -------- Batch mode -----------
+
+def read_profiles(path):
+    """Yields profiles (dicts) from a .jsonl or .csv file, one at a time"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def profile_hash(profile, messages, model):
+    """Cache key: changes if the profile, the rendered prompts or the model change"""
+    key = json.dumps({"profile": profile, "messages": messages, "model": model}, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def load_done(output_path):
+    """Hashes already generated in a previous (maybe interrupted) run"""
+    done = set()
+    if os.path.exists(output_path):
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # last line cut by a crash
+                if "html" in record:
+                    done.add(record["hash"])
+    return done
+
+
+async def run_batch(args, system_template, user_template):
+    client = RateLimitedClient(max_concurrency=args.concurrency)
+    done = load_done(args.output)
+    totals = {"generated": 0, "cached": 0, "failed": 0,
+              "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    pending = set()
+    start = time.perf_counter()
+
+    with open(args.output, "a", encoding="utf-8") as out:
+
+        async def generate(profile, messages, key):
+            try:
+                response = await client.achat(messages, model=args.model)
+            except Exception as e:
+                record = {"hash": key, "profile": profile, "error": str(e)}
+                totals["failed"] += 1
+            else:
+                usage = response.usage
+                record = {"hash": key, "profile": profile,
+                          "html": response.choices[0].message.content,
+                          "usage": usage.model_dump() if usage else None}
+                totals["generated"] += 1
+                if usage:
+                    totals["prompt_tokens"] += usage.prompt_tokens
+                    totals["completion_tokens"] += usage.completion_tokens
+                    totals["total_tokens"] += usage.total_tokens
+            # one line per result, flushed right away so a crash loses nothing
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+        for profile in read_profiles(args.batch):
+            try:
+                messages = render_messages(profile, system_template, user_template)
+            except (KeyError, IndexError, ValueError) as e:
+                # like a failed request: recorded without "html", so retried on the next run
+                reason = f"missing template field {e}" if isinstance(e, KeyError) else f"bad template: {e}"
+                record = {"hash": profile_hash(profile, None, args.model), "profile": profile, "error": reason}
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                totals["failed"] += 1
+                continue
+            key = profile_hash(profile, messages, args.model)
+            if key in done:
+                totals["cached"] += 1
+                continue
+            done.add(key)  # duplicated profiles in the input only run once
+
+            task = asyncio.create_task(generate(profile, messages, key))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            # don't read the whole file into tasks: keep a bounded window in flight
+            if len(pending) >= args.concurrency * 4:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        if pending:
+            await asyncio.wait(pending)
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {totals['generated']} recipes in {elapsed:.1f} s "
+          f"({totals['generated'] / elapsed if elapsed else 0:.2f} recipes/s)")
+    print(f"Skipped {totals['cached']} already in {args.output}, {totals['failed']} failed")
+    print(f"Tokens: {totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion "
+          f"= {totals['total_tokens']} ({totals['total_tokens'] / elapsed * 60 if elapsed else 0:.0f} tokens/min)")
+    print(f"Retries (rate limits or transient errors): {client.stats['retries']}")
+    return totals
+
+
+def read_template(path, default):
+    if not path:
+        return default
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate HTML recipe blog posts")
+    parser.add_argument("--batch", help="JSONL or CSV file with one profile per row")
+    parser.add_argument("--output", default="recipes.jsonl", help="JSONL file for batch results")
+    parser.add_argument("--concurrency", type=int, default=16, help="max requests in flight")
+    parser.add_argument("--system-template", help="text file with the system prompt template")
+    parser.add_argument("--user-template", help="text file with the user prompt template")
+    parser.add_argument("--model", default=MODEL)
+    args = parser.parse_args()
+
+    system_template = read_template(args.system_template, SYSTEM_TEMPLATE)
+    user_template = read_template(args.user_template, USER_TEMPLATE)
+
+    if args.batch:
+        totals = asyncio.run(run_batch(args, system_template, user_template))
+        sys.exit(1 if totals["failed"] else 0)
+
+    # Shared OpenAI client (reads OPENAI_API_KEY from the environment)
+    client = get_client()
+
+    # Send the request to the OpenAI API to generate the HTML code
+    response = client.chat(
+      model=args.model,
+      messages=render_messages(user_profile, system_template, user_template)
+    )
+
+    # Display the generated HTML content
+    print(response.choices[0].message.content)
@@ -0,0 +1,187 @@
+
+# Column storage for large numbers of patients.
+#
+# The Patient class of "classes practice - Medical INsirance.py" is one Python
+# object (with its own __dict__) per patient, which costs a few hundred bytes
+# each. PatientStore keeps every field in a typed NumPy array instead:
+#
+#   names           -> one UTF-8 byte buffer + int64 offsets (no str objects;
+#                      the same layout as an Arrow large_string column)
+#   ages            -> int16       sex, num_of_children, smokers -> int8
+#   bmis            -> float64 (float32 would change the cost estimates)
+#
+# which is ~35 bytes per patient. store[i] returns a PatientView, a tiny
+# __slots__ object that reads and writes row i of the arrays, with the same
+# methods as Patient. Updates and cost estimates work on whole cohorts at once.
+
+import numpy as np
+
+from insurance_estimator import FIELDS, STANDARD
+
+COLUMN_TYPES = {"ages": np.int16, "sex": np.int8, "bmis": np.float64,
+                "num_of_children": np.int8, "smokers": np.int8}
+# column name -> field name used by the cost formulas
+COLUMN_FIELDS = dict(zip(COLUMN_TYPES, FIELDS))
+
+
+class PatientStore:
+    """Patients stored column by column in NumPy arrays"""
+
+    def __init__(self, capacity=16):
+        self._size = 0
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMN_TYPES.items()}
+        self._name_offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self._name_bytes = np.zeros(capacity * 16, dtype=np.uint8)
+
+    # --- Storage ---
+    def _grow(self, rows, name_bytes):
+        capacity = len(self._name_offsets) - 1
+        if rows > capacity:
+            capacity = max(rows, capacity * 2)
+            for name, values in self._columns.items():
+                grown = np.zeros(capacity, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                self._columns[name] = grown
+            offsets = np.zeros(capacity + 1, dtype=np.int64)
+            offsets[:self._size + 1] = self._name_offsets[:self._size + 1]
+            self._name_offsets = offsets
+        if name_bytes > len(self._name_bytes):
+            grown = np.zeros(max(name_bytes, len(self._name_bytes) * 2), dtype=np.uint8)
+            used = self._name_offsets[self._size]
+            grown[:used] = self._name_bytes[:used]
+            self._name_bytes = grown
+
+    def add(self, name, age, sex, bmi, num_of_children, smoker):
+        """Adds one patient; returns its view"""
+        return self[self.extend([name], [age], [sex], [bmi], [num_of_children], [smoker])[0]]
+
+    def extend(self, names, ages, sex, bmis, num_of_children, smokers):
+        """Adds many patients given as parallel lists/arrays; returns their row numbers"""
+        encoded = [name.encode("utf-8") for name in names]
+        count = len(encoded)
+        start, stop = self._size, self._size + count
+        used = self._name_offsets[start]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=count)
+        self._grow(stop, used + int(lengths.sum()))
+
+        self._name_bytes[used:used + lengths.sum()] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        self._name_offsets[start + 1:stop + 1] = used + np.cumsum(lengths)
+        for column, values in zip(COLUMN_TYPES, (ages, sex, bmis, num_of_children, smokers)):
+            self._columns[column][start:stop] = values
+        self._size = stop
+        return np.arange(start, stop)
+
+    # --- Columns (views, no copies) ---
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        """Array view of a column: ages, sex, bmis, num_of_children or smokers"""
+        return self._columns[name][:self._size]
+
+    def name(self, row):
+        start, stop = self._name_offsets[row], self._name_offsets[row + 1]
+        return self._name_bytes[start:stop].tobytes().decode("utf-8")
+
+    def __getitem__(self, row):
+        if not -self._size <= row < self._size:
+            raise IndexError("patient row out of range")
+        return PatientView(self, row % self._size)
+
+    def __iter__(self):
+        return (PatientView(self, row) for row in range(self._size))
+
+    def nbytes(self):
+        """Memory used by the stored patients (without the spare capacity)"""
+        per_row = sum(np.dtype(dtype).itemsize for dtype in COLUMN_TYPES.values()) + 8
+        return self._size * per_row + int(self._name_offsets[self._size])
+
+    # --- Bulk operations ---
+    def update_age(self, rows, new_age):
+        """Sets the age of a cohort (row numbers or a boolean mask); new_age may be an array"""
+        self._columns["ages"][:self._size][rows] = new_age
+
+    def update_num_children(self, rows, new_num_children):
+        self._columns["num_of_children"][:self._size][rows] = new_num_children
+
+    def estimated_insurance_costs(self, model=STANDARD):
+        """Cost of every patient as a float64 array, in one vectorized pass"""
+        return model.estimate({COLUMN_FIELDS[name]: self.column(name) for name in COLUMN_TYPES})
+
+    # --- Export ---
+    # both share memory with the store until it grows (append past its capacity)
+    def to_arrow(self):
+        """pyarrow Table sharing memory with the store (names included)"""
+        import pyarrow as pa
+
+        names = pa.LargeStringArray.from_buffers(
+            self._size,
+            pa.py_buffer(self._name_offsets[:self._size + 1]),
+            pa.py_buffer(self._name_bytes[:self._name_offsets[self._size]]),
+        )
+        columns = {"name": names}
+        columns.update({name: pa.array(self.column(name)) for name in COLUMN_TYPES})
+        return pa.table(columns)
+
+    def to_pandas(self):
+        """pandas DataFrame over the same memory (the name column is Arrow-backed)"""
+        import pandas as pd
+        import pyarrow as pa
+
+        names = self.to_arrow().column("name")
+        columns = {"name": pd.Series(names, dtype=pd.ArrowDtype(pa.large_string()))}
+        columns.update({name: self.column(name) for name in COLUMN_TYPES})
+        return pd.DataFrame(columns, copy=False)
+
+
+class PatientView:
+    """One patient of a PatientStore; reads and writes the store's arrays"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def _column_property(column):
+        def getter(self):
+            return self._store._columns[column][self._row].item()
+
+        def setter(self, value):
+            self._store._columns[column][self._row] = value
+
+        return property(getter, setter)
+
+    age = _column_property("ages")
+    sex = _column_property("sex")
+    bmi = _column_property("bmis")
+    num_of_children = _column_property("num_of_children")
+    smoker = _column_property("smokers")
+    del _column_property
+
+    @property
+    def name(self):
+        return self._store.name(self._row)
+
+    def estimated_insurance_cost(self, model=STANDARD):
+        return model.estimate_one(age=self.age, sex=self.sex, bmi=self.bmi,
+                                  num_of_children=self.num_of_children, smoker=self.smoker)
+
+    def update_age(self, new_age):
+        self.age = new_age
+
+    def update_num_children(self, new_num_children):
+        self.num_of_children = new_num_children
+
+    def patient_profile(self):
+        return {
+            "Name": self.name,
+            "Age": self.age,
+            "Sex": self.sex,
+            "BMI": self.bmi,
+            "Number of Children": self.num_of_children,
+            "Smoker": self.smoker,
+        }
+
+    def __repr__(self):
+        return f"PatientView({self._row}: {self.patient_profile()})"
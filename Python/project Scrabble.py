@@ -1,4 +1,7 @@
 
+from scrabble_engine import Lexicon
+from scrabble_leaderboard import Leaderboard
+
 letters = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T", "U", "V", "W", "X", "Y", "Z"]
 points = [1, 3, 3, 2, 1, 4, 2, 4, 1, 8, 5, 1, 3, 4, 1, 3, 10, 1, 1, 1, 1, 4, 4, 8, 4, 10]
 
@@ -23,14 +26,23 @@ player_to_words = {
     "Prof Reader": ["ZAP", "COMA", "PERIOD"]
 }
 
-# Diccionario para almacenar las puntuaciones de cada jugador
-player_to_points = {}
-
-# Calcular los puntos de cada jugador
+# Tabla de posiciones: cada palabra jugada suma al total del jugador al
+# momento (ver scrabble_leaderboard.py), sin recorrer todas las palabras otra vez
+leaderboard = Leaderboard()
 for player, words in player_to_words.items():
-    player_points = 0
     for word in words:
-        player_points += score_word(word)
-    player_to_points[player] = player_points  # Actualizar puntuación de cada jugador
+        leaderboard.play_word(player, word)
+
+# Diccionario para almacenar las puntuaciones de cada jugador
+player_to_points = leaderboard.totals()
 
 print(player_to_points)
+
+leaderboard.play_word("player1", "QUIZ")
+print(leaderboard.top(3))
+print(f"Lexi Con is number {leaderboard.rank('Lexi Con')}")
+
+# mejores palabras para un atril, con un comodin ("?")
+lexicon = Lexicon(word for words in player_to_words.values() for word in words)
+print(lexicon.best_words("ZAPMOC?", 3))
+print(lexicon.anagrams("syee"))
@@ -0,0 +1,162 @@
+
+# Scrabble scoring and word search over whole word lists, for "project Scrabble.py".
+#
+# score_word() of the script does one dict lookup per letter. Here the letter
+# values are a 256-entry table indexed by byte: a word list is encoded into one
+# uint8 buffer, POINTS[buffer] scores every letter at once and a cumulative sum
+# cut at the word boundaries gives every word score:
+#
+#   score_words(["BROWNIE", "ZAP"]) -> array([15, 14])
+#
+# Lowercase letters score like uppercase ones (other bytes score 0), unless
+# lowercase_is_blank=True: in Scrabble notation a lowercase letter is played
+# with a blank tile, which is worth 0.
+#
+# A Lexicon keeps the words (uppercase, sorted by length) with their scores
+# and an anagram index (sorted letters -> words). Anagrams need the same tiles
+# and score the same, so best_words(rack) works on the index: it checks the
+# rack against every signature that is not longer than the rack in one
+# vectorized pass over a signatures x 26 matrix of letter counts (the letters
+# a signature needs beyond the rack must be covered by blanks, "?" or " ",
+# and those letters score 0), then lists the words of the playable ones.
+
+import numpy as np
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LETTER_POINTS = [1, 3, 3, 2, 1, 4, 2, 4, 1, 8, 5, 1, 3, 4, 1, 3, 10, 1, 1, 1, 1, 4, 4, 8, 4, 10]
+BLANKS = "? "
+
+POINTS = np.zeros(256, dtype=np.uint8)
+POINTS[np.frombuffer(LETTERS.encode(), dtype=np.uint8)] = LETTER_POINTS
+POINTS[np.frombuffer(LETTERS.lower().encode(), dtype=np.uint8)] = LETTER_POINTS
+UPPERCASE_POINTS = POINTS.copy()  # lowercase letters (blanks) score 0
+UPPERCASE_POINTS[np.frombuffer(LETTERS.lower().encode(), dtype=np.uint8)] = 0
+
+# byte -> letter number 0..25 (either case), -1 for anything else
+LETTER_INDEX = np.full(256, -1, dtype=np.int8)
+LETTER_INDEX[np.frombuffer(LETTERS.encode(), dtype=np.uint8)] = np.arange(26)
+LETTER_INDEX[np.frombuffer(LETTERS.lower().encode(), dtype=np.uint8)] = np.arange(26)
+
+
+def encode_words(words):
+    """(uint8 buffer, int64 offsets) of a word list; word i is buffer[offsets[i]:offsets[i + 1]]"""
+    words = words if isinstance(words, list) else list(words)
+    text = "".join(words)
+    if text.isascii():  # one character per byte: one encode() for the whole list
+        pieces, buffer = words, text.encode("ascii")
+    else:
+        pieces = [word.encode("utf-8") for word in words]
+        buffer = b"".join(pieces)
+    offsets = np.zeros(len(pieces) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces)), out=offsets[1:])
+    return np.frombuffer(buffer, dtype=np.uint8), offsets
+
+
+def score_buffer(buffer, offsets, table=POINTS):
+    """Score of every word of an encoded word list"""
+    # a letter is worth at most 10: int32 running totals are enough for 200M letters
+    dtype = np.int32 if len(buffer) < 2**31 // 10 else np.int64
+    totals = np.zeros(len(buffer) + 1, dtype=dtype)
+    np.cumsum(table[buffer], out=totals[1:], dtype=dtype)
+    return (totals[offsets[1:]] - totals[offsets[:-1]]).astype(np.int64)
+
+
+def score_words(words, lowercase_is_blank=False):
+    """Score of every word, as an int64 array"""
+    return score_buffer(*encode_words(words), UPPERCASE_POINTS if lowercase_is_blank else POINTS)
+
+
+_POINT_LISTS = {False: POINTS.tolist(), True: UPPERCASE_POINTS.tolist()}
+
+
+def score_word(word, lowercase_is_blank=False):
+    """Score of one word (plain Python: for a single word it beats building arrays)"""
+    return sum(map(_POINT_LISTS[lowercase_is_blank].__getitem__, word.encode("utf-8")))
+
+
+def _signature(letters):
+    return "".join(sorted(letters))
+
+
+class Lexicon:
+    """Word list indexed for rack queries"""
+
+    def __init__(self, words):
+        words = {word.strip().upper() for word in words}
+        words = [word for word in words if word and word.isascii() and word.isalpha()]
+        words.sort()
+        words.sort(key=len)  # stable: alphabetical within each length
+        self.words = words
+        buffer, offsets = encode_words(words)
+        self.lengths = np.diff(offsets)
+        self.scores = score_buffer(buffer, offsets)
+        self._anagrams = {}
+        for word in words:
+            self._anagrams.setdefault(_signature(word), []).append(word)
+        # words are sorted by length, so the signatures (in first-seen order) are too
+        self._signatures = list(self._anagrams)
+        buffer, offsets = encode_words(self._signatures)
+        self._signature_lengths = np.diff(offsets)
+        owner = np.repeat(np.arange(len(self._signatures)), self._signature_lengths)
+        self._signature_counts = np.bincount(owner * 26 + LETTER_INDEX[buffer], minlength=len(self._signatures) * 26) \
+            .reshape(len(self._signatures), 26).astype(np.int16)
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8"):
+        """Lexicon from a word list file, one word per line"""
+        with open(path, encoding=encoding) as file:
+            return cls(file)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word.upper() in self._anagrams.get(_signature(word.upper()), ())
+
+    def anagrams(self, letters):
+        """Words that use exactly these letters (no blanks)"""
+        return list(self._anagrams.get(_signature(letters.upper()), ()))
+
+    def best_words(self, rack, n=10):
+        """The n best words playable with the rack, as (word, score), best first.
+
+        The rack is a string of tiles in either case, "?" or " " being blanks.
+        Letters played with a blank are lowercase in the returned words and
+        score 0. Any other character in the rack raises ValueError.
+        """
+        if not (rack.isascii() and all(tile.isalpha() or tile in BLANKS for tile in rack)):
+            raise ValueError(f"rack {rack!r} must hold only the letters A-Z and blanks ({BLANKS!r})")
+        if n <= 0:
+            return []
+        blanks = sum(rack.count(blank) for blank in BLANKS)
+        codes = LETTER_INDEX[np.frombuffer(rack.encode("ascii"), dtype=np.uint8)]
+        tiles = np.bincount(codes[codes >= 0], minlength=26)
+        stop = int(np.searchsorted(self._signature_lengths, int(tiles.sum()) + blanks, side="right"))
+        counts = self._signature_counts[:stop]
+        missing = np.maximum(counts - tiles, 0).sum(axis=1)
+        playable = np.flatnonzero(missing <= blanks)
+        scores = np.minimum(counts[playable], tiles) @ LETTER_POINTS
+        # best signatures first: walking down the scores, stop once n words are
+        # taken and the score drops (every word tied with the last one is kept)
+        order = np.argsort(-scores, kind="stable")
+        ranked = []
+        for row in order.tolist():
+            score = int(scores[row])
+            if len(ranked) >= n and score < ranked[-1][0]:
+                break
+            ranked.extend((score, word) for word in self._anagrams[self._signatures[playable[row]]])
+        ranked.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [(self._with_blanks(word, tiles), score) for score, word in ranked[:n]]
+
+    @staticmethod
+    def _with_blanks(word, tiles):
+        """The word with the letters that the rack lacks in lowercase"""
+        left = dict(zip(LETTERS, tiles.tolist()))
+        played = []
+        for letter in word:
+            if left[letter]:
+                left[letter] -= 1
+                played.append(letter)
+            else:
+                played.append(letter.lower())
+        return "".join(played)
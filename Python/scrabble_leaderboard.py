@@ -0,0 +1,198 @@
+
+# Live Scrabble leaderboard, for the player_to_points of "project Scrabble.py".
+#
+# The script adds up every word of every player in a nested loop, once. Here
+# totals are kept up to date as words are played:
+#
+#   play_word(player, word) -> a dict update; the word score comes from a cache
+#                              (word -> score), so each word is scored once
+#   ranking                 -> (-points, player) entries kept sorted in blocks
+#                              of at most 2 * BLOCK_SIZE entries (a one-level
+#                              skip list): moving a player is a bisect among
+#                              the blocks and one in a block, and the inserts
+#                              and deletes shift one small block instead of a
+#                              list of every player. play_word() only marks
+#                              the player as changed; the ranking is brought
+#                              up to date by the next query, once per changed
+#                              player (a player playing 50 words between two
+#                              queries is moved once)
+#   top(n), rank(player)    -> the first n entries / the position of the
+#                              player's entry
+#
+# replay() streams a game log (one "player<TAB>word" per line): each line is
+# scored through the word cache as it is read and added to a per-player sum,
+# so memory grows with the players and distinct words, not with the log, and
+# the totals are touched once at the end. play_words() scores the distinct
+# words of a batch in one vectorized call (scrabble_engine). A lock makes a
+# Leaderboard safe to share between the threads running the games.
+
+import threading
+from bisect import bisect_left, insort
+from itertools import chain, islice
+
+import numpy as np
+
+from scrabble_engine import score_word, score_words
+
+BLOCK_SIZE = 500
+
+
+class _SortedBlocks:
+    """Sorted entries stored as a list of sorted blocks"""
+
+    def __init__(self):
+        self._blocks = []
+        self._maxes = []  # last entry of each block
+
+    def __len__(self):
+        return sum(map(len, self._blocks))
+
+    def load(self, entries):
+        """Replaces the content with `entries` (in any order)"""
+        entries = sorted(entries)
+        self._blocks = [entries[i:i + BLOCK_SIZE] for i in range(0, len(entries), BLOCK_SIZE)]
+        self._maxes = [block[-1] for block in self._blocks]
+
+    def _block_of(self, entry):
+        return min(bisect_left(self._maxes, entry), len(self._maxes) - 1)
+
+    def add(self, entry):
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._maxes.append(entry)
+            return
+        i = self._block_of(entry)
+        block = self._blocks[i]
+        insort(block, entry)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks[i:i + 1] = block[:BLOCK_SIZE], block[BLOCK_SIZE:]
+            self._maxes[i:i + 1] = block[BLOCK_SIZE - 1], block[-1]
+
+    def remove(self, entry):
+        i = self._block_of(entry)
+        block = self._blocks[i]
+        del block[bisect_left(block, entry)]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i], self._maxes[i]
+
+    def index(self, entry):
+        """Number of entries smaller than `entry`"""
+        if not self._blocks:
+            return 0
+        i = self._block_of(entry)
+        return sum(map(len, self._blocks[:i])) + bisect_left(self._blocks[i], entry)
+
+    def first(self, n):
+        return list(islice(chain.from_iterable(self._blocks), n))
+
+
+class Leaderboard:
+    """Running Scrabble totals per player, ranked"""
+
+    def __init__(self, lowercase_is_blank=False):
+        self.lowercase_is_blank = lowercase_is_blank
+        self._totals = {}  # player -> points, players in order of first play
+        self._word_scores = {}  # word -> score
+        self._ranking = _SortedBlocks()  # (-points, player): best first, ties by name
+        self._ranked = {}  # player -> points as currently placed in the ranking
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._totals)
+
+    def __contains__(self, player):
+        return player in self._totals
+
+    # --- Playing ---
+    def word_score(self, word):
+        score = self._word_scores.get(word)
+        if score is None:
+            score = self._word_scores[word] = score_word(word, self.lowercase_is_blank)
+        return score
+
+    def play_word(self, player, word):
+        """Adds the word to the player's total; returns the word score"""
+        score = self.word_score(word)
+        with self._lock:
+            self._totals[player] = self._totals.get(player, 0) + score
+            self._changed.add(player)
+        return score
+
+    def add_points(self, points_by_player):
+        """Adds {player: points} to the totals at once"""
+        with self._lock:
+            for player, points in points_by_player.items():
+                self._totals[player] = self._totals.get(player, 0) + points
+            self._changed.update(points_by_player)
+
+    def replay(self, path, encoding="utf-8"):
+        """Plays every "player<TAB>word" line of a game log; returns the number of words"""
+        points, count = {}, 0
+        with open(path, encoding=encoding) as file:
+            for line in file:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                player, _, word = line.partition("\t")
+                points[player] = points.get(player, 0) + self.word_score(word)
+                count += 1
+        self.add_points(points)
+        return count
+
+    def play_words(self, players, words):
+        """Plays many (player, word) pairs, given as two parallel lists"""
+        import pandas as pd
+
+        word_codes, distinct_words = pd.factorize(np.asarray(words, dtype=object))
+        word_scores = self._scores_of(distinct_words.tolist())
+        player_codes, distinct_players = pd.factorize(np.asarray(players, dtype=object))
+        points = np.bincount(player_codes, weights=word_scores[word_codes], minlength=len(distinct_players))
+        self.add_points(dict(zip(distinct_players.tolist(), points.astype(np.int64).tolist())))
+
+    def _scores_of(self, words):
+        """Scores of distinct words, scoring the ones not in the cache in one call"""
+        new = [word for word in words if word not in self._word_scores]
+        if new:
+            self._word_scores.update(zip(new, score_words(new, self.lowercase_is_blank).tolist()))
+        return np.array([self._word_scores[word] for word in words], dtype=np.int64)
+
+    # --- Queries ---
+    def points(self, player):
+        return self._totals.get(player, 0)
+
+    def totals(self):
+        """{player: points}, like player_to_points"""
+        with self._lock:
+            return dict(self._totals)
+
+    def _update_ranking(self):
+        """Moves the changed players in the ranking (called with the lock held)"""
+        changed, self._changed = self._changed, set()
+        if len(changed) * 8 > len(self._totals):  # most players moved (e.g. after replay()): sort again
+            self._ranked = dict(self._totals)
+            self._ranking.load((-points, player) for player, points in self._ranked.items())
+            return
+        for player in changed:
+            old = self._ranked.get(player)
+            if old is not None:
+                self._ranking.remove((-old, player))
+            points = self._ranked[player] = self._totals[player]
+            self._ranking.add((-points, player))
+
+    def top(self, n=10):
+        """The n best (player, points), best first (ties by player name)"""
+        with self._lock:
+            self._update_ranking()
+            return [(player, -points) for points, player in self._ranking.first(n)]
+
+    def rank(self, player):
+        """1 for the leader; players with the same points share a rank"""
+        with self._lock:
+            self._update_ranking()
+            if player not in self._ranked:
+                raise KeyError(player)
+            return self._ranking.index((-self._ranked[player],)) + 1
@@ -0,0 +1,105 @@
+
+# Table-driven shipping prices, for "Pr - Sal's Shipping".
+#
+# The script prices one weight with an if/elif ladder per method. Here a
+# method is a row of a rate table (shipping_rates.json by default):
+#
+#   breakpoints  -> sorted weights (lb); a weight up to breakpoints[i] pays
+#                   rates[i] per lb, above the last one it pays rates[-1]
+#   rates        -> per-lb rates, one more than the breakpoints
+#   flat_fee     -> added to the weight-based price (ground: $20)
+#   flat_price   -> price whatever the weight (ground premium: $125)
+#   max_weight   -> heavier packages cannot use the method (optional)
+#
+# so a new carrier is one more entry in the config. price() rates a whole
+# array of weights with one np.searchsorted per method, and cheapest() keeps
+# a running minimum over the methods, so memory stays one array per result
+# however many methods there are.
+
+import json
+import os
+
+import numpy as np
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shipping_rates.json")
+MISSING = -1  # cheapest method of a package no method can take (or a NaN weight)
+
+
+class ShippingMethod:
+    """One row of the rate table"""
+
+    def __init__(self, name, breakpoints=(), rates=(), flat_fee=0.0, flat_price=0.0, max_weight=None):
+        self.name = name
+        self.breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        if np.any(np.diff(self.breakpoints) < 0):
+            raise ValueError(f"{name}: breakpoints must be sorted")
+        if len(self.rates) and len(self.rates) != len(self.breakpoints) + 1:
+            raise ValueError(f"{name}: {len(self.breakpoints)} breakpoints need {len(self.breakpoints) + 1} rates")
+        self.flat_fee = flat_fee
+        self.flat_price = flat_price
+        self.max_weight = max_weight
+
+    def __repr__(self):
+        return f"ShippingMethod({self.name!r})"
+
+    def price(self, weights):
+        """Price of every weight (inf above max_weight, NaN for NaN weights)"""
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(self.rates):
+            # same operations as the script: weight * rate + fee
+            prices = weights * self.rates[np.searchsorted(self.breakpoints, weights, side="left")] + self.flat_fee
+        else:
+            prices = np.where(np.isnan(weights), np.nan, self.flat_fee)
+        if self.flat_price:
+            prices = prices + self.flat_price
+        if self.max_weight is not None:
+            prices = np.where(weights > self.max_weight, np.inf, prices)
+        return prices
+
+
+class RateEngine:
+    """Every shipping method of a rate table; prices and cheapest method for arrays of weights"""
+
+    def __init__(self, methods):
+        self.methods = list(methods)
+        if not self.methods:
+            raise ValueError("no shipping methods")
+
+    @classmethod
+    def from_config(cls, config=DEFAULT_CONFIG):
+        """Engine from a JSON file path or an already loaded {"methods": [...]} dict"""
+        if not isinstance(config, dict):
+            with open(config, encoding="utf-8") as file:
+                config = json.load(file)
+        return cls(ShippingMethod(**method) for method in config["methods"])
+
+    @property
+    def names(self):
+        return [method.name for method in self.methods]
+
+    def prices(self, weights):
+        """{method name: prices} for every weight"""
+        return {method.name: method.price(weights) for method in self.methods}
+
+    def cheapest(self, weights):
+        """(method index, price) of the cheapest method for every weight.
+
+        Ties go to the method listed first. Packages no method can take get
+        MISSING and an infinite price (NaN for NaN weights).
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        best = np.full(weights.shape, MISSING, dtype=np.int64)
+        best_prices = np.full(weights.shape, np.inf)
+        for index, method in enumerate(self.methods):
+            prices = method.price(weights)
+            cheaper = prices < best_prices
+            np.copyto(best, index, where=cheaper)
+            np.copyto(best_prices, prices, where=cheaper)
+        best_prices[np.isnan(weights)] = np.nan
+        return best, best_prices
+
+    def cheapest_names(self, weights):
+        """Name of the cheapest method for every weight (None for MISSING)"""
+        names = np.array(self.names + [None], dtype=object)
+        return names[self.cheapest(weights)[0]]  # MISSING (-1) picks the trailing None
@@ -1,4 +1,8 @@
 
+import io
+
+from medical_records import MedicalRecordParser
+
 #defino un string con datos de pacientes, separados por coma y punto y coma, con un # que separa el costo de la consulta
 medical_data = \
 """Marina Allison   ,27   ,   31.1 , 
@@ -75,7 +79,13 @@ print(f"Insurance Costs: {insurance_costs}")
 total_bmi = 0
 for bmi in bmis:
   total_bmi += float(bmi)
-  average_bmi = total_bmi / len(bmis)
+average_bmi = total_bmi / len(bmis)  # once, after the loop
 print(f"Average BMI: {average_bmi}")
 
 
+# para archivos grandes: MedicalRecordParser (ver medical_records.py) lee el
+# formato en bloques de tamaño fijo y hace todo lo anterior en una sola pasada
+parser = MedicalRecordParser()
+print(parser.consume(io.StringIO(medical_data)))  # o open("export.txt", "rb")
+
+
@@ -0,0 +1,232 @@
+
+# One-pass parser for the Thread Shed sales log of
+# "Thread Shed (string practice project).py":
+#
+#   Edith Mcbride   ;,;$1.21   ;,;   white ;,;
+#   09/15/17   ,Herbert Tran   ;,;   $7.29;,;
+#   white&blue;,;   09/15/17 ,...
+#
+# Fields are separated by ";,;" and sales by ","; spaces and line breaks can
+# be anywhere. A sale is customer, amount, colors ("&"-separated) and an
+# optional date: some logs leave the date and the "," out and just start the
+# next customer on a new line. So the parser does not count fields: it splits
+# on both separators and anchors every sale on its amount (the field that
+# starts with "$"): the field before it is the customer, the one after the
+# colors, and one more field before the next customer is the date.
+#
+# Amounts are kept as integer cents (no float rounding in the totals) and the
+# colors are tallied with a Counter while parsing, so the color counts and
+# the total need no second pass. A buffer where every sale has the same layout
+# is parsed as a whole with str methods (split, join, one regex check of all
+# the amounts); anything else goes sale by sale. The input is read in fixed-size buffers;
+# tally_directory() parses the daily logs of a directory in a process pool
+# and merges their SalesTally.
+
+import codecs
+import os
+import re
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from decimal import ROUND_HALF_EVEN, Decimal
+
+Sale = namedtuple("Sale", ["customer", "cents", "colors", "date"])
+MalformedSale = namedtuple("MalformedSale", ["text", "reason"])
+
+_SEPARATOR = re.compile(r";,;|,")
+_AMOUNTS = re.compile(r"\$\d+\.\d\d(?:\0\$\d+\.\d\d)*")  # "\0"-joined $d.dd amounts
+
+
+def parse_cents(amount):
+    """"$20.15" -> 2015 (ValueError if it is not a dollar amount)"""
+    if not amount.startswith("$"):
+        raise ValueError(f"not a dollar amount: {amount!r}")
+    dollars, _, cents = amount[1:].partition(".")
+    if len(cents) <= 2 and dollars.isdigit() and (cents.isdigit() or not cents):
+        return int(dollars) * 100 + int(cents.ljust(2, "0"))
+    try:
+        return int((Decimal(amount[1:]) * 100).quantize(1, rounding=ROUND_HALF_EVEN))
+    except ArithmeticError:
+        raise ValueError(f"not a dollar amount: {amount!r}") from None
+
+
+class SalesTally:
+    """Sales count, total in cents and threads sold per color"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_cents = 0
+        self.colors = Counter()
+        self.malformed_count = 0
+
+    @property
+    def total(self):
+        """Total in dollars, as a float"""
+        return self.total_cents / 100
+
+    def update(self, other):
+        """Adds the counts of another tally (e.g. of another day)"""
+        self.count += other.count
+        self.total_cents += other.total_cents
+        self.colors.update(other.colors)
+        self.malformed_count += other.malformed_count
+        return self
+
+    def color_count(self, color):
+        return self.colors[color]
+
+    def __repr__(self):
+        return (f"SalesTally({self.count} sales, ${self.total_cents // 100}.{self.total_cents % 100:02d}, "
+                f"{dict(self.colors.most_common())})")
+
+
+class SalesParser:
+    """Parses sales one buffer at a time and keeps a SalesTally"""
+
+    def __init__(self, buffer_size=1 << 20, encoding="utf-8", keep_malformed=1000):
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.keep_malformed = keep_malformed  # at most this many are kept in self.malformed
+        self.tally = SalesTally()
+        self.malformed = []
+
+    # --- Reading ---
+    def _blocks(self, stream):
+        """Text made of whole sales, one block per buffer read"""
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        rest = ""
+        while True:
+            chunk = stream.read(self.buffer_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            text = rest + chunk
+            cut = self._last_sale_separator(text)
+            if cut is None:
+                rest = text
+                continue
+            # the last sale may go on in the next buffer: it is parsed with it
+            rest = text[cut.end():]
+            yield text[:cut.start()]
+        rest += decoder.decode(b"", final=True)
+        if rest.strip():
+            yield rest
+
+    @staticmethod
+    def _last_sale_separator(text):
+        """The separator just before the customer of the last sale of `text`, or None"""
+        amount = text.rfind("$")
+        if amount < 0:
+            return None
+        separators = list(_SEPARATOR.finditer(text, max(0, amount - 4096), amount))
+        # the last separator ends the customer field, the one before starts it
+        return separators[-2] if len(separators) >= 2 else None
+
+    def parse(self, stream):
+        """Yields a Sale for every well-formed sale of `stream` (a file or anything with read(n))"""
+        for block in self._blocks(stream):
+            yield from self._parse_block(block, True)
+
+    def parse_text(self, text):
+        """Sales of a string, as a list"""
+        return self._parse_block(text, True)
+
+    def tally_stream(self, stream):
+        """Parses `stream` for the tally only (no Sale objects); returns self.tally"""
+        for block in self._blocks(stream):
+            self._parse_block(block, False)
+        return self.tally
+
+    # --- Parsing ---
+    def _parse_block(self, block, records):
+        sales = self._parse_regular(block, records)
+        if sales is None:
+            sales = self._parse_sales(block, records)
+        return sales
+
+    def _parse_regular(self, block, records):
+        """Whole block at once when every sale has the same layout ($d.dd amounts,
+        with or without dates); None otherwise"""
+        fields = block.replace(";,;", "\x1f").replace(",", "\x1f").split("\x1f")
+        count = block.count("$")
+        for width in (4, 3):
+            if len(fields) != width * count and not (len(fields) == width * count + 1 and not fields[-1].strip()):
+                continue
+            amounts = "\0".join(map(str.strip, fields[1::width][:count]))
+            if count and _AMOUNTS.fullmatch(amounts):
+                break
+        else:
+            return None
+        cents = list(map(int, amounts.replace("$", "").replace(".", "").split("\0")))
+        color_fields = fields[2::width][:count]
+        # counted as they are, then " white" and "white" are merged: few distinct keys to strip
+        for color, sold in Counter("&".join(color_fields).split("&")).items():
+            self.tally.colors[color.strip()] += sold
+        self.tally.count += count
+        self.tally.total_cents += sum(cents)
+        if not records:
+            return []
+        customers = map(str.strip, fields[0::width][:count])
+        sale_colors = (tuple(map(str.strip, field.split("&"))) for field in color_fields)
+        dates = (field.strip() or None for field in fields[3::4]) if width == 4 else [None] * count
+        return list(map(Sale, customers, cents, sale_colors, dates))
+
+    def _parse_sales(self, block, records):
+        """Sale by sale, anchored on the amounts, reporting the malformed ones"""
+        fields = [field.strip() for field in _SEPARATOR.split(block)]
+        amounts = [i for i, field in enumerate(fields) if field.startswith("$")]
+        sales, colors = [], []
+        for n, i in enumerate(amounts):
+            end = amounts[n + 1] - 1 if n + 1 < len(amounts) else len(fields)  # next customer
+            if i == 0 or i + 1 >= end or end - i > 3:
+                text = " ;,; ".join(fields[max(0, i - 1):end])
+                self._malformed(text, "expected customer ;,; amount ;,; colors [;,; date]")
+                continue
+            try:
+                cents = parse_cents(fields[i])
+            except ValueError as error:
+                self._malformed(" ;,; ".join(fields[i - 1:end]), str(error))
+                continue
+            sale_colors = tuple(map(str.strip, fields[i + 1].split("&")))
+            colors.extend(sale_colors)
+            self.tally.count += 1
+            self.tally.total_cents += cents
+            if records:
+                date = fields[i + 2] if end - i == 3 else ""
+                sales.append(Sale(fields[i - 1], cents, sale_colors, date or None))
+        # text before the first sale that is not part of it
+        first = amounts[0] - 1 if amounts else len(fields)
+        if any(fields[:max(0, first)]):
+            self._malformed(" ;,; ".join(fields[:first]), "text without an amount")
+        self.tally.colors.update(colors)
+        return sales
+
+    def _malformed(self, text, reason):
+        self.tally.malformed_count += 1
+        if len(self.malformed) < self.keep_malformed:
+            self.malformed.append(MalformedSale(text, reason))
+
+
+def tally_file(path, encoding="utf-8"):
+    """SalesTally of one log file"""
+    with open(path, "rb") as file:
+        return SalesParser(encoding=encoding).tally_stream(file)
+
+
+def tally_directory(directory, suffix=".txt", workers=None):
+    """(merged SalesTally, {file name: SalesTally}) of every log file of a directory.
+
+    The files (one per day) are parsed in parallel by a process pool, each
+    worker returning the small tally of its file.
+    """
+    names = sorted(name for name in os.listdir(directory) if name.endswith(suffix))
+    paths = [os.path.join(directory, name) for name in names]
+    if workers == 1 or len(paths) <= 1:
+        tallies = list(map(tally_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tallies = list(pool.map(tally_file, paths))
+    total = SalesTally()
+    for tally in tallies:
+        total.update(tally)
+    return total, dict(zip(names, tallies))